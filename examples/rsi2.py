@@ -10,12 +10,10 @@ Created on Mon Aug 15 19:20:57 2016
 """
 import click
 import csv
-import pandas as pd
-import numpy as np
 
 from datetime import datetime
 from os import path, remove
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 from nctrader import settings
 from nctrader.compat import queue
@@ -31,22 +29,7 @@ from nctrader.statistics.basic import BasicStatistics
 from nctrader.statistics.tearsheet import TearsheetStatistics
 from nctrader.trading_session.backtest import Backtest
 from nctrader.event import (SignalEvent, EventType)
-
-
-def RSI(series, period=2):
-    delta = series.diff().dropna()
-    u = delta * 0
-    d = u.copy()
-    u[delta > 0] = delta[delta > 0]
-    d[delta < 0] = -delta[delta < 0]
-    u[u.index[period-1]] = np.mean( u[:period] ) #first value is sum of avg gains
-    u = u.drop(u.index[:(period-1)])
-    d[d.index[period-1]] = np.mean( d[:period] ) #first value is sum of avg losses
-    d = d.drop(d.index[:(period-1)])
-    rs = u.ewm(com=period-1, adjust=False).mean() / \
-         d.ewm(com=period-1, adjust=False).mean()
-    rsi = 100 - 100 / (1 + rs)
-    return rsi[-1]
+from nctrader.indicators import SMA, WilderRSI
 
 
 class RSI2Strategy(AbstractStrategy):
@@ -63,8 +46,11 @@ class RSI2Strategy(AbstractStrategy):
         self.config = config
         self.tickers = tickers
         self.events_queue = events_queue
-        self.bars = pd.DataFrame(columns=['open', 'high', 'low', 'close'])
         self.sma_length = 200
+        self.rsi = WilderRSI(2)
+        self.sma = SMA(self.sma_length)
+        # The last four SMA values, oldest first
+        self.smas = deque(maxlen=4)
         self.position = 'OUT'
         self.explore_fname = self._get_explore_filename()
         self.explore_header = True
@@ -95,13 +81,10 @@ class RSI2Strategy(AbstractStrategy):
             writer.writerow(info)
 
 
-    def calc_trend(self, prices):
+    def calc_trend(self):
         """
         """
-        sma0 = np.mean(prices[-self.sma_length:]['close'])
-        sma1 = np.mean(prices[-(self.sma_length+1):-1]['close'])
-        sma2 = np.mean(prices[-(self.sma_length+2):-2]['close'])
-        sma3 = np.mean(prices[-(self.sma_length+3):-3]['close'])
+        sma3, sma2, sma1, sma0 = self.smas
 
         if sma0 > sma1 and sma1 > sma2 and sma2 > sma3:
             return 1
@@ -120,14 +103,15 @@ class RSI2Strategy(AbstractStrategy):
             d['sig_close'] = PriceParser.display(event.close_price)
             d['trend'] = None
             d['rsi'] = None
-            self.bars.loc[event.time] = (event.open_price, event.high_price,
-                event.low_price, event.close_price)
+            rsi = self.rsi.update(event.close_price)
+            sma = self.sma.update(event.close_price)
+            if sma is not None:
+                self.smas.append(sma)
 
             # Enough bars are present for trading
-            if len(self.bars) > 3:
+            if len(self.smas) == 4:
 
-                trend = self.calc_trend(self.bars)
-                rsi = RSI(self.bars['close'])
+                trend = self.calc_trend()
                 d['trend'] = trend
                 d['rsi'] = rsi
 
@@ -140,15 +124,15 @@ class RSI2Strategy(AbstractStrategy):
                     signal = SignalEvent(ticker, "SLD")
                     self.events_queue.put(signal)
                     self.position = 'OUT'
-                    print "%s Signal:LX %s trend:%s rsi:%0.4f" % (
-                        event.time, ticker, trend, rsi)
+                    print("%s Signal:LX %s trend:%s rsi:%0.4f" % (
+                        event.time, ticker, trend, rsi))
 
                 if self.position == 'SE' and rsi < 50:
                     signal = SignalEvent(ticker, "BOT")
                     self.events_queue.put(signal)
                     self.position = 'OUT'
-                    print "%s Signal:SX %s trend:%s rsi:%0.4f" % (
-                        event.time, ticker, trend, rsi)
+                    print("%s Signal:SX %s trend:%s rsi:%0.4f" % (
+                        event.time, ticker, trend, rsi))
 
                 # Entry Signals
                 if self.position == 'OUT':
@@ -157,16 +141,16 @@ class RSI2Strategy(AbstractStrategy):
                         signal = SignalEvent(ticker, "BOT")
                         self.events_queue.put(signal)
                         self.position = 'LE'
-                        print "%s Signal:LE %s trend:%s rsi:%0.4f" % (
-                            event.time, ticker, trend, rsi)
+                        print("%s Signal:LE %s trend:%s rsi:%0.4f" % (
+                            event.time, ticker, trend, rsi))
 
                     # SE
                     if rsi > 50:
                         signal = SignalEvent(ticker, "SLD")
                         self.events_queue.put(signal)
                         self.position = 'SE'
-                        print "%s Signal:SE %s trend:%s rsi:%0.4f" % (
-                            event.time, ticker, trend, rsi)
+                        print("%s Signal:SE %s trend:%s rsi:%0.4f" % (
+                            event.time, ticker, trend, rsi))
             # Write explore
             d['position'] = self.position
             self.record_explore(d)
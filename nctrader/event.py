@@ -1,9 +1,28 @@
 from __future__ import print_function
 
+from collections import deque
 from enum import Enum
 
+from .compat import queue
 
-EventType = Enum("EventType", "TICK BAR SIGNAL ORDER FILL TRADE")
+
+EventType = Enum("EventType", "TICK BAR SIGNAL ORDER FILL TRADE BARS")
+
+_READABLE_PERIODS = {
+    1: "1sec",
+    5: "5sec",
+    10: "10sec",
+    15: "15sec",
+    30: "30sec",
+    60: "1min",
+    300: "5min",
+    600: "10min",
+    900: "15min",
+    1800: "30min",
+    3600: "1hr",
+    86400: "1day",
+    604800: "1wk"
+}
 
 
 class Event(object):
@@ -11,7 +30,13 @@ class Event(object):
     Event is base class providing an interface for all subsequent
     (inherited) events, that will trigger further events in the
     trading infrastructure.
+
+    Events are slotted, with the type and priority held on the
+    class, so that the many price events of a backtest carry no
+    per-instance __dict__.
     """
+    __slots__ = ()
+
     @property
     def typename(self):
         return self.type.name
@@ -23,6 +48,10 @@ class TickEvent(Event):
     which is defined as a ticker symbol and associated best
     bid and ask from the top of the order book.
     """
+    __slots__ = ('ticker', 'time', 'bid', 'ask')
+    type = EventType.TICK
+    priority = 100
+
     def __init__(self, ticker, time, bid, ask):
         """
         Initialises the TickEvent.
@@ -33,12 +62,10 @@ class TickEvent(Event):
         bid - The best bid price at the time of the tick.
         ask - The best ask price at the time of the tick.
         """
-        self.type = EventType.TICK
         self.ticker = ticker
         self.time = time
         self.bid = bid
         self.ask = ask
-        self.priority = 100
 
     def __str__(self):
         return "Type: %s, Ticker: %s, Time: %s, Bid: %s, Ask: %s" % (
@@ -62,6 +89,13 @@ class BarEvent(Event):
     open-high-low-close-volume bar, as would be generated
     via common data providers such as Yahoo Finance.
     """
+    __slots__ = (
+        'ticker', 'time', 'period', 'open_price', 'high_price',
+        'low_price', 'close_price', 'volume', 'adj_close_price'
+    )
+    type = EventType.BAR
+    priority = 100
+
     def __init__(
         self, ticker, time, period,
         open_price, high_price, low_price,
@@ -86,7 +120,6 @@ class BarEvent(Event):
         of 'open_price', 'close_price' as 'open' is a reserved
         word in Python.
         """
-        self.type = EventType.BAR
         self.ticker = ticker
         self.time = time
         self.period = period
@@ -96,8 +129,13 @@ class BarEvent(Event):
         self.close_price = close_price
         self.volume = volume
         self.adj_close_price = adj_close_price
-        self.period_readable = self._readable_period()
-        self.priority = 100
+
+    @property
+    def period_readable(self):
+        """
+        The human-readable period, only worked out when asked for.
+        """
+        return self._readable_period()
 
     def _readable_period(self):
         """
@@ -114,23 +152,8 @@ class BarEvent(Event):
         readable period is simply passed through from period,
         in seconds.
         """
-        lut = {
-            1: "1sec",
-            5: "5sec",
-            10: "10sec",
-            15: "15sec",
-            30: "30sec",
-            60: "1min",
-            300: "5min",
-            600: "10min",
-            900: "15min",
-            1800: "30min",
-            3600: "1hr",
-            86400: "1day",
-            604800: "1wk"
-        }
-        if self.period in lut:
-            return lut[self.period]
+        if self.period in _READABLE_PERIODS:
+            return _READABLE_PERIODS[self.period]
         else:
             return "%ssec" % str(self.period)
 
@@ -156,11 +179,99 @@ class BarEvent(Event):
         return (self.priority == other.priority)
 
 
+class BarsEvent(Event):
+    """
+    Handles the event of receiving the bars of every subscribed
+    ticker that share the same timestamp, i.e. a whole
+    cross-section of the universe, in one event.
+
+    Prices and volumes are held as NumPy int64 arrays aligned
+    with tickers, so a strategy can work on the cross-section
+    with vectorized operations.
+    """
+    __slots__ = (
+        'tickers', 'time', 'period', 'open_price', 'high_price',
+        'low_price', 'close_price', 'volume', 'adj_close_price'
+    )
+    type = EventType.BARS
+    priority = 100
+
+    def __init__(
+        self, tickers, time, period,
+        open_price, high_price, low_price,
+        close_price, volume, adj_close_price=None
+    ):
+        """
+        Initialises the BarsEvent.
+
+        Parameters:
+        tickers - The list of ticker symbols with a bar at time.
+        time - The timestamp shared by all of the bars
+        period - The time period covered by the bars in seconds
+        open_price - Array of unadjusted opening prices
+        high_price - Array of unadjusted high prices
+        low_price - Array of unadjusted low prices
+        close_price - Array of unadjusted close prices
+        volume - Array of volumes traded within the bars
+        adj_close_price - Optional array of vendor adjusted
+            closing prices
+        """
+        self.tickers = tickers
+        self.time = time
+        self.period = period
+        self.open_price = open_price
+        self.high_price = high_price
+        self.low_price = low_price
+        self.close_price = close_price
+        self.volume = volume
+        self.adj_close_price = adj_close_price
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def bars(self):
+        """
+        Generates a BarEvent for each ticker of the cross-section,
+        in the order of tickers.
+        """
+        has_adj_close = self.adj_close_price is not None
+        for i, ticker in enumerate(self.tickers):
+            yield BarEvent(
+                ticker, self.time, self.period,
+                int(self.open_price[i]), int(self.high_price[i]),
+                int(self.low_price[i]), int(self.close_price[i]),
+                int(self.volume[i]),
+                int(self.adj_close_price[i]) if has_adj_close else None
+            )
+
+    def __str__(self):
+        return "Type: %s, Tickers: %s, Time: %s, Period: %s" % (
+            str(self.type), ",".join(self.tickers),
+            str(self.time), str(self.period)
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    def __lt__(self, other):
+        return (self.priority < other.priority)
+
+    def __eq__(self, other):
+        return (self.priority == other.priority)
+
+
 class SignalEvent(Event):
     """
     Handles the event of sending a Signal from a Strategy object.
     This is received by a Portfolio object and acted upon.
     """
+    __slots__ = (
+        'ticker', 'action', 'suggested_quantity', 'fraction', 'name',
+        'unit', 'price', 'commission', 'timestamp'
+    )
+    type = EventType.SIGNAL
+    priority = 200
+
     def __init__(
             self, ticker, action, suggested_quantity=None,
             fraction=0.0, name=None, unit=1, price=None,
@@ -183,7 +294,6 @@ class SignalEvent(Event):
         unit - the unit number when scaling into position, i.e 1, 2, or 3.
                This is used during position sizing.
         """
-        self.type = EventType.SIGNAL
         self.ticker = ticker
         self.action = action
         self.suggested_quantity = suggested_quantity
@@ -193,7 +303,6 @@ class SignalEvent(Event):
         self.price = price
         self.commission = commission
         self.timestamp = timestamp
-        self.priority = 200
 
     def __str__(self):
         return "%s ticker:%s action:%s quantity:%s fraction:%.2f%% name:%s unit:%s" % (
@@ -214,6 +323,13 @@ class OrderEvent(Event):
     The order contains a ticker (e.g. GOOG), action (BOT or SLD)
     and quantity.
     """
+    __slots__ = (
+        'ticker', 'action', 'quantity', 'name',
+        'price', 'commission', 'timestamp'
+    )
+    type = EventType.ORDER
+    priority = 300
+
     def __init__(
             self, ticker, action, quantity, name=None,
             price=None, commission=None, timestamp=None
@@ -227,7 +343,6 @@ class OrderEvent(Event):
         quantity - The quantity of shares to transact.
         name - entry or exit name to tie to position
         """
-        self.type = EventType.ORDER
         self.ticker = ticker
         self.action = action
         self.quantity = quantity
@@ -235,7 +350,6 @@ class OrderEvent(Event):
         self.price = price
         self.commission = commission
         self.timestamp = timestamp
-        self.priority = 300
 
     def print_order(self):
         """
@@ -271,6 +385,13 @@ class FillEvent(Event):
     the cost.
     """
 
+    __slots__ = (
+        'timestamp', 'ticker', 'action', 'quantity',
+        'exchange', 'price', 'commission', 'name'
+    )
+    type = EventType.FILL
+    priority = 400
+
     def __init__(
         self, timestamp, ticker,
         action, quantity,
@@ -289,7 +410,6 @@ class FillEvent(Event):
         commission - The brokerage commission for carrying out the trade.
         name - entry or exit name for the position
         """
-        self.type = EventType.FILL
         self.timestamp = timestamp
         self.ticker = ticker
         self.action = action
@@ -298,7 +418,6 @@ class FillEvent(Event):
         self.price = price
         self.commission = commission
         self.name = name
-        self.priority = 400
 
     def __str__(self):
         return "%s ticker:%s timestamp:%s action:%s quantity:%s exchange:%s price:%s commission:%s name:%s" % (
@@ -312,3 +431,45 @@ class FillEvent(Event):
 
     def __eq__(self, other):
         return (self.priority == other.priority)
+
+
+class EventQueue(object):
+    """
+    EventQueue is a drop-in replacement for queue.Queue meant for
+    single-threaded backtests. It is a plain deque, so putting and
+    getting events takes no locks, and empty() can be checked
+    instead of catching queue.Empty on every poll.
+
+    Events are delivered first-in first-out, exactly as with
+    queue.Queue. It must not be shared between threads, so live
+    trading sessions should keep using queue.Queue.
+    """
+    def __init__(self):
+        self._events = deque()
+        self.put = self._events.append
+
+    def get(self, block=False, timeout=None):
+        """
+        Returns the oldest event. As there is nobody to wait
+        for, raises queue.Empty when no event is queued
+        irrespective of block.
+        """
+        try:
+            return self._events.popleft()
+        except IndexError:
+            raise queue.Empty
+
+    def get_nowait(self):
+        return self.get(False)
+
+    def put_nowait(self, event):
+        self._events.append(event)
+
+    def empty(self):
+        return not self._events
+
+    def qsize(self):
+        return len(self._events)
+
+    def __len__(self):
+        return len(self._events)
@@ -1,7 +1,13 @@
 from __future__ import print_function
 
+import math
+from collections import deque
+
+import numpy as np
 import pandas as pd
 
+from .price_handler.iterator.columnar import ColumnarBarEventIterator
+
 
 def RSI(prices, period=14):
     """
@@ -28,3 +34,450 @@ def RSI(prices, period=14):
     rsi = 100. - (100. / (1 + df['rs']))
     
     return rsi
+
+
+class AbstractIndicator(object):
+    """
+    AbstractIndicator is the base class of the streaming indicators,
+    which are updated with one bar's value at a time in O(1), rather
+    than recomputed over the whole price history on every bar.
+
+    value is None until enough values have been seen.
+    """
+    value = None
+
+    @property
+    def ready(self):
+        return self.value is not None
+
+    def update(self, value):
+        raise NotImplementedError("Should implement update()")
+
+
+class SMA(AbstractIndicator):
+    """
+    Simple moving average of the last period values, as
+    pandas' rolling(period).mean().
+    """
+    def __init__(self, period):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0
+
+    def update(self, value):
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+        if len(self.window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+
+class EMA(AbstractIndicator):
+    """
+    Exponential moving average of span period, as pandas'
+    ewm(span=period, adjust=adjust).mean(), which is defined from
+    the first value on.
+    """
+    def __init__(self, period, adjust=True):
+        self.period = period
+        self.adjust = adjust
+        self.decay = 1.0 - 2.0 / (period + 1)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def update(self, value):
+        if self.adjust:
+            # Weighted average with weights decay ** age
+            self.numerator = value + self.decay * self.numerator
+            self.denominator = 1.0 + self.decay * self.denominator
+            self.value = self.numerator / self.denominator
+        elif self.value is None:
+            self.value = float(value)
+        else:
+            self.value = self.decay * self.value + (1.0 - self.decay) * value
+        return self.value
+
+
+class WilderAverage(AbstractIndicator):
+    """
+    Wilder's smoothed average of period: the mean of the first
+    period values, then value = value + (x - value) / period.
+    """
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.total = 0
+
+    def update(self, value):
+        if self.value is not None:
+            self.value += (value - self.value) / self.period
+        else:
+            self.count += 1
+            self.total += value
+            if self.count == self.period:
+                self.value = self.total / self.period
+        return self.value
+
+
+class WilderRSI(AbstractIndicator):
+    """
+    Wilder's Relative Strength Index of period, from the Wilder
+    averages of the gains and losses between successive prices.
+    It is defined once period + 1 prices have been seen, 100 when
+    there were no losses and NaN when prices did not move at all.
+    """
+    def __init__(self, period=14):
+        self.period = period
+        self.last = None
+        self.avg_gain = WilderAverage(period)
+        self.avg_loss = WilderAverage(period)
+
+    def update(self, value):
+        last, self.last = self.last, value
+        if last is None:
+            return None
+        delta = value - last
+        gain = self.avg_gain.update(delta if delta > 0 else 0)
+        loss = self.avg_loss.update(-delta if delta < 0 else 0)
+        if gain is not None:
+            if loss > 0:
+                self.value = 100.0 - 100.0 / (1.0 + gain / loss)
+            elif gain > 0:
+                self.value = 100.0
+            else:
+                self.value = float("nan")
+        return self.value
+
+
+class ATR(AbstractIndicator):
+    """
+    Wilder's Average True Range of period. The true range of the
+    first bar, lacking a previous close, is its high - low.
+    """
+    def __init__(self, period=14):
+        self.period = period
+        self.last_close = None
+        self.average = WilderAverage(period)
+
+    def update(self, high, low, close):
+        true_range = high - low
+        if self.last_close is not None:
+            true_range = max(
+                true_range, abs(high - self.last_close),
+                abs(low - self.last_close)
+            )
+        self.last_close = close
+        self.value = self.average.update(true_range)
+        return self.value
+
+
+class RollingStd(AbstractIndicator):
+    """
+    Standard deviation of the last period values, as pandas'
+    rolling(period).std(ddof). The window's mean and sum of squared
+    deviations are updated as values enter and leave it, which
+    avoids the cancellation of summing squares.
+    """
+    def __init__(self, period, ddof=1):
+        self.period = period
+        self.ddof = ddof
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value):
+        n = len(self.window)
+        if n == self.period:
+            old = self.window[0]
+            delta = value - old
+            old_mean = self.mean
+            self.mean += delta / n
+            self.m2 += delta * (value - self.mean + old - old_mean)
+        else:
+            n += 1
+            delta = value - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (value - self.mean)
+        self.window.append(value)
+        if n == self.period:
+            self.value = math.sqrt(max(self.m2, 0.0) / (n - self.ddof))
+        return self.value
+
+
+class Highest(AbstractIndicator):
+    """
+    Highest of the last period values, as pandas'
+    rolling(period).max(). A deque of the values that may still
+    become the highest makes each update amortised O(1).
+    """
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.candidates = deque()
+
+    def _better(self, value, other):
+        return value >= other
+
+    def update(self, value):
+        candidates = self.candidates
+        while candidates and self._better(value, candidates[-1][1]):
+            candidates.pop()
+        candidates.append((self.count, value))
+        self.count += 1
+        if candidates[0][0] <= self.count - 1 - self.period:
+            candidates.popleft()
+        if self.count >= self.period:
+            self.value = candidates[0][1]
+        return self.value
+
+
+class Lowest(Highest):
+    """
+    Lowest of the last period values, as pandas'
+    rolling(period).min().
+    """
+    def _better(self, value, other):
+        return value <= other
+
+
+class KeyedIndicator(object):
+    """
+    KeyedIndicator keeps a separate streaming indicator per key,
+    e.g. per ticker, created on first use from the indicator class
+    and its arguments.
+    """
+    def __init__(self, indicator_class, *args, **kwargs):
+        self.indicator_class = indicator_class
+        self.args = args
+        self.kwargs = kwargs
+        self.indicators = {}
+
+    def __getitem__(self, key):
+        indicator = self.indicators.get(key)
+        if indicator is None:
+            indicator = self.indicator_class(*self.args, **self.kwargs)
+            self.indicators[key] = indicator
+        return indicator
+
+    def __contains__(self, key):
+        return key in self.indicators
+
+    def update(self, key, *values):
+        """
+        Updates key's indicator and returns its new value.
+        """
+        return self[key].update(*values)
+
+    def value(self, key):
+        """
+        Returns key's current value, None when not ready.
+        """
+        if key not in self.indicators:
+            return None
+        return self.indicators[key].value
+
+
+def sma(values, period):
+    """
+    Simple moving average of period over the array values, NaN
+    until period values have been seen.
+    """
+    return pd.Series(values).rolling(period).mean().values
+
+
+def ema(values, period, adjust=True):
+    """
+    Exponential moving average of span period over the array
+    values.
+    """
+    return pd.Series(values).ewm(span=period, adjust=adjust).mean().values
+
+
+def wilder_average(values, period):
+    """
+    Wilder's smoothed average of period over the array values:
+    the mean of the first period values, then exponentially
+    smoothed with alpha 1 / period. NaN until period values have
+    been seen.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        smoothed = values[period - 1:].copy()
+        smoothed[0] = values[:period].mean()
+        result[period - 1:] = pd.Series(smoothed).ewm(
+            alpha=1.0 / period, adjust=False
+        ).mean().values
+    return result
+
+
+def wilder_rsi(values, period=14):
+    """
+    Wilder's Relative Strength Index of period over the array of
+    prices values, as computed bar by bar by WilderRSI.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if len(values) > 1:
+        delta = np.diff(values)
+        avg_gain = wilder_average(np.where(delta > 0, delta, 0.0), period)
+        avg_loss = wilder_average(np.where(delta < 0, -delta, 0.0), period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[1:] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return result
+
+
+def atr(high, low, close, period=14):
+    """
+    Wilder's Average True Range of period over the high, low and
+    close arrays, as computed bar by bar by ATR.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    prev_close = np.asarray(close, dtype=np.float64)[:-1]
+    true_range = high - low
+    true_range[1:] = np.maximum(true_range[1:], np.maximum(
+        np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)
+    ))
+    return wilder_average(true_range, period)
+
+
+def rolling_std(values, period, ddof=1):
+    """
+    Standard deviation of the last period values of the array
+    values.
+    """
+    return pd.Series(values).rolling(period).std(ddof=ddof).values
+
+
+def highest(values, period):
+    """
+    Highest of the last period values of the array values.
+    """
+    return pd.Series(values).rolling(period).max().values
+
+
+def lowest(values, period):
+    """
+    Lowest of the last period values of the array values.
+    """
+    return pd.Series(values).rolling(period).min().values
+
+
+class PrecomputedIndicators(object):
+    """
+    PrecomputedIndicators computes indicators over the whole price
+    history loaded by a historic bar price handler at once, with
+    the vectorized functions above (or any function mapping price
+    arrays to an array of the same length that only looks back).
+
+    Values are only read back through value() and history(), which
+    look them up at the timestamp of the ticker's bar last streamed
+    by the price handler, so a strategy never sees an indicator
+    value computed from a later bar.
+    """
+    def __init__(self, price_handler):
+        self.price_handler = price_handler
+        self.declared = []
+        self.times = {}
+        self.values = {}
+
+    def add(self, name, function, columns=("close",), tickers=None, **kwargs):
+        """
+        Declares the indicator name as function(*columns, **kwargs)
+        computed per ticker (all tickers when tickers is None).
+
+        columns are the names of the price arrays passed to function,
+        among 'open', 'high', 'low', 'close', 'adj_close' and
+        'volume', prices being PriceParser integers.
+        """
+        if isinstance(columns, str):
+            columns = (columns,)
+        self.declared.append((name, function, tuple(columns), tickers, kwargs))
+
+    def _stream(self):
+        stream = getattr(self.price_handler, "bar_stream", None)
+        if stream is None:
+            # A GenericBarHandler
+            stream = getattr(self.price_handler, "price_event_iterator", None)
+        if not isinstance(stream, ColumnarBarEventIterator):
+            raise NotImplementedError(
+                "Indicators can only be precomputed from a price handler "
+                "whose bars are loaded in memory"
+            )
+        return stream
+
+    def _column_positions(self, stream):
+        positions = {"open": 0, "high": 1, "low": 2, "close": 3, "volume": -1}
+        if stream.has_adj_close:
+            positions["adj_close"] = 4
+        return positions
+
+    def compute(self):
+        """
+        Computes all of the declared indicators.
+        """
+        if not self.declared:
+            return
+        stream = self._stream()
+        positions = self._column_positions(stream)
+        times = stream.index.values.astype("M8[ns]").view(np.int64)
+        rows = {}
+        for i, ticker in enumerate(stream.tickers_lst):
+            rows[ticker] = np.flatnonzero(stream.ticker_ids == i)
+            self.times[ticker] = times[rows[ticker]]
+
+        for name, function, columns, tickers, kwargs in self.declared:
+            for column in columns:
+                if column not in positions:
+                    raise ValueError("Unknown price column '%s'" % column)
+            if tickers is None:
+                tickers = stream.tickers_lst
+            values = self.values.setdefault(name, {})
+            for ticker in tickers:
+                data = stream.values[rows[ticker]]
+                result = np.asarray(function(
+                    *[data[:, positions[c]] for c in columns], **kwargs
+                ), dtype=np.float64)
+                if len(result) != len(data):
+                    raise ValueError(
+                        "Indicator '%s' returned %d values for %d bars" % (
+                            name, len(result), len(data)
+                        )
+                    )
+                result.setflags(write=False)
+                values[ticker] = result
+
+    def _position(self, ticker):
+        """
+        Returns the number of the ticker's bars streamed so far,
+        going by the price handler's last timestamp of ticker.
+        """
+        prices = self.price_handler.tickers.get(ticker, {})
+        timestamp = prices.get("timestamp")
+        if timestamp is None:
+            return 0
+        return int(np.searchsorted(
+            self.times[ticker], pd.Timestamp(timestamp).value, side="right"
+        ))
+
+    def value(self, name, ticker):
+        """
+        Returns the indicator's value as of the ticker's current bar,
+        None when not defined (yet).
+        """
+        position = self._position(ticker)
+        if position == 0:
+            return None
+        value = self.values[name][ticker][position - 1]
+        return None if np.isnan(value) else float(value)
+
+    def history(self, name, ticker, length):
+        """
+        Returns a read-only array of the indicator's last length
+        values up to and including the ticker's current bar.
+        """
+        position = self._position(ticker)
+        return self.values[name][ticker][max(position - length, 0):position]
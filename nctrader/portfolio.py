@@ -19,29 +19,53 @@ class Portfolio(object):
         self.positions = {}
         self.closed_positions = []
         self.realised_pnl = 0
+        self.unrealised_pnl = 0
         self.open_quantity = 0
         self.tickers_info = price_handler.tickers_info
 
-    def _update_portfolio(self):
+    def _get_bid_ask(self, ticker):
+        """
+        Returns the latest bid/ask of a ticker, using the last
+        close for both when the price handler streams bars.
+        """
+        if self.price_handler.istick():
+            return self.price_handler.get_best_bid_ask(ticker)
+        close_price = self.price_handler.get_last_close(ticker)
+        return close_price, close_price
+
+    def _mark_position(self, ticker):
+        """
+        Updates the market value of the open position in ticker
+        and returns the resulting change in its unrealised PnL.
+        """
+        pt = self.positions[ticker]
+        bid, ask = self._get_bid_ask(ticker)
+        timestamp = self.price_handler.get_last_timestamp(ticker)
+        unrealised_pnl = pt.unrealised_pnl
+        pt.update_market_value(bid, ask, timestamp)
+        return pt.unrealised_pnl - unrealised_pnl
+
+    def _update_portfolio(self, tickers=None):
         """
-        Updates the value of all positions that are currently open.
+        Updates the value of the positions that are currently open.
         Value of closed positions is tallied as self.realised_pnl.
+
+        If tickers is given only the positions in those tickers,
+        i.e. the ones that just received a price update, are
+        re-marked and the unrealised PnL is adjusted by their
+        change in value. Otherwise every open position is marked
+        and the unrealised PnL recomputed from scratch.
         """
-        self.unrealised_pnl = 0
-        self.equity = self.realised_pnl
-        self.equity += self.init_cash
-        for ticker in self.positions:
-            pt = self.positions[ticker]
-            if self.price_handler.istick():
-                bid, ask = self.price_handler.get_best_bid_ask(ticker)
-            else:
-                close_price = self.price_handler.get_last_close(ticker)
-                bid = close_price
-                ask = close_price
-            timestamp = self.price_handler.get_last_timestamp(ticker)
-            pt.update_market_value(bid, ask, timestamp)
-            self.unrealised_pnl += pt.unrealised_pnl
-            self.equity += pt.market_value - pt.cost_basis
+        if tickers is None:
+            self.unrealised_pnl = 0
+            for ticker in self.positions:
+                self._mark_position(ticker)
+                self.unrealised_pnl += self.positions[ticker].unrealised_pnl
+        else:
+            for ticker in tickers:
+                if ticker in self.positions:
+                    self.unrealised_pnl += self._mark_position(ticker)
+        self.equity = self.init_cash + self.realised_pnl + self.unrealised_pnl
 
     def _add_position(
         self, action, ticker, quantity,
@@ -57,12 +81,7 @@ class Portfolio(object):
         are updated.
         """
         if ticker not in self.positions:
-            if self.price_handler.istick():
-                bid, ask = self.price_handler.get_best_bid_ask(ticker)
-            else:
-                close_price = self.price_handler.get_last_close(ticker)
-                bid = close_price
-                ask = close_price
+            bid, ask = self._get_bid_ask(ticker)
 
             bpv = self.tickers_info[ticker].big_point_value
             ticker_type = self.tickers_info[ticker].type
@@ -73,7 +92,8 @@ class Portfolio(object):
             )
             self.positions[ticker] = position
             self.open_quantity = quantity
-            self._update_portfolio()
+            self.unrealised_pnl += position.unrealised_pnl
+            self._update_portfolio([ticker])
         else:
             print(
                 "Ticker %s is already in the positions list. "
@@ -95,27 +115,21 @@ class Portfolio(object):
         """
         self.open_quantity = 0
         if ticker in self.positions:
-            self.positions[ticker].transact_shares(
+            position = self.positions[ticker]
+            position.transact_shares(
                 action, quantity, price, commission, name
             )
-            if self.price_handler.istick():
-                bid, ask = self.price_handler.get_best_bid_ask(ticker)
-            else:
-                close_price = self.price_handler.get_last_close(ticker)
-                bid = close_price
-                ask = close_price
-
-            timestamp = self.price_handler.get_last_timestamp(ticker)
-            self.positions[ticker].update_market_value(bid, ask, timestamp)
-
-            self.open_quantity += self.positions[ticker].open_quantity
-            if self.positions[ticker].open_quantity == 0:
+            self.unrealised_pnl += self._mark_position(ticker)
+
+            self.open_quantity += position.open_quantity
+            if position.open_quantity == 0:
                 closed = self.positions.pop(ticker)
+                self.unrealised_pnl -= closed.unrealised_pnl
                 self.realised_pnl += closed.realised_pnl
                 self.cur_cash += closed.realised_pnl
                 self.closed_positions.append(closed)
 
-            self._update_portfolio()
+            self._update_portfolio([])
         else:
             print(
                 "Ticker %s not in the current position list. "
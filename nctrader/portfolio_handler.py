@@ -145,9 +145,13 @@ class PortfolioHandler(object):
         the Portfolio object with new or modified Positions.
         """
 
-    def update_portfolio_value(self):
+    def update_portfolio_value(self, tickers=None):
         """
         Update the portfolio to reflect current market value as
         based on last bid/ask of each ticker.
+
+        Parameters:
+        tickers - The tickers whose prices changed, only those
+            positions are re-marked. None re-marks every position.
         """
-        self.portfolio._update_portfolio()
+        self.portfolio._update_portfolio(tickers)
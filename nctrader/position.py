@@ -5,6 +5,94 @@ from collections import OrderedDict
 from .price_parser import PriceParser
 
 
+class LotLedger(object):
+    """
+    FIFO ledger of the fills on one side (bought or sold) of a
+    Position, held as parallel lists with a head pointer to the
+    oldest lot that still has an open quantity.
+
+    The totals, the open quantity and the open price * quantity
+    are maintained as lots are added and closed out, so that
+    neither matching nor the cost basis re-walk closed lots.
+    """
+    __slots__ = (
+        'quantity', 'remaining_qty', 'price', 'comm', 'init_cost',
+        'head', 'total_quantity', 'total_init_cost',
+        'open_quantity', 'open_price_qty', 'tail_comm'
+    )
+
+    def __init__(self):
+        self.quantity = []
+        self.remaining_qty = []
+        self.price = []
+        self.comm = []
+        self.init_cost = []
+        self.head = 0
+        self.total_quantity = 0
+        self.total_init_cost = 0
+        self.open_quantity = 0
+        self.open_price_qty = 0
+        # Commission of the untouched lots after the head
+        self.tail_comm = 0
+
+    def __len__(self):
+        return len(self.quantity)
+
+    def append(self, quantity, price, comm, init_cost):
+        """
+        Adds a new lot at the back of the ledger.
+        """
+        if self.head < len(self.quantity):
+            self.tail_comm += comm
+        self.quantity.append(quantity)
+        self.remaining_qty.append(quantity)
+        self.price.append(price)
+        self.comm.append(comm)
+        self.init_cost.append(init_cost)
+        self.total_quantity += quantity
+        self.total_init_cost += init_cost
+        self.open_quantity += quantity
+        self.open_price_qty += quantity * price
+
+    def close_head(self, quantity):
+        """
+        Closes out quantity of the head lot, moving the head on
+        to the next lot once it is exhausted.
+        """
+        i = self.head
+        self.remaining_qty[i] -= quantity
+        self.open_quantity -= quantity
+        self.open_price_qty -= quantity * self.price[i]
+        if self.remaining_qty[i] == 0:
+            self.head = i + 1
+            if self.head < len(self.quantity):
+                self.tail_comm -= self.comm[self.head]
+
+    def cost_basis(self, mul):
+        """
+        The signed cost of the open lots, including the
+        remaining share of their commissions.
+        """
+        cb = mul * self.open_price_qty + self.tail_comm
+        i = self.head
+        if i < len(self.quantity):
+            cb += self.remaining_qty[i] / self.quantity[i] * self.comm[i]
+        return cb
+
+    def lots(self):
+        return [
+            {'quantity': q, 'remaining_qty': r, 'price': p,
+             'comm': c, 'init_cost': ic}
+            for q, r, p, c, ic in zip(
+                self.quantity, self.remaining_qty, self.price,
+                self.comm, self.init_cost
+            )
+        ]
+
+    def __repr__(self):
+        return repr(self.lots())
+
+
 class Position(object):
     pos_id = 0
 
@@ -33,8 +121,8 @@ class Position(object):
         self.entry_name = entry_name
         self.exit_name = None
 
-        self.bots = []
-        self.solds = []
+        self.bots = LotLedger()
+        self.solds = LotLedger()
 
         self.realised_pnl = 0
         self.unrealised_pnl = 0
@@ -55,19 +143,16 @@ class Position(object):
         or "SLD") calculate the average bought cost, the total bought
         cost, the average price and the cost basis.
         """
-        trade = {'quantity': self.quantity,
-                 'remaining_qty': self.quantity,
-                 'price': init_price,
-                 'comm': init_commission
-                }
         if self.action == "BOT":
             self.cost_basis = int(self.quantity * init_price * self.mul + init_commission)
-            trade['init_cost'] = abs(self.cost_basis)
-            self.bots.append(trade)
+            self.bots.append(
+                self.quantity, init_price, init_commission, abs(self.cost_basis)
+            )
         else:  # action == "SLD"
             self.cost_basis = int(-self.quantity * init_price * self.mul + init_commission)
-            trade['init_cost'] = abs(self.cost_basis)
-            self.solds.append(trade)
+            self.solds.append(
+                self.quantity, init_price, init_commission, abs(self.cost_basis)
+            )
 
         self.entry_price = int(abs(self.cost_basis) / self.quantity / self.mul)
         self.total_commission = init_commission
@@ -84,11 +169,11 @@ class Position(object):
         allows calculation of the unrealised and realised profit
         and loss of any transactions.
         """
-        mv = 0
+        # open_quantity is the sum of the remaining lot quantities
         if self.action == 'BOT':
-            for p in self.bots: mv += p['remaining_qty'] * bid
+            mv = self.open_quantity * bid
         else:
-            for p in self.solds: mv -= p['remaining_qty'] * ask
+            mv = -self.open_quantity * ask
 
         self.market_value = int(mv * self.mul)
         self.unrealised_pnl = (self.market_value - self.cost_basis)
@@ -102,37 +187,17 @@ class Position(object):
         Update various attributes of the position after changes
         to position was transacted
         """
-        bot, sld = 0, 0
-        b_qty, s_qty = 0, 0
-        b_oqty, s_oqty = 0, 0
-        b_cb, s_cb = 0, 0
-
-        for p in self.bots:
-            b_cb += p['remaining_qty'] * p['price'] * self.mul \
-                + p['remaining_qty'] / p['quantity'] * p['comm']
-            bot += p['init_cost']
-            b_qty += p['quantity']
-            b_oqty += p['remaining_qty']
-
-        for p in self.solds:
-            s_cb -= p['remaining_qty'] * p['price'] * self.mul \
-                - p['remaining_qty'] / p['quantity'] * p['comm']
-            sld += p['init_cost']
-            s_qty += p['quantity']
-            s_oqty += p['remaining_qty']
-
         if self.action == 'BOT':
-            self.quantity = b_qty
-            self.entry_price = int(bot / b_qty / self.mul)
-            self.exit_price = 0 if s_qty == 0 else int(sld / s_qty / self.mul)
-            self.cost_basis = int(b_cb)
-            self.open_quantity = b_oqty
+            lots, other, sign = self.bots, self.solds, 1
         else:
-            self.quantity = s_qty
-            self.entry_price = int(sld / s_qty / self.mul)
-            self.exit_price = 0 if b_qty == 0 else int(bot / b_qty / self.mul)
-            self.cost_basis = int(s_cb)
-            self.open_quantity = s_oqty
+            lots, other, sign = self.solds, self.bots, -1
+
+        self.quantity = lots.total_quantity
+        self.entry_price = int(lots.total_init_cost / lots.total_quantity / self.mul)
+        self.exit_price = 0 if other.total_quantity == 0 \
+            else int(other.total_init_cost / other.total_quantity / self.mul)
+        self.cost_basis = int(lots.cost_basis(sign * self.mul))
+        self.open_quantity = lots.open_quantity
 
         # self.trade_ret = 0 if self.exit_price == 0 else self.exit_price / self.entry_price - 1
         if self.exit_price != 0 and self.ticker_type == 'STK':
@@ -149,76 +214,44 @@ class Position(object):
         bought/sold, the cost basis and PnL calculations,
         as carried out through Interactive Brokers TWS.
         """
-        trade = {'quantity': quantity,
-                 'remaining_qty': quantity,
-                 'price': price,
-                 'comm': commission
-                }
         if action == "BOT":
-            trade['init_cost'] = abs(quantity * price * self.mul + commission)
-            self.bots.append(trade)
+            self.bots.append(
+                quantity, price, commission,
+                abs(quantity * price * self.mul + commission)
+            )
         else: # action == "SLD"
-            trade['init_cost'] = abs(-1 * quantity * price * self.mul + commission)
-            self.solds.append(trade)
+            self.solds.append(
+                quantity, price, commission,
+                abs(-1 * quantity * price * self.mul + commission)
+            )
 
-        remaining_qty = quantity
         rpnl = 0
-        finished = False
-        if self.action == "BOT" and action == "SLD":
-            # sell some of long position
-            for i in range(len(self.bots)):
-                q = self.bots[i]['quantity']
-                qty = self.bots[i]['remaining_qty']
-                e_price = self.bots[i]['price']
-                e_comm = self.bots[i]['comm']
+        if self.action != action:
+            # sell some of long position or buy back some of short
+            # position, oldest lots first
+            if self.action == "BOT":
+                lots, sign = self.bots, 1
+            else:
+                lots, sign = self.solds, -1
+            remaining_qty = quantity
+            while remaining_qty > 0 and lots.head < len(lots):
+                i = lots.head
+                q = lots.quantity[i]
+                qty = lots.remaining_qty[i]
+                e_price = lots.price[i]
+                e_comm = lots.comm[i]
                 if qty < remaining_qty:
-                    rpnl += (price - e_price) * qty * self.mul \
+                    rpnl += sign * (price - e_price) * qty * self.mul \
                         - (qty / q * e_comm)
-                    remaining_qty -= qty
-                    qty = 0
                 elif qty == remaining_qty:
-                    rpnl += (price - e_price) * qty * self.mul \
+                    rpnl += sign * (price - e_price) * qty * self.mul \
                         - (qty / q * e_comm) - commission
-                    remaining_qty -= qty
-                    qty = 0
-                    finished = True
                 else:
-                    rpnl += (price - e_price) * remaining_qty * self.mul \
-                        - (remaining_qty / q * e_comm) - commission
-                    qty -= remaining_qty
-                    remaining_qty = 0
-                    finished = True
-
-                self.bots[i]['remaining_qty'] = qty
-                if finished: break
-
-        elif self.action == "SLD" and action == "BOT":
-            # buy back some of short position
-            for i in range(len(self.solds)):
-                q = self.solds[i]['quantity']
-                qty = self.solds[i]['remaining_qty']
-                e_price = self.solds[i]['price']
-                e_comm = self.solds[i]['comm']
-                if qty < remaining_qty:
-                    rpnl += (e_price - price) * qty * self.mul \
-                        - (qty / q * e_comm)
-                    remaining_qty -= qty
-                    qty = 0
-                elif qty == remaining_qty:
-                    rpnl += (e_price - price) * qty * self.mul \
+                    qty = remaining_qty
+                    rpnl += sign * (price - e_price) * qty * self.mul \
                         - (qty / q * e_comm) - commission
-                    remaining_qty -= qty
-                    qty = 0
-                    finished = True
-                else:
-                    rpnl += (e_price - price) * remaining_qty * self.mul \
-                        - (remaining_qty / q * e_comm) - commission
-                    qty -= remaining_qty
-                    remaining_qty = 0
-                    finished = True
-
-                self.solds[i]['remaining_qty'] = qty
-                if finished: break
+                lots.close_head(qty)
+                remaining_qty -= qty
 
         self.realised_pnl += int(rpnl)
 
@@ -1,7 +1,11 @@
 from __future__ import print_function
 
+import copy
 from abc import ABCMeta
 
+from ..event import EventType
+from .iterator.base import AbstractPriceEventIterator
+
 
 class AbstractPriceHandler(object):
     """
@@ -32,6 +36,26 @@ class AbstractPriceHandler(object):
                 "as it was never subscribed." % ticker
             )
 
+    def copy(self, events_queue):
+        """
+        Returns a price handler at the start of the same price
+        stream, placing its events onto events_queue, which shares
+        the price data already loaded and parsed by this one.
+
+        This lets many backtests, e.g. of a parameter sweep, run
+        off data loaded once. It must be called before this
+        handler starts streaming, and its event iterators must
+        implement copy().
+        """
+        handler = copy.copy(self)
+        handler.events_queue = events_queue
+        handler.continue_backtest = True
+        handler.tickers = copy.deepcopy(self.tickers)
+        for name, value in vars(self).items():
+            if isinstance(value, AbstractPriceEventIterator):
+                setattr(handler, name, value.copy())
+        return handler
+
     def get_last_timestamp(self, ticker):
         """
         Returns the most recent actual timestamp for a given ticker
@@ -92,11 +116,30 @@ class AbstractBarPriceHandler(AbstractPriceHandler):
         """
         Store price event for closing price and adjusted closing price
         """
+        if event.type == EventType.BARS:
+            self._store_bars_event(event)
+            return
         ticker = event.ticker
         self.tickers[ticker]["close"] = event.close_price
         self.tickers[ticker]["adj_close"] = event.adj_close_price
         self.tickers[ticker]["timestamp"] = event.time
 
+    def _store_bars_event(self, event):
+        """
+        Store closing price and adjusted closing price of every
+        ticker of a cross-sectional BarsEvent
+        """
+        closes = event.close_price.tolist()
+        if event.adj_close_price is not None:
+            adj_closes = event.adj_close_price.tolist()
+        else:
+            adj_closes = [None] * len(closes)
+        for ticker, close, adj_close in zip(event.tickers, closes, adj_closes):
+            prices = self.tickers[ticker]
+            prices["close"] = close
+            prices["adj_close"] = adj_close
+            prices["timestamp"] = event.time
+
     def get_last_close(self, ticker):
         """
         Returns the most recent actual (unadjusted) closing price.
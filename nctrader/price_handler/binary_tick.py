@@ -0,0 +1,91 @@
+from __future__ import print_function
+
+from collections import OrderedDict
+
+import pandas as pd
+
+from .base import AbstractTickPriceHandler
+from .iterator.binary_tick import BinaryTickEventIterator, open_ticks
+
+
+class BinaryTickPriceHandler(AbstractTickPriceHandler):
+    """
+    BinaryTickPriceHandler streams TickEvents from the binary,
+    memory mapped, tick files written by the convert_csv_ticks
+    script, as a drop-in replacement for
+    HistoricCSVTickPriceHandler.
+
+    Nothing is parsed or sorted on subscription, so start up
+    time and memory no longer grow with the amount of data.
+    """
+    def __init__(
+        self, tick_dir, events_queue, init_tickers=None, reuse_events=False
+    ):
+        """
+        Takes the binary tick directory, the events queue and a
+        possible list of initial ticker symbols, then creates an
+        (optional) list of ticker subscriptions and associated prices.
+        """
+        self.tick_dir = tick_dir
+        self.events_queue = events_queue
+        self.reuse_events = reuse_events
+        self.continue_backtest = True
+        self.tickers = {}
+        self.tickers_ticks = OrderedDict()
+        if init_tickers is not None:
+            for ticker in init_tickers:
+                self.subscribe_ticker(ticker)
+        self.tick_stream = self._merge_sort_ticker_data()
+
+    def _merge_sort_ticker_data(self):
+        """
+        Returns a BinaryTickEventIterator merging the tickers'
+        memory mapped ticks in timestamp order as they stream.
+        """
+        return BinaryTickEventIterator(
+            self.tickers_ticks, reuse_events=self.reuse_events
+        )
+
+    def subscribe_ticker(self, ticker):
+        """
+        Subscribes the price handler to a new ticker symbol.
+        """
+        if ticker not in self.tickers:
+            try:
+                times, bids, asks = open_ticks(self.tick_dir, ticker)
+                self.tickers_ticks[ticker] = (times, bids, asks)
+                self.tickers[ticker] = {
+                    "bid": int(bids[0]),
+                    "ask": int(asks[0]),
+                    "timestamp": pd.Timestamp(int(times[0]))
+                }
+            except (OSError, IndexError):
+                self.tickers_ticks.pop(ticker, None)
+                print(
+                    "Could not subscribe ticker %s "
+                    "as no binary tick data found for pricing." % ticker
+                )
+        else:
+            print(
+                "Could not subscribe ticker %s "
+                "as is already subscribed." % ticker
+            )
+
+    def unsubscribe_ticker(self, ticker):
+        """
+        Unsubscribes the price handler from a current ticker symbol.
+        """
+        self.tickers.pop(ticker, None)
+        self.tickers_ticks.pop(ticker, None)
+
+    def stream_next(self):
+        """
+        Place the next TickEvent onto the event queue.
+        """
+        try:
+            tev = next(self.tick_stream)
+        except StopIteration:
+            self.continue_backtest = False
+            return
+        self._store_event(tev)
+        self.events_queue.put(tev)
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from ..price_parser import PriceParser
+
+
+class ParsedDataCache(object):
+    """
+    ParsedDataCache keeps the parsed, PriceParser converted, price
+    columns of source files (e.g. CSVs) in a binary cache directory,
+    so that the slow text and date parsing is done only once.
+
+    Every entry is a single .npz file keyed by the source's absolute
+    path, size and modification time, so changing a source file
+    invalidates its entry. The cache is bounded to max_bytes, the
+    least recently used entries being evicted first.
+    """
+    # Bumped whenever the layout of the entries changes
+    VERSION = 1
+
+    def __init__(self, cache_dir, max_bytes=1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Creates the cache configured by the CACHE_DIR and (optional)
+        CACHE_MAX_BYTES settings.
+        """
+        max_bytes = config.get("CACHE_MAX_BYTES", 1024 ** 3)
+        return cls(os.path.expanduser(config.CACHE_DIR), max_bytes)
+
+    def entry_path(self, path, kind):
+        """
+        Returns the cache file of the source file path as read by
+        kind, e.g. the name of the price handler reading it.
+        Raises OSError when path does not exist.
+        """
+        stat = os.stat(path)
+        key = "%s|%s|%d|%d|%d" % (
+            kind, os.path.abspath(path), stat.st_size,
+            stat.st_mtime_ns, self.VERSION
+        )
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "%s-%s.npz" % (kind, digest))
+
+    def load(self, path, kind):
+        """
+        Returns the cached DataFrame of path, or None when it is not
+        cached (or no longer up to date). A corrupt entry, e.g. one
+        truncated by a full disk, is removed and treated as a miss.
+        """
+        entry = self.entry_path(path, kind)
+        if not os.path.exists(entry):
+            return None
+        try:
+            with np.load(entry) as npz:
+                index = pd.DatetimeIndex(
+                    npz["index"].view("M8[ns]"),
+                    name=str(npz["index_name"]) or None
+                )
+                columns = [str(c) for c in npz["columns"]]
+                df = pd.DataFrame(
+                    dict((c, npz["c%d" % i]) for i, c in enumerate(columns)),
+                    index=index, columns=columns
+                )
+        except (
+            OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile
+        ):
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+            return None
+        # Mark it as recently used
+        os.utime(entry, None)
+        return df
+
+    def store(self, path, kind, df):
+        """
+        Stores the numeric columns of the time indexed DataFrame df
+        as the cache entry of path, then evicts entries as needed.
+        """
+        entry = self.entry_path(path, kind)
+        df = df.select_dtypes("number")
+        arrays = dict(
+            ("c%d" % i, df[c].values) for i, c in enumerate(df.columns)
+        )
+        arrays["index"] = df.index.values.astype("M8[ns]").view(np.int64)
+        arrays["index_name"] = np.array(df.index.name or "")
+        arrays["columns"] = np.array([str(c) for c in df.columns])
+        # Written aside then renamed, so readers never see half an entry
+        tmp = "%s.%d.tmp" % (entry, os.getpid())
+        with open(tmp, "wb") as fd:
+            np.savez(fd, **arrays)
+        os.replace(tmp, entry)
+        self.evict()
+
+    def get(self, path, kind, read, price_columns):
+        """
+        Returns the DataFrame of path with its price_columns parsed
+        by the PriceParser, from the cache, or else by calling read()
+        to parse the source and caching the result.
+        """
+        df = self.load(path, kind)
+        if df is None:
+            df = read()
+            for column in price_columns:
+                df[column] = PriceParser.parse_array(df[column].values)
+            self.store(path, kind, df)
+            df = df.select_dtypes("number")
+            df.index = pd.DatetimeIndex(
+                df.index.values.astype("M8[ns]"), name=df.index.name
+            )
+        return df
+
+    def _entries(self):
+        entries = []
+        for fname in os.listdir(self.cache_dir):
+            if fname.endswith(".npz"):
+                stat = os.stat(os.path.join(self.cache_dir, fname))
+                entries.append((stat.st_mtime, stat.st_size, fname))
+        return entries
+
+    def size(self):
+        """
+        Returns the total size in bytes of the cache entries.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache
+        holds at most max_bytes.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, fname in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, fname))
+            total -= size
+
+    def clear(self):
+        """
+        Removes all of the cache entries.
+        """
+        for _, _, fname in self._entries():
+            os.remove(os.path.join(self.cache_dir, fname))
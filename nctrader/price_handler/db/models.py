@@ -7,7 +7,7 @@ Created on Sun Jan 21 10:53:38 2018
 # -*- coding: utf-8 -*-
 from datetime import datetime
 from sqlalchemy import (BigInteger, Integer, Column, String, Float, DateTime,
-                        Time, ForeignKey, UniqueConstraint)
+                        Time, ForeignKey, Index, UniqueConstraint)
 from sqlalchemy.orm import relationship
 from . import Base
 
@@ -34,7 +34,13 @@ class Asset(Base):
     created_date = Column(DateTime, default=datetime.now)
     last_updated_date = Column(DateTime, default=datetime.now)
 
-    UniqueConstraint(exchange_id, data_vendor_id, ticker, name='asset_u1')
+    __table_args__ = (
+        UniqueConstraint(
+            'exchange_id', 'data_vendor_id', 'ticker', name='asset_u1'
+        ),
+        # The lookup of the price handlers' ticker joins
+        Index('asset_ix1', 'ticker', 'data_vendor_id'),
+    )
     data_vendor = relationship("DataVendor", back_populates="assets")
     exchange = relationship("Exchange", back_populates="assets")
     bar_data = relationship("BarData", back_populates="assets")
@@ -109,6 +115,15 @@ class BarData(Base):
     created_date = Column(DateTime, default=datetime.now)
     last_updated_date = Column(DateTime, default=datetime.now)
 
+    # Covers the price handlers' ticker, bar size and time range
+    # queries, which then never read the table itself
+    __table_args__ = (
+        Index(
+            'bar_data_ix1', 'asset_id', 'bar_size', 'timestamp',
+            'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+        ),
+    )
+
     assets = relationship("Asset", order_by=Asset.id, back_populates="bar_data")
 
     def __repr__(self):
@@ -130,6 +145,12 @@ class TickData(Base):
     created_date = Column(DateTime, default=datetime.now)
     last_updated_date = Column(DateTime, default=datetime.now)
 
+    __table_args__ = (
+        Index(
+            'tick_data_ix1', 'asset_id', 'timestamp', 'bid_price', 'ask_price'
+        ),
+    )
+
     assets = relationship("Asset", order_by=Asset.id, back_populates="tick_data")
 
     def __repr__(self):
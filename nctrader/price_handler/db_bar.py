@@ -1,10 +1,14 @@
-import pandas as pd
-
 from ..price_parser import PriceParser
 from .base import AbstractBarPriceHandler
 from .db import db_session, init_engine
 from .db.models import Asset, DataVendor
-from ..event import BarEvent
+from .iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarBarsEventIterator
+)
+from .iterator.merge import MergedChunkBarEventIterator
+from .sql import (
+    bound_text, rank_case, read_sql_chunks, read_sql_frame, window_clause
+)
 
 
 class DbBarPriceHandler(AbstractBarPriceHandler):
@@ -16,36 +20,67 @@ class DbBarPriceHandler(AbstractBarPriceHandler):
     """
     def __init__(
         self, db_uri, events_queue, init_tickers=None,
-        data_vendor='CSI', bar_size='D'
+        data_vendor='CSI', bar_size='D', group_bars=False,
+        reuse_events=False, start_date=None, end_date=None, chunksize=None,
+        engine_kwargs=None
     ):
         """
         Takes path to sqlite database, the events queue and a possible
         list of initial ticker assets then creates an (optional)
         list of ticker subscriptions and associated prices.
+
+        With group_bars set, a single BarsEvent holding every
+        ticker's bar is streamed per timestamp instead of one
+        BarEvent per ticker. With reuse_events set, a single
+        recycled event instance is streamed, see
+        ReusableEventMixin.
+
+        Only the bars between the optional start_date and end_date
+        (inclusive) are queried. With chunksize set, the bars are
+        not loaded up front but fetched chunksize rows at a time
+        through a streaming cursor while streaming, keeping a
+        connection checked out per subscribe_tickers call.
+
+        engine_kwargs are passed on to init_engine, e.g. to size
+        its connection pool.
         """
+        if chunksize is not None and group_bars:
+            raise NotImplementedError(
+                "group_bars is not supported with chunksize"
+            )
         self.db_uri = db_uri
         self.events_queue = events_queue
         self.bar_size = bar_size
-        self.engine = init_engine(db_uri)
+        self.group_bars = group_bars
+        self.reuse_events = reuse_events
+        self.start_date = start_date
+        self.end_date = end_date
+        self.chunksize = chunksize
+        self.engine = init_engine(db_uri, **(engine_kwargs or {}))
         self.data_vendor = db_session.query(DataVendor) \
                                      .filter(DataVendor.name == data_vendor) \
                                      .first()
         self.continue_backtest = True
         self.tickers = {}
         self.tickers_data = {}
+        self.price_chunks = []
         self.tickers_info = {}
         if init_tickers is not None:
-            for ticker in init_tickers:
-                self.subscribe_ticker(ticker)
+            self.subscribe_tickers(init_tickers)
         self.bar_stream = self._merge_sort_ticker_data()
 
-    def _load_ticker_price(self, ticker):
+    def _load_tickers_price(self, tickers):
         """
-        Opens the database containing the ticker data from
-        the specified database, converting them into
-        them into a pandas DataFrame, stored in a dictionary.
+        Loads the bars of all of the tickers from the database with
+        a single query, ordered by timestamp and then by the order
+        of tickers, so the database does the merge.
+
+        Returns a DataFrame holding every ticker's bars, with a
+        ticker column, or with chunksize set an iterator of such
+        DataFrames streamed from the database.
         """
         qry = """SELECT d.timestamp AS date,
+                        s.ticker AS ticker,
                         d.open_price AS open,
                         d.high_price AS high,
                         d.low_price AS low,
@@ -56,110 +91,168 @@ class DbBarPriceHandler(AbstractBarPriceHandler):
                         data_vendor dv
                   WHERE s.id = d.asset_id
                     AND dv.id = s.data_vendor_id
-                    AND s.ticker = '%s'
-                    AND d.bar_size = '%s'
-                    AND dv.name = '%s'
+                    AND s.ticker IN :tickers
+                    AND d.bar_size = :bar_size
+                    AND dv.name = :data_vendor
+        """
+        params = {
+            "tickers": list(tickers),
+            "bar_size": self.bar_size,
+            "data_vendor": self.data_vendor.name
+        }
+        qry += window_clause(params, self.start_date, self.end_date)
+        qry += " ORDER BY d.timestamp, %s" % rank_case(
+            "s.ticker", tickers, params
+        )
+        sql_qry = bound_text(qry, params)
+        if self.chunksize is not None:
+            return read_sql_chunks(
+                self.engine, sql_qry, params, 'date', self.chunksize
+            )
+        return read_sql_frame(self.engine, sql_qry, params, 'date')
+
+    def _load_tickers_first_bar(self, tickers):
+        """
+        Loads the first bar of each of the tickers within the date
+        window from the database with a single query.
+        """
+        qry = """SELECT d.timestamp AS date,
+                        s.ticker AS ticker,
+                        d.close_price AS close
+                   FROM bar_data    d,
+                        asset       s,
+                        data_vendor dv
+                  WHERE s.id = d.asset_id
+                    AND dv.id = s.data_vendor_id
+                    AND s.ticker IN :tickers
+                    AND d.bar_size = :bar_size
+                    AND dv.name = :data_vendor
+                    AND d.timestamp = (
+                        SELECT MIN(f.timestamp)
+                          FROM bar_data f
+                         WHERE f.asset_id = d.asset_id
+                           AND f.bar_size = d.bar_size
         """
-        sql_qry = qry % (ticker, self.bar_size, self.data_vendor.name)
-        self.tickers_data[ticker] = pd.read_sql_query(
-            sql_qry, self.engine, index_col='date', parse_dates=['date']
+        params = {
+            "tickers": list(tickers),
+            "bar_size": self.bar_size,
+            "data_vendor": self.data_vendor.name
+        }
+        qry += window_clause(
+            params, self.start_date, self.end_date, "f.timestamp"
+        )
+        qry += ")"
+        return read_sql_frame(
+            self.engine, bound_text(qry, params), params, 'date'
         )
-        self.tickers_data[ticker]["Ticker"] = ticker
 
-    def _load_ticker_info(self, ticker):
+    def _load_tickers_info(self, tickers):
         """
-        Opens up the sqlite database, loads the Asset table into a dictionary
-        containing all the additional information including big_point_value,
-        tick_size, margin
+        Loads the Asset rows of all of the tickers from the
+        database with a single query, holding all the additional
+        information including big_point_value, tick_size, margin.
+
+        Returns a dictionary of ticker -> Asset.
         """
-        asset_info = db_session.query(Asset) \
-                               .filter(Asset.ticker == ticker) \
-                               .filter(Asset.data_vendor == self.data_vendor) \
-                               .one()
-        asset_info.margin = PriceParser.parse(asset_info.margin)
-        return asset_info
+        assets = db_session.query(Asset) \
+                           .filter(Asset.ticker.in_(list(tickers))) \
+                           .filter(Asset.data_vendor == self.data_vendor) \
+                           .all()
+        tickers_info = {}
+        for asset_info in assets:
+            asset_info.margin = PriceParser.parse(asset_info.margin)
+            tickers_info[asset_info.ticker] = asset_info
+        return tickers_info
 
     def _merge_sort_ticker_data(self):
         """
-        Concatenates all of the separate equities DataFrames
-        into a single DataFrame that is time ordered, allowing tick
-        data events to be added to the queue in a chronological fashion.
+        Merges all of the separate equities DataFrames into a
+        ColumnarBarEventIterator whose parsed price columns are time
+        ordered, allowing bar events to be added to the queue in a
+        chronological fashion.
 
         Note that this is an idealised situation, utilised solely for
         backtesting. In live trading ticks may arrive "out of order".
         """
-        return pd.concat(
-            self.tickers_data.values()
-        ).sort_index().iterrows()
+        if self.chunksize is not None:
+            return MergedChunkBarEventIterator(
+                self.price_chunks, self._period_map[self.bar_size],
+                columns=("open", "high", "low", "close", "volume", None),
+                ticker_column="ticker", reuse_events=self.reuse_events
+            )
+        if self.group_bars:
+            iterator = ColumnarBarsEventIterator
+        else:
+            iterator = ColumnarBarEventIterator
+        return iterator(
+            self.tickers_data, self._period_map[self.bar_size],
+            columns=("open", "high", "low", "close", "volume", None),
+            reuse_events=self.reuse_events
+        )
 
     def subscribe_ticker(self, ticker):
         """
         Subscribes the price handler to a new ticker symbol.
         """
-        if ticker not in self.tickers:
-            try:
-                self._load_ticker_price(ticker)
-                dft = self.tickers_data[ticker]
-                row0 = dft.iloc[0]
+        self.subscribe_tickers([ticker])
 
-                close = PriceParser.parse(row0["close"])
-
-                ticker_prices = {
-                    "close": close,
-                    "timestamp": dft.index[0]
-                }
-                self.tickers[ticker] = ticker_prices
-            except OSError:
+    def subscribe_tickers(self, tickers):
+        """
+        Subscribes the price handler to new ticker symbols, loading
+        their prices and Asset information with one query each
+        whatever the number of tickers.
+        """
+        new_tickers = []
+        for ticker in tickers:
+            if ticker in self.tickers or ticker in new_tickers:
                 print(
                     "Could not subscribe ticker %s "
-                    "as no data was found in database..." % ticker
+                    "as is already subscribed." % ticker
                 )
-        else:
-            print(
-                "Could not subscribe ticker %s "
-                "as is already subscribed." % ticker
-            )
+            else:
+                new_tickers.append(ticker)
+        if not new_tickers:
+            return
 
-        if ticker not in self.tickers_info:
-            try:
-                ticker_info = self._load_ticker_info(ticker)
-                self.tickers_info[ticker] = ticker_info
-            except OSError:
+        prices = self._load_tickers_price(new_tickers)
+        if self.chunksize is not None:
+            self.price_chunks.append(prices)
+            first_bars = self._load_tickers_first_bar(new_tickers)
+        else:
+            for ticker, dft in prices.groupby("ticker", sort=False):
+                self.tickers_data[ticker] = dft
+            first_bars = prices.groupby("ticker", sort=False).head(1)
+        for timestamp, row in first_bars.iterrows():
+            self.tickers[row["ticker"]] = {
+                "close": PriceParser.parse(row["close"]),
+                "timestamp": timestamp
+            }
+        for ticker in new_tickers:
+            if ticker not in self.tickers:
                 print(
-                    "Could not load ticker info %s as no data"
-                    "was found in database table Asset..." % ticker
+                    "Could not subscribe ticker %s "
+                    "as no data was found in database..." % ticker
                 )
 
-    def _create_event(self, index, period, ticker, row):
-        """
-        Obtain all elements of the bar from a row of dataframe
-        and return a BarEvent
-        """
-        open_price = PriceParser.parse(row["open"])
-        high_price = PriceParser.parse(row["high"])
-        low_price = PriceParser.parse(row["low"])
-        close_price = PriceParser.parse(row["close"])
-        volume = int(row["volume"])
-        bev = BarEvent(
-            ticker, index, period, open_price, high_price,
-            low_price, close_price, volume
-        )
-        return bev
+        missing_info = [t for t in new_tickers if t not in self.tickers_info]
+        if missing_info:
+            self.tickers_info.update(self._load_tickers_info(missing_info))
+            for ticker in missing_info:
+                if ticker not in self.tickers_info:
+                    print(
+                        "Could not load ticker info %s as no data "
+                        "was found in database table Asset..." % ticker
+                    )
 
     def stream_next(self):
         """
         Place the next BarEvent onto the event queue.
         """
         try:
-            index, row = next(self.bar_stream)
+            bev = next(self.bar_stream)
         except StopIteration:
             self.continue_backtest = False
             return
-        # Obtain all elements of the bar from the dataframe
-        ticker = row["Ticker"]
-        period = self._period_map[self.bar_size]
-        # Create the tick event for the queue
-        bev = self._create_event(index, period, ticker, row)
         # Store event
         self._store_event(bev)
         # Send event to queue
@@ -4,9 +4,10 @@ from ..exception import EmptyTickEvent, EmptyBarEvent
 
 
 class AbstractGenericHandler(AbstractPriceHandler):
-    def __init__(self, events_queue, price_event_iterator):
+    def __init__(self, events_queue, price_event_iterator, tickers_info=None):
         self.events_queue = events_queue
         self.price_event_iterator = price_event_iterator
+        self.tickers_info = tickers_info if tickers_info is not None else {}
         self.continue_backtest = True
         self.tickers = {}
         for ticker in self.tickers_lst:
@@ -39,10 +40,14 @@ class GenericTickHandler(AbstractGenericHandler, AbstractTickPriceHandler):
     pass
 
 
-def GenericPriceHandler(events_queue, price_event_iterator):
+def GenericPriceHandler(events_queue, price_event_iterator, tickers_info=None):
     if isinstance(price_event_iterator, AbstractBarEventIterator):
-        return GenericBarHandler(events_queue, price_event_iterator)
+        return GenericBarHandler(
+            events_queue, price_event_iterator, tickers_info
+        )
     elif isinstance(price_event_iterator, AbstractTickEventIterator):
-        return GenericTickHandler(events_queue, price_event_iterator)
+        return GenericTickHandler(
+            events_queue, price_event_iterator, tickers_info
+        )
     else:
         raise NotImplementedError("price_event_iterator must be instance of")
@@ -1,11 +1,13 @@
 from __future__ import print_function
 
 import os
+from collections import OrderedDict
 
 import pandas as pd
 
 from .base import AbstractTickPriceHandler
-from ..event import TickEvent
+from .iterator.columnar import ColumnarTickEventIterator
+from .iterator.merge import ChunkedTickEventIterator
 from ..price_parser import PriceParser
 
 
@@ -15,14 +17,32 @@ class HistoricCSVTickPriceHandler(AbstractTickPriceHandler):
     tick data for each requested financial instrument and
     stream those to the provided events queue as TickEvents.
     """
-    def __init__(self, csv_dir, events_queue, init_tickers=None):
+    def __init__(
+        self, csv_dir, events_queue, init_tickers=None,
+        reuse_events=False, chunksize=None,
+        cache=None
+    ):
         """
         Takes the CSV directory, the events queue and a possible
         list of initial ticker symbols, then creates an (optional)
         list of ticker subscriptions and associated prices.
+
+        With reuse_events set, a single recycled TickEvent is
+        streamed, see ReusableEventMixin.
+
+        With chunksize set, the CSVs are not loaded up front but
+        read chunksize rows at a time while streaming, merged
+        across tickers by a ChunkedTickEventIterator.
+
+        With cache, a ParsedDataCache, set the CSVs are parsed once
+        and their price columns then loaded, already converted to
+        PriceParser integers, from the cache.
         """
         self.csv_dir = csv_dir
         self.events_queue = events_queue
+        self.reuse_events = reuse_events
+        self.chunksize = chunksize
+        self.cache = cache
         self.continue_backtest = True
         self.tickers = {}
         self.tickers_data = {}
@@ -31,31 +51,57 @@ class HistoricCSVTickPriceHandler(AbstractTickPriceHandler):
                 self.subscribe_ticker(ticker)
         self.tick_stream = self._merge_sort_ticker_data()
 
-    def _open_ticker_price_csv(self, ticker):
+    def _read_ticker_price_csv(self, ticker, **kwargs):
         """
-        Opens the CSV files containing the equities ticks from
-        the specified CSV data directory, converting them into
-        them into a pandas DataFrame, stored in a dictionary.
+        Reads the CSV file of ticker from the specified CSV data
+        directory, passing kwargs (e.g. nrows, chunksize) on
+        to read_csv.
         """
         ticker_path = os.path.join(self.csv_dir, "%s.csv" % ticker)
-        self.tickers_data[ticker] = pd.io.parsers.read_csv(
+        return pd.io.parsers.read_csv(
             ticker_path, header=0, parse_dates=True,
             dayfirst=True, index_col=1,
-            names=("Ticker", "Time", "Bid", "Ask")
+            names=("Ticker", "Time", "Bid", "Ask"), **kwargs
         )
 
+    def _open_ticker_price_csv(self, ticker):
+        """
+        Opens the CSV files containing the equities ticks from
+        the specified CSV data directory, converting them into
+        them into a pandas DataFrame, stored in a dictionary.
+        """
+        if self.cache is not None:
+            dft = self.cache.get(
+                os.path.join(self.csv_dir, "%s.csv" % ticker),
+                "historic_csv_tick",
+                lambda: self._read_ticker_price_csv(ticker), ("Bid", "Ask")
+            )
+            dft["Ticker"] = ticker
+            self.tickers_data[ticker] = dft[["Ticker", "Bid", "Ask"]]
+        else:
+            self.tickers_data[ticker] = self._read_ticker_price_csv(ticker)
+
     def _merge_sort_ticker_data(self):
         """
-        Concatenates all of the separate equities DataFrames
-        into a single DataFrame that is time ordered, allowing tick
-        data events to be added to the queue in a chronological fashion.
+        Merges all of the separate equities DataFrames into a
+        ColumnarTickEventIterator whose parsed bid/ask columns are time
+        ordered, allowing tick events to be added to the queue in a
+        chronological fashion.
 
         Note that this is an idealised situation, utilised solely for
         backtesting. In live trading ticks may arrive "out of order".
         """
-        return pd.concat(
-            self.tickers_data.values()
-        ).sort_index().iterrows()
+        if self.chunksize is not None:
+            return ChunkedTickEventIterator(
+                OrderedDict(
+                    (ticker, self._read_ticker_price_csv(
+                        ticker, chunksize=self.chunksize
+                    )) for ticker in self.tickers
+                ), reuse_events=self.reuse_events
+            )
+        return ColumnarTickEventIterator(
+            self.tickers_data, reuse_events=self.reuse_events
+        )
 
     def subscribe_ticker(self, ticker):
         """
@@ -63,8 +109,11 @@ class HistoricCSVTickPriceHandler(AbstractTickPriceHandler):
         """
         if ticker not in self.tickers:
             try:
-                self._open_ticker_price_csv(ticker)
-                dft = self.tickers_data[ticker]
+                if self.chunksize is not None:
+                    dft = self._read_ticker_price_csv(ticker, nrows=1)
+                else:
+                    self._open_ticker_price_csv(ticker)
+                    dft = self.tickers_data[ticker]
                 row0 = dft.iloc[0]
                 ticker_prices = {
                     "bid": PriceParser.parse(row0["Bid"]),
@@ -83,26 +132,14 @@ class HistoricCSVTickPriceHandler(AbstractTickPriceHandler):
                 "as is already subscribed." % ticker
             )
 
-    def _create_event(self, index, ticker, row):
-        """
-        Obtain all elements of the bar a row of dataframe
-        and return a TickEvent
-        """
-        bid = PriceParser.parse(row["Bid"])
-        ask = PriceParser.parse(row["Ask"])
-        tev = TickEvent(ticker, index, bid, ask)
-        return tev
-
     def stream_next(self):
         """
         Place the next TickEvent onto the event queue.
         """
         try:
-            index, row = next(self.tick_stream)
+            tev = next(self.tick_stream)
         except StopIteration:
             self.continue_backtest = False
             return
-        ticker = row["Ticker"]
-        tev = self._create_event(index, ticker, row)
         self._store_event(tev)
         self.events_queue.put(tev)
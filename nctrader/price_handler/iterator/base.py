@@ -10,6 +10,12 @@ class AbstractPriceEventIterator(object):
     def next(self):
         return self.__next__()
 
+    def copy(self):
+        """
+        Returns a new iterator at the start of the same stream.
+        """
+        raise NotImplementedError("Should implement copy()")
+
 
 class AbstractBarEventIterator(AbstractPriceEventIterator):
     def _create_event(self, index, period, ticker, row):
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .base import AbstractTickEventIterator
+from .columnar import ReusableEventMixin
+from .merge import merge_sorted
+from ...event import TickEvent
+
+
+# Every column of a ticker is a raw little-endian int64 file
+TICK_COLUMNS = ("time", "bid", "ask")
+TICK_DTYPE = np.dtype("<i8")
+
+
+def tick_column_path(tick_dir, ticker, column):
+    return os.path.join(tick_dir, ticker, "%s.i8" % column)
+
+
+def append_ticks(tick_dir, ticker, times, bids, asks):
+    """
+    Appends ticks to the binary tick files of ticker in tick_dir,
+    creating them if needed.
+
+    Parameters:
+    times - int64 nanosecond timestamps, in increasing order.
+    bids, asks - int64 prices in PriceParser units.
+    """
+    ticker_dir = os.path.join(tick_dir, ticker)
+    if not os.path.isdir(ticker_dir):
+        os.makedirs(ticker_dir)
+    for column, values in zip(TICK_COLUMNS, (times, bids, asks)):
+        with open(tick_column_path(tick_dir, ticker, column), "ab") as fd:
+            np.asarray(values, dtype=TICK_DTYPE).tofile(fd)
+
+
+def open_ticks(tick_dir, ticker):
+    """
+    Memory maps the binary tick files of ticker read-only and
+    returns its times, bids and asks arrays.
+    """
+    arrays = []
+    for column in TICK_COLUMNS:
+        path = tick_column_path(tick_dir, ticker, column)
+        if os.path.getsize(path) == 0:
+            arrays.append(np.empty(0, dtype=TICK_DTYPE))
+        else:
+            arrays.append(np.memmap(path, dtype=TICK_DTYPE, mode="r"))
+    return tuple(arrays)
+
+
+def memmap_tick_blocks(times, bids, asks, block_size=4096):
+    """
+    Reads a ticker's memory mapped tick columns block_size ticks
+    at a time, as the (keys, rows) blocks taken by merge_sorted.
+    """
+    for start in range(0, len(times), block_size):
+        end = start + block_size
+        yield times[start:end].tolist(), list(zip(
+            bids[start:end].tolist(), asks[start:end].tolist()
+        ))
+
+
+class BinaryTickEventIterator(ReusableEventMixin, AbstractTickEventIterator):
+    """
+    BinaryTickEventIterator streams TickEvents straight from the
+    memory mapped binary tick files of several tickers.
+
+    The tickers are merged lazily by merge_sorted, so nothing is
+    loaded or sorted up front and the memory used is a block of
+    ticks per ticker. Equal timestamps come out in the order in
+    which the tickers were given.
+    """
+    def __init__(self, tickers_ticks, block_size=4096, reuse_events=False):
+        """
+        Takes an (ordered) dict of ticker -> (times, bids, asks)
+        arrays, as returned by open_ticks.
+        """
+        self.tickers_ticks = tickers_ticks
+        self.tickers_lst = list(tickers_ticks.keys())
+        self.block_size = block_size
+        self.reuse_events = reuse_events
+        self.length = sum(len(t[0]) for t in tickers_ticks.values())
+        self.stream = merge_sorted([
+            memmap_tick_blocks(*tickers_ticks[ticker], block_size=block_size)
+            for ticker in self.tickers_lst
+        ])
+
+    def __len__(self):
+        return self.length
+
+    def copy(self):
+        return BinaryTickEventIterator(
+            self.tickers_ticks, self.block_size, self.reuse_events
+        )
+
+    def __next__(self):
+        rank, key, (bid, ask) = next(self.stream)
+        return self._new_event(
+            TickEvent, self.tickers_lst[rank], pd.Timestamp(key), bid, ask
+        )
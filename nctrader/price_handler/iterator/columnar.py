@@ -0,0 +1,276 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from .base import AbstractBarEventIterator, AbstractTickEventIterator
+from ...event import BarEvent, BarsEvent, TickEvent
+from ...price_parser import PriceParser
+
+
+def merge_columns(tickers_data, price_columns, int_columns=()):
+    """
+    Converts the per-ticker DataFrames of tickers_data into a single
+    set of contiguous NumPy arrays, ordered by timestamp across all
+    tickers.
+
+    Prices are converted to the PriceParser integer representation
+    once, up front, so that streaming an event only needs a few
+    array reads. Equal timestamps keep the order in which the
+    tickers were subscribed.
+
+    Parameters:
+    tickers_data - A dict of ticker -> time indexed DataFrame.
+    price_columns - Names of the columns holding prices.
+    int_columns - Names of the columns holding plain integers (volume).
+
+    Returns:
+    index, ticker_ids, tickers_lst, values
+    """
+    tickers_lst = list(tickers_data.keys())
+    frames = [tickers_data[ticker] for ticker in tickers_lst]
+    columns = list(price_columns) + list(int_columns)
+    if len(frames) == 0:
+        return (
+            pd.DatetimeIndex([]), np.empty(0, dtype=np.int32),
+            tickers_lst, np.empty((0, len(columns)), dtype=np.int64)
+        )
+
+    times = np.concatenate([df.index.values for df in frames])
+    ticker_ids = np.concatenate([
+        np.full(len(df), i, dtype=np.int32) for i, df in enumerate(frames)
+    ])
+    values = np.empty((len(times), len(columns)), dtype=np.int64)
+    for j, col in enumerate(columns):
+        raw = np.concatenate([df[col].values for df in frames])
+        if col in price_columns:
+            values[:, j] = PriceParser.parse_array(raw)
+        else:
+            values[:, j] = raw
+
+    # A stable sort keeps ticker subscription order for equal timestamps
+    order = np.argsort(times, kind='mergesort')
+    index = pd.DatetimeIndex(times[order])
+    tz = getattr(frames[0].index, 'tz', None)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return index, ticker_ids[order], tickers_lst, values[order]
+
+
+class ReusableEventMixin(object):
+    """
+    Lets a columnar iterator hand out one recycled event instance,
+    re-initialised in place for every next(), instead of allocating
+    a new event each time.
+
+    This is only safe when every event has been fully handled
+    before the next one is streamed and nothing holds on to it,
+    as is the case in Backtest, which only asks the price handler
+    for a new event once the events queue has been drained.
+    """
+    reuse_events = False
+    event = None
+
+    def _new_event(self, event_class, *args):
+        event = self.event
+        if event is None:
+            event = event_class(*args)
+            if self.reuse_events:
+                self.event = event
+        else:
+            event.__init__(*args)
+        return event
+
+
+class ColumnarBarEventIterator(ReusableEventMixin, AbstractBarEventIterator):
+    """
+    ColumnarBarEventIterator streams BarEvents from the merged,
+    pre-parsed columns of several tickers' OHLCV DataFrames.
+
+    The DataFrames are only touched once, at construction, so that
+    each call to next() costs a handful of array reads instead of
+    building a pandas Series per bar.
+    """
+    def __init__(
+        self, tickers_data, period,
+        columns=("Open", "High", "Low", "Close", "Volume", "Adj Close"),
+        reuse_events=False
+    ):
+        """
+        Takes the dict of ticker DataFrames, the bar period in seconds
+        and the names of the open, high, low, close, volume and
+        (optional, may be None) adjusted close columns.
+
+        With reuse_events set, the same event instance is
+        re-initialised and returned by every next().
+        """
+        open_col, high_col, low_col, close_col, vol_col, adj_col = columns
+        price_columns = [open_col, high_col, low_col, close_col]
+        if adj_col is not None:
+            price_columns.append(adj_col)
+        self.period = period
+        self.reuse_events = reuse_events
+        self.has_adj_close = adj_col is not None
+        self._set_arrays(
+            *merge_columns(tickers_data, price_columns, [vol_col])
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, index, ticker_ids, tickers_lst, values,
+        period, has_adj_close, reuse_events=False
+    ):
+        """
+        Creates the iterator directly over already merged arrays,
+        laid out as returned by merge_columns with the volume
+        column last, without copying them.
+        """
+        iterator = cls.__new__(cls)
+        iterator.period = period
+        iterator.reuse_events = reuse_events
+        iterator.has_adj_close = has_adj_close
+        iterator._set_arrays(index, ticker_ids, tickers_lst, values)
+        return iterator
+
+    def _set_arrays(self, index, ticker_ids, tickers_lst, values):
+        self.index = index
+        self.ticker_ids = ticker_ids
+        self.tickers_lst = tickers_lst
+        self.values = values
+        self.length = len(index)
+        self.position = 0
+
+    def __len__(self):
+        return self.length
+
+    def copy(self):
+        """
+        Returns a new iterator at the start of the stream, sharing
+        this one's read-only arrays.
+        """
+        iterator = copy.copy(self)
+        iterator.position = 0
+        iterator.event = None
+        return iterator
+
+    def __next__(self):
+        i = self.position
+        if i >= self.length:
+            raise StopIteration
+        self.position = i + 1
+        row = self.values[i].tolist()
+        if self.has_adj_close:
+            open_price, high_price, low_price, close_price, \
+                adj_close_price, volume = row
+        else:
+            open_price, high_price, low_price, close_price, volume = row
+            adj_close_price = None
+        return self._new_event(
+            BarEvent, self.tickers_lst[self.ticker_ids[i]], self.index[i],
+            self.period, open_price, high_price, low_price,
+            close_price, volume, adj_close_price
+        )
+
+
+class ColumnarBarsEventIterator(ColumnarBarEventIterator):
+    """
+    ColumnarBarsEventIterator streams one BarsEvent per timestamp,
+    holding the bars of every ticker sharing that timestamp.
+
+    The price and volume arrays of each BarsEvent are views onto
+    the merged columns, so no data is copied while streaming.
+    """
+    def _set_arrays(self, index, ticker_ids, tickers_lst, values):
+        super(ColumnarBarsEventIterator, self)._set_arrays(
+            index, ticker_ids, tickers_lst, values
+        )
+        # Start of every run of equal timestamps, plus the end
+        if self.length > 0:
+            changes = np.flatnonzero(np.diff(self.index.values)) + 1
+            self.bounds = np.concatenate(([0], changes, [self.length]))
+        else:
+            self.bounds = np.zeros(1, dtype=np.int64)
+        self.groups = len(self.bounds) - 1
+        self.group = 0
+
+    def __len__(self):
+        return self.groups
+
+    def copy(self):
+        iterator = super(ColumnarBarsEventIterator, self).copy()
+        iterator.group = 0
+        return iterator
+
+    def __next__(self):
+        g = self.group
+        if g >= self.groups:
+            raise StopIteration
+        self.group = g + 1
+        start, end = self.bounds[g], self.bounds[g + 1]
+        block = self.values[start:end]
+        tickers = [self.tickers_lst[i] for i in self.ticker_ids[start:end]]
+        return self._new_event(
+            BarsEvent, tickers, self.index[start], self.period,
+            block[:, 0], block[:, 1], block[:, 2], block[:, 3],
+            block[:, -1], block[:, 4] if self.has_adj_close else None
+        )
+
+
+class ColumnarTickEventIterator(ReusableEventMixin, AbstractTickEventIterator):
+    """
+    ColumnarTickEventIterator streams TickEvents from the merged,
+    pre-parsed bid/ask columns of several tickers' tick DataFrames.
+    """
+    def __init__(self, tickers_data, columns=("Bid", "Ask"), reuse_events=False):
+        """
+        Takes the dict of ticker DataFrames and the names of the
+        bid and ask columns. With reuse_events set, the same event
+        instance is re-initialised and returned by every next().
+        """
+        self.reuse_events = reuse_events
+        self._set_arrays(*merge_columns(tickers_data, list(columns)))
+
+    @classmethod
+    def from_arrays(
+        cls, index, ticker_ids, tickers_lst, values, reuse_events=False
+    ):
+        """
+        Creates the iterator directly over already merged bid/ask
+        arrays, as returned by merge_columns, without copying them.
+        """
+        iterator = cls.__new__(cls)
+        iterator.reuse_events = reuse_events
+        iterator._set_arrays(index, ticker_ids, tickers_lst, values)
+        return iterator
+
+    def _set_arrays(self, index, ticker_ids, tickers_lst, values):
+        self.index = index
+        self.ticker_ids = ticker_ids
+        self.tickers_lst = tickers_lst
+        self.values = values
+        self.length = len(index)
+        self.position = 0
+
+    def __len__(self):
+        return self.length
+
+    def copy(self):
+        """
+        Returns a new iterator at the start of the stream, sharing
+        this one's read-only arrays.
+        """
+        iterator = copy.copy(self)
+        iterator.position = 0
+        iterator.event = None
+        return iterator
+
+    def __next__(self):
+        i = self.position
+        if i >= self.length:
+            raise StopIteration
+        self.position = i + 1
+        bid, ask = self.values[i].tolist()
+        return self._new_event(
+            TickEvent, self.tickers_lst[self.ticker_ids[i]],
+            self.index[i], bid, ask
+        )
@@ -0,0 +1,210 @@
+import heapq
+
+import numpy as np
+
+from .base import AbstractBarEventIterator, AbstractTickEventIterator
+from .columnar import ReusableEventMixin
+from ...event import BarEvent, TickEvent
+from ...price_parser import PriceParser
+
+
+def merge_sorted(tickers_blocks):
+    """
+    Lazily merges several tickers' time ordered streams into a
+    single stream, in timestamp order.
+
+    The merge keeps only the next row of every ticker in a heap,
+    so memory is bounded by the number of tickers (plus whatever
+    block each source holds) and the first row comes out as soon
+    as every ticker has produced one. Equal timestamps come out
+    in the order of tickers_blocks, i.e. in subscription order.
+
+    Parameters:
+    tickers_blocks - A list with, for each ticker, an iterable of
+        (keys, rows) blocks: keys is a list of integer (e.g. ns)
+        timestamps in increasing order and rows the list of rows
+        going with them.
+
+    Yields:
+    (rank, key, row) where rank is the index of the ticker in
+    tickers_blocks.
+    """
+    streams = []
+    heap = []
+    for rank, blocks in enumerate(tickers_blocks):
+        stream = _block_rows(blocks)
+        streams.append(stream)
+        first = next(stream, None)
+        if first is not None:
+            heap.append((first[0], rank, first[1]))
+    heapq.heapify(heap)
+
+    while heap:
+        key, rank, row = heap[0]
+        following = next(streams[rank], None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            # The unique rank settles ties, rows are never compared
+            heapq.heapreplace(heap, (following[0], rank, following[1]))
+        yield rank, key, row
+
+
+def _block_rows(blocks):
+    """
+    Flattens (keys, rows) blocks into (key, row) pairs, checking
+    that the keys never go back in time.
+    """
+    last = None
+    for keys, rows in blocks:
+        if not keys:
+            continue
+        if (last is not None and keys[0] < last) or (
+            np.diff(keys) < 0
+        ).any():
+            raise ValueError("Price data is not in time order")
+        last = keys[-1]
+        for item in zip(keys, rows):
+            yield item
+
+
+def time_keys(index):
+    """
+    Integer nanosecond keys of a DatetimeIndex, in UTC when it is
+    timezone aware, as a list.
+    """
+    return index.values.astype("datetime64[ns]").view(np.int64).tolist()
+
+
+def dataframe_blocks(chunks, price_columns, int_columns=(), other_columns=()):
+    """
+    Turns an iterable of time indexed DataFrame chunks, e.g. the
+    reader of read_csv(..., chunksize=n) or of
+    read_sql_query(..., chunksize=n), into (keys, rows) blocks.
+
+    Every row holds the timestamp, then the price columns parsed
+    by the PriceParser, then the integer columns, then the other
+    columns as they are.
+    """
+    for df in chunks:
+        columns = [
+            PriceParser.parse_array(df[col].values).tolist()
+            for col in price_columns
+        ]
+        columns += [df[col].values.astype(np.int64).tolist() for col in int_columns]
+        columns += [df[col].tolist() for col in other_columns]
+        yield time_keys(df.index), list(zip(df.index, *columns))
+
+
+class ChunkedBarEventIterator(ReusableEventMixin, AbstractBarEventIterator):
+    """
+    ChunkedBarEventIterator streams BarEvents from several tickers'
+    time ordered DataFrame chunks, merging them with merge_sorted
+    as they are read, instead of loading and sorting everything
+    before the first bar.
+    """
+    def __init__(
+        self, tickers_chunks, period,
+        columns=("Open", "High", "Low", "Close", "Volume", "Adj Close"),
+        reuse_events=False
+    ):
+        """
+        Takes an (ordered) dict of ticker -> iterable of DataFrame
+        chunks, the bar period in seconds and the names of the open,
+        high, low, close, volume and (optional, may be None)
+        adjusted close columns.
+        """
+        open_col, high_col, low_col, close_col, vol_col, adj_col = columns
+        price_columns = [open_col, high_col, low_col, close_col]
+        if adj_col is not None:
+            price_columns.append(adj_col)
+        self.period = period
+        self.reuse_events = reuse_events
+        self.has_adj_close = adj_col is not None
+        self.tickers_lst = list(tickers_chunks.keys())
+        self.stream = merge_sorted([
+            dataframe_blocks(tickers_chunks[ticker], price_columns, [vol_col])
+            for ticker in self.tickers_lst
+        ])
+
+    def _bar_event(self, ticker, row):
+        if self.has_adj_close:
+            time, open_price, high_price, low_price, close_price, \
+                adj_close_price, volume = row[:7]
+        else:
+            time, open_price, high_price, low_price, close_price, \
+                volume = row[:6]
+            adj_close_price = None
+        return self._new_event(
+            BarEvent, ticker, time, self.period,
+            open_price, high_price, low_price, close_price,
+            volume, adj_close_price
+        )
+
+    def __next__(self):
+        rank, key, row = next(self.stream)
+        return self._bar_event(self.tickers_lst[rank], row)
+
+
+class MergedChunkBarEventIterator(ChunkedBarEventIterator):
+    """
+    MergedChunkBarEventIterator streams BarEvents from streams of
+    DataFrame chunks each holding several tickers' bars already in
+    time order, with a ticker column, e.g. the chunks of a single
+    multi-ticker query ordered by timestamp in the database.
+
+    The streams themselves are merged with merge_sorted, equal
+    timestamps coming out in stream order.
+    """
+    def __init__(
+        self, streams, period,
+        columns=("Open", "High", "Low", "Close", "Volume", "Adj Close"),
+        ticker_column="Ticker", reuse_events=False
+    ):
+        """
+        Takes a list of iterables of DataFrame chunks, the bar
+        period in seconds, the names of the open, high, low, close,
+        volume and (optional, may be None) adjusted close columns
+        and the name of the ticker column.
+        """
+        open_col, high_col, low_col, close_col, vol_col, adj_col = columns
+        price_columns = [open_col, high_col, low_col, close_col]
+        if adj_col is not None:
+            price_columns.append(adj_col)
+        self.period = period
+        self.reuse_events = reuse_events
+        self.has_adj_close = adj_col is not None
+        self.stream = merge_sorted([
+            dataframe_blocks(
+                chunks, price_columns, [vol_col], [ticker_column]
+            ) for chunks in streams
+        ])
+
+    def __next__(self):
+        rank, key, row = next(self.stream)
+        return self._bar_event(row[-1], row)
+
+
+class ChunkedTickEventIterator(ReusableEventMixin, AbstractTickEventIterator):
+    """
+    ChunkedTickEventIterator streams TickEvents from several
+    tickers' time ordered DataFrame chunks, merging them with
+    merge_sorted as they are read.
+    """
+    def __init__(self, tickers_chunks, columns=("Bid", "Ask"), reuse_events=False):
+        """
+        Takes an (ordered) dict of ticker -> iterable of DataFrame
+        chunks and the names of the bid and ask columns.
+        """
+        self.reuse_events = reuse_events
+        self.tickers_lst = list(tickers_chunks.keys())
+        self.stream = merge_sorted([
+            dataframe_blocks(tickers_chunks[ticker], list(columns))
+            for ticker in self.tickers_lst
+        ])
+
+    def __next__(self):
+        rank, key, (time, bid, ask) = next(self.stream)
+        return self._new_event(
+            TickEvent, self.tickers_lst[rank], time, bid, ask
+        )
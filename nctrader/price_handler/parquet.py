@@ -0,0 +1,284 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ..price_parser import PriceParser
+from .base import AbstractBarPriceHandler, AbstractTickPriceHandler
+from .iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarBarsEventIterator,
+    ColumnarTickEventIterator
+)
+
+
+# Every partition file holds a timestamp column and these columns,
+# as vendor floats (volume as int64)
+BAR_COLUMNS = ("open", "high", "low", "close", "volume", "adj_close")
+TICK_COLUMNS = ("bid", "ask")
+
+YEAR_PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int32())]), flavor="hive"
+)
+
+
+def ticker_dir(dataset_dir, ticker):
+    return os.path.join(dataset_dir, "ticker=%s" % ticker)
+
+
+def write_partitions(dataset_dir, ticker, df, part=0):
+    """
+    Writes the time indexed DataFrame df of ticker into the
+    dataset, as one <dataset_dir>/ticker=T/year=YYYY/part-N.parquet
+    file per year of data. Writing more data for the same years
+    needs a new part number.
+    """
+    df = df.rename_axis("timestamp").reset_index()
+    years = df["timestamp"].dt.year
+    for year in years.unique():
+        year_dir = os.path.join(ticker_dir(dataset_dir, ticker), "year=%d" % year)
+        if not os.path.isdir(year_dir):
+            os.makedirs(year_dir)
+        table = pa.Table.from_pandas(df[years == year], preserve_index=False)
+        pq.write_table(
+            table, os.path.join(year_dir, "part-%05d.parquet" % part)
+        )
+
+
+def _timestamp_scalar(timestamp):
+    return pa.scalar(timestamp.to_pydatetime(), type=pa.timestamp("ns"))
+
+
+def read_partitions(dataset_dir, ticker, columns, start_date=None, end_date=None):
+    """
+    Reads the columns of ticker between the optional, inclusive,
+    start_date and end_date out of the dataset, as a time indexed
+    DataFrame.
+
+    Only the ticker's directory is listed, the year partitions
+    outside of the dates are skipped and the date filter is pushed
+    down to the Parquet row groups, so only the needed columns of
+    the needed rows are ever read.
+    """
+    dataset = ds.dataset(
+        ticker_dir(dataset_dir, ticker), format="parquet",
+        partitioning=YEAR_PARTITIONING
+    )
+    condition = None
+    if start_date is not None:
+        start_date = pd.Timestamp(start_date)
+        condition = (ds.field("year") >= start_date.year) & (
+            ds.field("timestamp") >= _timestamp_scalar(start_date)
+        )
+    if end_date is not None:
+        end_date = pd.Timestamp(end_date)
+        expr = (ds.field("year") <= end_date.year) & (
+            ds.field("timestamp") <= _timestamp_scalar(end_date)
+        )
+        condition = expr if condition is None else condition & expr
+
+    table = dataset.to_table(
+        columns=["timestamp"] + list(columns), filter=condition
+    )
+    df = table.to_pandas().set_index("timestamp")
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="mergesort")
+    return df
+
+
+class ParquetBarPriceHandler(AbstractBarPriceHandler):
+    """
+    ParquetBarPriceHandler reads Open-High-Low-Close-Volume bars
+    from a Parquet dataset partitioned by ticker and year, e.g. as
+    written by the convert_to_parquet script, and streams them to
+    the provided events queue as BarEvents.
+
+    Unlike the CSV handlers, nothing is parsed from text: only the
+    OHLCV columns and years needed are read, straight into arrays
+    that the columnar event iterators convert to PriceParser
+    integers. Requires pyarrow.
+    """
+    def __init__(
+        self, dataset_dir, events_queue, init_tickers=None,
+        bar_size='D', start_date=None, end_date=None, tickers_info=None,
+        group_bars=False, reuse_events=False
+    ):
+        """
+        Takes the dataset directory, the events queue and a possible
+        list of initial ticker symbols then creates an (optional)
+        list of ticker subscriptions and associated prices.
+
+        Only the bars between the optional start_date and end_date
+        (inclusive) are read. tickers_info is the optional dict of
+        ticker -> ticker information used by the portfolio, as the
+        dataset only holds prices. group_bars and reuse_events are
+        as for the YahooDailyCsvBarPriceHandler.
+        """
+        self.dataset_dir = dataset_dir
+        self.events_queue = events_queue
+        self.bar_size = bar_size
+        self.start_date = start_date
+        self.end_date = end_date
+        self.group_bars = group_bars
+        self.reuse_events = reuse_events
+        self.continue_backtest = True
+        self.tickers = {}
+        self.tickers_data = {}
+        self.tickers_info = tickers_info if tickers_info is not None else {}
+        if init_tickers is not None:
+            for ticker in init_tickers:
+                self.subscribe_ticker(ticker)
+        self.bar_stream = self._merge_sort_ticker_data()
+
+    def _load_ticker_price(self, ticker):
+        self.tickers_data[ticker] = read_partitions(
+            self.dataset_dir, ticker, BAR_COLUMNS,
+            self.start_date, self.end_date
+        )
+
+    def _merge_sort_ticker_data(self):
+        """
+        Merges all of the separate tickers' DataFrames into a
+        ColumnarBarEventIterator whose parsed price columns are
+        time ordered.
+        """
+        if self.group_bars:
+            iterator = ColumnarBarsEventIterator
+        else:
+            iterator = ColumnarBarEventIterator
+        return iterator(
+            self.tickers_data, self._period_map[self.bar_size],
+            columns=BAR_COLUMNS,
+            reuse_events=self.reuse_events
+        )
+
+    def subscribe_ticker(self, ticker):
+        """
+        Subscribes the price handler to a new ticker symbol.
+        """
+        if ticker not in self.tickers:
+            try:
+                self._load_ticker_price(ticker)
+                dft = self.tickers_data[ticker]
+                row0 = dft.iloc[0]
+
+                ticker_prices = {
+                    "close": PriceParser.parse(row0["close"]),
+                    "adj_close": PriceParser.parse(row0["adj_close"]),
+                    "timestamp": dft.index[0]
+                }
+                self.tickers[ticker] = ticker_prices
+            except (OSError, IndexError):
+                self.tickers_data.pop(ticker, None)
+                print(
+                    "Could not subscribe ticker %s "
+                    "as no Parquet data found for pricing." % ticker
+                )
+        else:
+            print(
+                "Could not subscribe ticker %s "
+                "as is already subscribed." % ticker
+            )
+
+    def stream_next(self):
+        """
+        Place the next BarEvent onto the event queue.
+        """
+        try:
+            bev = next(self.bar_stream)
+        except StopIteration:
+            self.continue_backtest = False
+            return
+        # Store event
+        self._store_event(bev)
+        # Send event to queue
+        self.events_queue.put(bev)
+
+
+class ParquetTickPriceHandler(AbstractTickPriceHandler):
+    """
+    ParquetTickPriceHandler reads bid/ask ticks from a Parquet
+    dataset partitioned by ticker and year and streams them to the
+    provided events queue as TickEvents. Requires pyarrow.
+    """
+    def __init__(
+        self, dataset_dir, events_queue, init_tickers=None,
+        start_date=None, end_date=None, reuse_events=False
+    ):
+        """
+        Takes the dataset directory, the events queue and a possible
+        list of initial ticker symbols then creates an (optional)
+        list of ticker subscriptions and associated prices. Only
+        the ticks between the optional start_date and end_date
+        (inclusive) are read.
+        """
+        self.dataset_dir = dataset_dir
+        self.events_queue = events_queue
+        self.start_date = start_date
+        self.end_date = end_date
+        self.reuse_events = reuse_events
+        self.continue_backtest = True
+        self.tickers = {}
+        self.tickers_data = {}
+        if init_tickers is not None:
+            for ticker in init_tickers:
+                self.subscribe_ticker(ticker)
+        self.tick_stream = self._merge_sort_ticker_data()
+
+    def _load_ticker_price(self, ticker):
+        self.tickers_data[ticker] = read_partitions(
+            self.dataset_dir, ticker, TICK_COLUMNS,
+            self.start_date, self.end_date
+        )
+
+    def _merge_sort_ticker_data(self):
+        """
+        Merges all of the separate tickers' DataFrames into a
+        ColumnarTickEventIterator whose parsed bid/ask columns are
+        time ordered.
+        """
+        return ColumnarTickEventIterator(
+            self.tickers_data, columns=TICK_COLUMNS,
+            reuse_events=self.reuse_events
+        )
+
+    def subscribe_ticker(self, ticker):
+        """
+        Subscribes the price handler to a new ticker symbol.
+        """
+        if ticker not in self.tickers:
+            try:
+                self._load_ticker_price(ticker)
+                dft = self.tickers_data[ticker]
+                row0 = dft.iloc[0]
+
+                ticker_prices = {
+                    "bid": PriceParser.parse(row0["bid"]),
+                    "ask": PriceParser.parse(row0["ask"]),
+                    "timestamp": dft.index[0]
+                }
+                self.tickers[ticker] = ticker_prices
+            except (OSError, IndexError):
+                self.tickers_data.pop(ticker, None)
+                print(
+                    "Could not subscribe ticker %s "
+                    "as no Parquet data found for pricing." % ticker
+                )
+        else:
+            print(
+                "Could not subscribe ticker %s "
+                "as is already subscribed." % ticker
+            )
+
+    def stream_next(self):
+        """
+        Place the next TickEvent onto the event queue.
+        """
+        try:
+            tev = next(self.tick_stream)
+        except StopIteration:
+            self.continue_backtest = False
+            return
+        self._store_event(tev)
+        self.events_queue.put(tev)
@@ -0,0 +1,448 @@
+import copy
+import re
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from ..event import EventType, BarEvent
+from .base import AbstractBarPriceHandler
+from .iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarBarsEventIterator,
+    ColumnarTickEventIterator
+)
+
+
+_UNIT_SECONDS = {'S': 1, 'M': 60, 'H': 60*60, 'D': 60*60*24}
+
+
+def bar_period(bar_size):
+    """
+    Returns the period in seconds of bar_size, either one of the
+    AbstractBarPriceHandler._period_map sizes or a count and unit
+    of S(econds), M(inutes), H(ours) or D(ays), e.g. '5M', '4H'.
+    """
+    if bar_size in AbstractBarPriceHandler._period_map:
+        return AbstractBarPriceHandler._period_map[bar_size]
+    match = re.match(r"^(\d+)([SMHD])$", str(bar_size).upper())
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError("Unknown bar size '%s'" % bar_size)
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def bucket_starts(times, period):
+    """
+    Returns the start, in nanoseconds, of the period second bucket
+    of every datetime64[ns] of times. Buckets are aligned on the
+    epoch, so that e.g. 4H bars start at midnight.
+    """
+    period_ns = period * 1000000000
+    times = np.asarray(times).view(np.int64)
+    return times - times % period_ns
+
+
+def _bucket_index(buckets, like):
+    index = pd.DatetimeIndex(buckets.view("M8[ns]"))
+    tz = getattr(like, 'tz', None)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return index
+
+
+def _aggregate(index, ticker_ids, prices, volume, period, last_columns=()):
+    """
+    Aggregates the time ordered rows of every ticker into period
+    second OHLCV bars.
+
+    prices holds the open, high, low and close columns, last_columns
+    further columns whose last value is kept (adjusted close).
+    Returns the merged index, ticker_ids and values of the bars,
+    ordered by time with ties in ticker id order.
+    """
+    if len(index) == 0:
+        return (
+            index[:0], ticker_ids[:0],
+            np.empty((0, 5 + len(last_columns)), dtype=np.int64)
+        )
+    buckets = bucket_starts(index.values.astype("M8[ns]"), period)
+    # Group each ticker's rows together, keeping their time order
+    order = np.argsort(ticker_ids, kind='mergesort')
+    tids = ticker_ids[order]
+    buckets = buckets[order]
+    if np.any((np.diff(buckets) < 0) & (np.diff(tids) == 0)):
+        raise ValueError("Price rows are not in time order")
+    starts = np.flatnonzero(
+        np.concatenate(([True], (np.diff(buckets) != 0) | (np.diff(tids) != 0)))
+    )
+    ends = np.concatenate((starts[1:], [len(order)])) - 1
+
+    values = np.empty((len(starts), 5 + len(last_columns)), dtype=np.int64)
+    values[:, 0] = prices[order[starts], 0]
+    values[:, 1] = np.maximum.reduceat(prices[order, 1], starts)
+    values[:, 2] = np.minimum.reduceat(prices[order, 2], starts)
+    values[:, 3] = prices[order[ends], 3]
+    for j, column in enumerate(last_columns):
+        values[:, 4 + j] = column[order[ends]]
+    values[:, -1] = np.add.reduceat(volume[order], starts)
+
+    bar_buckets = buckets[starts]
+    bar_tids = tids[starts]
+    bar_order = np.lexsort((bar_tids, bar_buckets))
+    return (
+        _bucket_index(bar_buckets[bar_order], index),
+        bar_tids[bar_order], values[bar_order]
+    )
+
+
+def resample_bar_arrays(index, ticker_ids, values, period, has_adj_close):
+    """
+    Aggregates merged bar arrays, laid out as by merge_columns
+    (open, high, low, close, [adjusted close,] volume), into bars
+    of period seconds, all at once.
+
+    Every bar is labelled with the start of its period: it holds
+    the first open, highest high, lowest low, last close and
+    adjusted close and the total volume of the source bars
+    starting within it. Returns index, ticker_ids and values in
+    the same layout.
+    """
+    last_columns = (values[:, 4],) if has_adj_close else ()
+    return _aggregate(
+        index, ticker_ids, values[:, :4], values[:, -1], period, last_columns
+    )
+
+
+def tick_prices(bid, ask, price="mid"):
+    """
+    Returns the prices bars are built from out of bid and ask
+    arrays (or integers): 'bid', 'ask' or their 'mid', rounded down
+    to a whole PriceParser unit.
+    """
+    if price == "mid":
+        return (bid + ask) // 2
+    elif price == "bid":
+        return bid
+    elif price == "ask":
+        return ask
+    raise NotImplementedError("Unknown tick price '%s'" % price)
+
+
+def resample_tick_arrays(index, ticker_ids, values, period, price="mid"):
+    """
+    Aggregates merged bid/ask arrays into bars of period seconds
+    of the tick price, all at once, each bar's volume being its
+    number of ticks. Returns index, ticker_ids and values laid out
+    as for a ColumnarBarEventIterator without adjusted close.
+    """
+    prices = tick_prices(values[:, 0], values[:, 1], price)
+    return _aggregate(
+        index, ticker_ids, np.repeat(prices[:, None], 4, axis=1),
+        np.ones(len(prices), dtype=np.int64), period
+    )
+
+
+class BarAggregator(object):
+    """
+    BarAggregator builds period second OHLCV BarEvents out of a time
+    ordered stream of TickEvents, BarEvents or BarsEvents, one
+    event at a time, as needed for live feeds.
+
+    A bar is only handed out once a later event shows its period
+    to be over (or close() is called), so nothing that happened
+    after a bar's end is ever seen before it. As all tickers share
+    the same buckets, every bar of a period is closed at once and
+    bars come out in time order, ties in order of first appearance.
+    """
+    def __init__(self, period, price="mid"):
+        """
+        Takes the bar period in seconds and the tick price ('mid',
+        'bid' or 'ask') used to build bars from ticks.
+        """
+        self.period = period
+        self.period_ns = period * 1000000000
+        self.price = price
+        self.bucket = None
+        self.tz = None
+        self.ranks = {}
+        self.bars = {}
+
+    def update(self, event):
+        """
+        Adds the price event to its ticker's current bar. Returns
+        the list of BarEvents it closed, possibly empty.
+        """
+        time = pd.Timestamp(event.time)
+        bucket = time.value - time.value % self.period_ns
+        closed = []
+        if self.bucket is None or bucket > self.bucket:
+            closed = self._close_all()
+            self.bucket = bucket
+            self.tz = time.tz
+        elif bucket < self.bucket:
+            raise ValueError(
+                "%s arrived after the bars of %s" % (time, self._label())
+            )
+
+        if event.type == EventType.TICK:
+            price = tick_prices(event.bid, event.ask, self.price)
+            self._add(event.ticker, price, price, price, price, 1, None)
+        elif event.type == EventType.BAR:
+            self._check_period(event.period)
+            self._add(
+                event.ticker, event.open_price, event.high_price,
+                event.low_price, event.close_price, event.volume,
+                event.adj_close_price
+            )
+        elif event.type == EventType.BARS:
+            self._check_period(event.period)
+            if event.adj_close_price is not None:
+                adj_closes = event.adj_close_price.tolist()
+            else:
+                adj_closes = [None] * len(event.tickers)
+            for row in zip(
+                event.tickers, event.open_price.tolist(),
+                event.high_price.tolist(), event.low_price.tolist(),
+                event.close_price.tolist(), event.volume.tolist(), adj_closes
+            ):
+                self._add(*row)
+        else:
+            raise NotImplementedError(
+                "Unsupported event.type '%s'" % event.type
+            )
+        return closed
+
+    def close(self, until=None):
+        """
+        Closes and returns the current bars if their period ended by
+        the timestamp until (e.g. the current time of a live feed
+        gone quiet), or unconditionally when until is None (e.g. at
+        the end of a historic stream).
+        """
+        if self.bucket is None:
+            return []
+        if until is not None:
+            until = pd.Timestamp(until)
+            if until.value < self.bucket + self.period_ns:
+                return []
+        return self._close_all()
+
+    def _check_period(self, period):
+        if period is None or self.period % period != 0:
+            raise ValueError(
+                "Can not build %ss bars out of %ss bars" % (self.period, period)
+            )
+
+    def _add(self, ticker, open_price, high_price, low_price, close_price,
+             volume, adj_close_price):
+        bar = self.bars.get(ticker)
+        if bar is None:
+            self.ranks.setdefault(ticker, len(self.ranks))
+            self.bars[ticker] = [
+                open_price, high_price, low_price, close_price,
+                volume, adj_close_price
+            ]
+            return
+        if high_price > bar[1]:
+            bar[1] = high_price
+        if low_price < bar[2]:
+            bar[2] = low_price
+        bar[3] = close_price
+        bar[4] += volume
+        bar[5] = adj_close_price
+
+    def _label(self):
+        label = pd.Timestamp(self.bucket)
+        if self.tz is not None:
+            label = label.tz_localize('UTC').tz_convert(self.tz)
+        return label
+
+    def _close_all(self):
+        if not self.bars:
+            return []
+        label = self._label()
+        closed = [
+            BarEvent(ticker, label, self.period, *self.bars[ticker])
+            for ticker in sorted(self.bars, key=self.ranks.get)
+        ]
+        self.bars = {}
+        return closed
+
+
+class ResampledBarPriceHandler(AbstractBarPriceHandler):
+    """
+    ResampledBarPriceHandler turns the TickEvents or BarEvents of
+    any other price handler into BarEvents of an arbitrary period,
+    e.g. 5M, 30M, 1H or 4H bars out of stored one minute bars,
+    without materialising them anywhere.
+
+    Historic handlers streaming from in-memory columnar arrays (the
+    CSV, Parquet and unchunked SQL handlers) are resampled all at
+    once, up front. Any other handler, e.g. a chunked SQL handler or
+    the live IGTickPriceHandler, is aggregated event by event with a
+    BarAggregator.
+    """
+    def __init__(
+        self, price_handler, events_queue, bar_size, price="mid",
+        group_bars=False, reuse_events=False, clock=None
+    ):
+        """
+        Takes the source price handler, created with an events queue
+        of its own that this handler drains, the events queue to
+        place the resampled bars onto and their bar_size, e.g. '5M'.
+
+        price is the tick price bars are built from, 'mid', 'bid' or
+        'ask'. group_bars and reuse_events are as for the
+        YahooDailyCsvBarPriceHandler and only apply to historic
+        sources resampled up front. clock is an optional callable
+        returning the current time, with which the bars of a live
+        feed are closed as soon as their period is over even when no
+        further tick arrives.
+        """
+        self.price_handler = price_handler
+        self.events_queue = events_queue
+        self.bar_size = bar_size
+        self.period = bar_period(bar_size)
+        self.price = price
+        self.group_bars = group_bars
+        self.reuse_events = reuse_events
+        self.clock = clock
+        self.continue_backtest = True
+        self.tickers_info = getattr(price_handler, "tickers_info", {})
+        self.tickers = {}
+        for ticker, prices in price_handler.tickers.items():
+            self.tickers[ticker] = self._first_prices(prices)
+        self.bar_stream = self._resample_stream()
+        self.aggregator = None
+        self.pending = deque()
+        if self.bar_stream is None:
+            self.aggregator = BarAggregator(self.period, price)
+
+    def _first_prices(self, prices):
+        if "close" in prices:
+            close = prices["close"]
+            adj_close = prices.get("adj_close")
+        elif "bid" in prices:
+            close = tick_prices(prices["bid"], prices["ask"], self.price)
+            adj_close = None
+        else:
+            close = adj_close = None
+        return {
+            "close": close, "adj_close": adj_close,
+            "timestamp": prices.get("timestamp")
+        }
+
+    def _resample_stream(self):
+        """
+        Returns a columnar iterator over the source's bars resampled
+        all at once, or None when the source does not stream from
+        columnar arrays (or already started streaming).
+        """
+        source = self.price_handler
+        stream = getattr(source, "bar_stream", None)
+        if stream is None:
+            stream = getattr(source, "tick_stream", None)
+        if isinstance(stream, ColumnarBarEventIterator):
+            if stream.position != 0 or getattr(stream, "group", 0) != 0:
+                return None
+            if self.period % stream.period != 0:
+                raise ValueError(
+                    "Can not build %ss bars out of %ss bars" % (
+                        self.period, stream.period
+                    )
+                )
+            has_adj_close = stream.has_adj_close
+            index, ticker_ids, values = resample_bar_arrays(
+                stream.index, stream.ticker_ids, stream.values,
+                self.period, has_adj_close
+            )
+        elif isinstance(stream, ColumnarTickEventIterator):
+            if stream.position != 0:
+                return None
+            has_adj_close = False
+            index, ticker_ids, values = resample_tick_arrays(
+                stream.index, stream.ticker_ids, stream.values,
+                self.period, self.price
+            )
+        else:
+            return None
+
+        if self.group_bars:
+            iterator = ColumnarBarsEventIterator
+        else:
+            iterator = ColumnarBarEventIterator
+        return iterator.from_arrays(
+            index, ticker_ids, stream.tickers_lst, values,
+            self.period, has_adj_close, reuse_events=self.reuse_events
+        )
+
+    def copy(self, events_queue):
+        """
+        Returns a price handler at the start of the same resampled
+        stream, placing its events onto events_queue. A source
+        aggregated event by event is copied along, which requires
+        its own copy() to be supported.
+        """
+        if self.bar_stream is not None:
+            return super(ResampledBarPriceHandler, self).copy(events_queue)
+        handler = copy.copy(self)
+        handler.events_queue = events_queue
+        handler.continue_backtest = True
+        handler.tickers = copy.deepcopy(self.tickers)
+        handler.price_handler = self.price_handler.copy(
+            type(self.price_handler.events_queue)()
+        )
+        handler.aggregator = BarAggregator(self.period, self.price)
+        handler.pending = deque()
+        return handler
+
+    def close_bars(self, until=None):
+        """
+        Places the current bars of an aggregated source onto the
+        event queue if their period ended by until (all of them when
+        until is None).
+        """
+        if self.aggregator is not None:
+            self.pending.extend(self.aggregator.close(until))
+            while self.pending:
+                self._put_bar(self.pending.popleft())
+
+    def _put_bar(self, bev):
+        self._store_event(bev)
+        self.events_queue.put(bev)
+
+    def _aggregate_next(self):
+        """
+        Asks the source for its next price event(s) and aggregates
+        them, closing the last bars once the source is exhausted.
+        """
+        source = self.price_handler
+        if not source.continue_backtest:
+            self.pending.extend(self.aggregator.close())
+            if not self.pending:
+                self.continue_backtest = False
+            return
+        source.stream_next()
+        source_queue = source.events_queue
+        while not source_queue.empty():
+            event = source_queue.get(False)
+            if event.type in (EventType.TICK, EventType.BAR, EventType.BARS):
+                self.pending.extend(self.aggregator.update(event))
+        if self.clock is not None:
+            self.pending.extend(self.aggregator.close(self.clock()))
+
+    def stream_next(self):
+        """
+        Place the next resampled BarEvent(s) onto the event queue.
+        """
+        if self.bar_stream is None:
+            if not self.pending:
+                self._aggregate_next()
+            if self.pending:
+                self._put_bar(self.pending.popleft())
+            return
+        try:
+            bev = next(self.bar_stream)
+        except StopIteration:
+            self.continue_backtest = False
+            return
+        self._put_bar(bev)
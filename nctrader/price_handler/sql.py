@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import DateTime, bindparam, text
+
+
+def bound_text(qry, params):
+    """
+    Returns the sqlalchemy text query of qry with its :name bound
+    parameters typed from their values in params: datetimes are
+    bound as DateTime and lists as expanding IN (...) parameters.
+    """
+    binds = []
+    for name, value in params.items():
+        if isinstance(value, datetime):
+            binds.append(bindparam(name, type_=DateTime))
+        elif isinstance(value, (list, tuple)):
+            binds.append(bindparam(name, expanding=True))
+    return text(qry).bindparams(*binds)
+
+
+def window_clause(params, start_date=None, end_date=None,
+                  column="d.timestamp"):
+    """
+    Returns the WHERE clause conditions restricting column to the
+    optional, inclusive, [start_date, end_date] window, adding the
+    dates to the bound parameters in params.
+    """
+    clause = ""
+    if start_date is not None:
+        clause += " AND %s >= :start_date" % column
+        params["start_date"] = start_date
+    if end_date is not None:
+        clause += " AND %s <= :end_date" % column
+        params["end_date"] = end_date
+    return clause
+
+
+def rank_case(column, values, params, name="rank"):
+    """
+    Returns a CASE expression mapping column to the position of
+    its value in values, to ORDER BY it, adding the values to the
+    bound parameters in params.
+    """
+    whens = []
+    for i, value in enumerate(values):
+        params["%s_%d" % (name, i)] = value
+        whens.append("WHEN :%s_%d THEN %d" % (name, i, i))
+    return "CASE %s %s END" % (column, " ".join(whens))
+
+
+def _rows_frame(rows, columns, index_col):
+    df = pd.DataFrame.from_records(rows, columns=columns, index=index_col)
+    df.index = pd.to_datetime(df.index)
+    return df
+
+
+def read_sql_frame(engine, query, params, index_col):
+    """
+    Runs query and returns all of its rows as a single time
+    indexed DataFrame.
+    """
+    with engine.connect() as conn:
+        result = conn.execute(query, params)
+        return _rows_frame(result.fetchall(), list(result.keys()), index_col)
+
+
+def read_sql_chunks(engine, query, params, index_col, chunksize):
+    """
+    Runs query and yields its rows as time indexed DataFrames of
+    at most chunksize rows.
+
+    The rows are fetched chunksize at a time through a streaming
+    (server-side on databases supporting it, e.g. Postgres) cursor,
+    so the whole result never needs to be in memory. The
+    connection stays checked out until the rows are exhausted.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(
+            query, params
+        )
+        columns = list(result.keys())
+        while True:
+            rows = result.fetchmany(chunksize)
+            if not rows:
+                break
+            yield _rows_frame(rows, columns, index_col)
@@ -16,7 +16,33 @@ Base = declarative_base()
 Base.query = db_session.query_property()
 
 
-def init_engine(uri, **kwargs):
+def init_engine(
+    uri, pool_size=None, max_overflow=None, pool_timeout=None,
+    pool_recycle=None, pool_pre_ping=False, **kwargs
+):
+    """
+    Creates the engine of the database at uri, bound to db_session.
+
+    Parameters:
+    pool_size - Number of connections kept open in the pool.
+    max_overflow - Number of connections allowed above pool_size.
+    pool_timeout - Seconds to wait for a free connection.
+    pool_recycle - Seconds after which connections are reopened.
+    pool_pre_ping - Test connections for liveness on checkout.
+    kwargs - Other create_engine arguments.
+
+    The pool options left to None keep the sqlalchemy defaults,
+    they only apply to pooling databases (e.g. not sqlite files).
+    """
     global engine
+    pool_options = (
+        ("pool_size", pool_size), ("max_overflow", max_overflow),
+        ("pool_timeout", pool_timeout), ("pool_recycle", pool_recycle)
+    )
+    for name, value in pool_options:
+        if value is not None:
+            kwargs[name] = value
+    if pool_pre_ping:
+        kwargs["pool_pre_ping"] = True
     engine = create_engine(uri, **kwargs)
     return engine
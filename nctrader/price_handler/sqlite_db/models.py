@@ -6,7 +6,7 @@ Created on Tue Nov  1 10:53:38 2016
 """
 from datetime import datetime
 from sqlalchemy import (Integer, Column, String, Float, DateTime, Time,
-                        BigInteger, ForeignKey, UniqueConstraint)
+                        BigInteger, ForeignKey, Index, UniqueConstraint)
 from sqlalchemy.orm import relationship
 from ..sqlite_db import Base
 
@@ -33,7 +33,11 @@ class Symbol(Base):
     created_date = Column(DateTime, default=datetime.now)
     last_updated_date = Column(DateTime, default=datetime.now)
 
-    UniqueConstraint(data_vendor_id, ticker, name='symbol_u1')
+    __table_args__ = (
+        UniqueConstraint('data_vendor_id', 'ticker', name='symbol_u1'),
+        # The lookup of the price handlers' ticker joins
+        Index('symbol_ix1', 'ticker', 'data_vendor_id'),
+    )
     data_vendor = relationship("DataVendor", back_populates="symbols")
     exchange = relationship("Exchange", back_populates="symbols")
     bar_data = relationship("BarData", back_populates="symbols")
@@ -128,6 +132,15 @@ class BarData(Base):
     created_date = Column(DateTime, default=datetime.now)
     last_updated_date = Column(DateTime, default=datetime.now)
 
+    # Covers the price handlers' ticker, bar size and time range
+    # queries, which then never read the table itself
+    __table_args__ = (
+        Index(
+            'bar_data_ix1', 'symbol_id', 'bar_size', 'timestamp',
+            'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+        ),
+    )
+
     symbols = relationship(
         "Symbol", order_by=Symbol.id, back_populates="bar_data"
     )
@@ -156,6 +169,12 @@ class TickData(Base):
     created_date = Column(DateTime, default=datetime.now)
     last_updated_date = Column(DateTime, default=datetime.now)
 
+    __table_args__ = (
+        Index(
+            'tick_data_ix1', 'symbol_id', 'timestamp', 'bid_price', 'ask_price'
+        ),
+    )
+
     symbols = relationship(
         "Symbol", order_by=Symbol.id, back_populates="tick_data")
 
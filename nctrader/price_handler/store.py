@@ -0,0 +1,150 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from munch import Munch
+
+from .generic import GenericPriceHandler
+from .iterator.base import AbstractTickEventIterator
+from .iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarBarsEventIterator,
+    ColumnarTickEventIterator
+)
+
+
+TICKER_INFO_FIELDS = ("type", "margin", "big_point_value", "tick_size")
+
+
+def _ticker_info_dict(info):
+    """
+    Picks the fields the portfolio and position sizers use out of
+    a ticker info object (e.g. a Symbol row), as plain JSON values.
+    """
+    d = {}
+    for field in TICKER_INFO_FIELDS:
+        value = getattr(info, field, None)
+        if value is not None and not isinstance(value, (int, float, str)):
+            value = float(value)
+        d[field] = value
+    return d
+
+
+class PriceStore(object):
+    """
+    PriceStore keeps the merged, parsed price arrays of a columnar
+    event iterator in a directory of .npy files, next to a small
+    JSON header, and attaches to them as read-only memory maps.
+
+    The data is parsed and written once. Any number of processes
+    can then attach price handlers to it, which share a single
+    physical copy of the data through the page cache instead of
+    each holding its own DataFrames. Placing the store under
+    /dev/shm keeps it in memory.
+
+    The ticker ids and price arrays are always used in place. The
+    timestamp index is too, unless it is timezone aware, in which
+    case only the index is rebuilt by every attaching process.
+    """
+    def __init__(self, path, meta, times, ticker_ids, values):
+        self.path = path
+        self.meta = meta
+        self.times = times
+        self.ticker_ids = ticker_ids
+        self.values = values
+        self.tickers_lst = meta["tickers"]
+        self.tickers_info = dict(
+            (ticker, Munch(info))
+            for ticker, info in meta["tickers_info"].items()
+        )
+        index = pd.DatetimeIndex(times.view("M8[ns]"), copy=False)
+        if meta["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        self.index = index
+
+    @classmethod
+    def write(cls, path, iterator, tickers_info=None):
+        """
+        Writes the arrays of a columnar event iterator, e.g. the
+        bar_stream of a price handler that has not yet streamed,
+        to the directory path and returns the attached store.
+
+        Parameters:
+        path - Directory of the store, created if needed.
+        iterator - A Columnar(Bar|Bars|Tick)EventIterator.
+        tickers_info - Optional dict of ticker -> info object, as
+            found on the price handlers, to store along.
+        """
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        index = iterator.index
+        tz = getattr(index, "tz", None)
+        # Aware indexes give their UTC times here
+        times = index.values.astype("datetime64[ns]").view(np.int64)
+        np.save(os.path.join(path, "times.npy"), times)
+        np.save(os.path.join(path, "ticker_ids.npy"), iterator.ticker_ids)
+        np.save(os.path.join(path, "values.npy"), iterator.values)
+
+        is_tick = isinstance(iterator, AbstractTickEventIterator)
+        meta = {
+            "kind": "tick" if is_tick else "bar",
+            "tickers": list(iterator.tickers_lst),
+            "tz": None if tz is None else str(tz),
+            "period": None if is_tick else iterator.period,
+            "has_adj_close": False if is_tick else iterator.has_adj_close,
+            "tickers_info": dict(
+                (ticker, _ticker_info_dict(info))
+                for ticker, info in (tickers_info or {}).items()
+            )
+        }
+        with open(os.path.join(path, "meta.json"), "w") as fd:
+            json.dump(meta, fd)
+        return cls.attach(path)
+
+    @classmethod
+    def attach(cls, path):
+        """
+        Attaches to the store in the directory path, memory
+        mapping its arrays read-only.
+        """
+        with open(os.path.join(path, "meta.json")) as fd:
+            meta = json.load(fd)
+        arrays = [
+            np.load(os.path.join(path, name), mmap_mode="r")
+            for name in ("times.npy", "ticker_ids.npy", "values.npy")
+        ]
+        return cls(path, meta, *arrays)
+
+    def istick(self):
+        return self.meta["kind"] == "tick"
+
+    def iterator(self, group_bars=False, reuse_events=False):
+        """
+        Returns a new columnar event iterator over the store's
+        arrays. With group_bars set, bars are streamed as one
+        BarsEvent per timestamp.
+        """
+        arrays = (self.index, self.ticker_ids, self.tickers_lst, self.values)
+        if self.istick():
+            return ColumnarTickEventIterator.from_arrays(
+                *arrays, reuse_events=reuse_events
+            )
+        if group_bars:
+            iterator = ColumnarBarsEventIterator
+        else:
+            iterator = ColumnarBarEventIterator
+        return iterator.from_arrays(
+            *arrays, period=self.meta["period"],
+            has_adj_close=self.meta["has_adj_close"],
+            reuse_events=reuse_events
+        )
+
+    def price_handler(self, events_queue, group_bars=False, reuse_events=False):
+        """
+        Returns a price handler streaming from the store onto
+        events_queue, with the stored tickers_info.
+        """
+        return GenericPriceHandler(
+            events_queue, self.iterator(group_bars, reuse_events),
+            self.tickers_info
+        )
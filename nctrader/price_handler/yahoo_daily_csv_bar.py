@@ -1,10 +1,14 @@
 import os
+from collections import OrderedDict
 
 import pandas as pd
 
 from ..price_parser import PriceParser
 from .base import AbstractBarPriceHandler
-from ..event import BarEvent
+from .iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarBarsEventIterator
+)
+from .iterator.merge import ChunkedBarEventIterator
 
 
 class YahooDailyCsvBarPriceHandler(AbstractBarPriceHandler):
@@ -14,14 +18,41 @@ class YahooDailyCsvBarPriceHandler(AbstractBarPriceHandler):
     for each requested financial instrument and stream those to
     the provided events queue as BarEvents.
     """
-    def __init__(self, csv_dir, events_queue, init_tickers=None):
+    def __init__(
+        self, csv_dir, events_queue, init_tickers=None,
+        group_bars=False, reuse_events=False, chunksize=None,
+        cache=None
+    ):
         """
         Takes the CSV directory, the events queue and a possible
         list of initial ticker symbols then creates an (optional)
         list of ticker subscriptions and associated prices.
+
+        With group_bars set, a single BarsEvent holding every
+        ticker's bar is streamed per timestamp instead of one
+        BarEvent per ticker. With reuse_events set, a single
+        recycled event instance is streamed, see
+        ReusableEventMixin.
+
+        With chunksize set, the CSVs are not loaded up front but
+        read chunksize rows at a time while streaming, merged
+        across tickers by a ChunkedBarEventIterator. The CSVs must
+        then be in ascending date order.
+
+        With cache, a ParsedDataCache, set the CSVs are parsed once
+        and their price columns then loaded, already converted to
+        PriceParser integers, from the cache.
         """
+        if chunksize is not None and group_bars:
+            raise NotImplementedError(
+                "group_bars is not supported with chunksize"
+            )
         self.csv_dir = csv_dir
         self.events_queue = events_queue
+        self.group_bars = group_bars
+        self.reuse_events = reuse_events
+        self.chunksize = chunksize
+        self.cache = cache
         self.continue_backtest = True
         self.tickers = {}
         self.tickers_data = {}
@@ -30,34 +61,63 @@ class YahooDailyCsvBarPriceHandler(AbstractBarPriceHandler):
                 self.subscribe_ticker(ticker)
         self.bar_stream = self._merge_sort_ticker_data()
 
-    def _open_ticker_price_csv(self, ticker):
+    def _read_ticker_price_csv(self, ticker, **kwargs):
         """
-        Opens the CSV files containing the equities ticks from
-        the specified CSV data directory, converting them into
-        them into a pandas DataFrame, stored in a dictionary.
+        Reads the CSV file of ticker from the specified CSV data
+        directory, passing kwargs (e.g. nrows, chunksize) on
+        to read_csv.
         """
         ticker_path = os.path.join(self.csv_dir, "%s.csv" % ticker)
-        self.tickers_data[ticker] = pd.io.parsers.read_csv(
+        return pd.io.parsers.read_csv(
             ticker_path, header=0, parse_dates=True,
             index_col=0, names=(
                 "Date", "Open", "High", "Low",
                 "Close", "Volume", "Adj Close"
-            )
+            ), **kwargs
         )
+
+    def _open_ticker_price_csv(self, ticker):
+        """
+        Opens the CSV files containing the equities ticks from
+        the specified CSV data directory, converting them into
+        them into a pandas DataFrame, stored in a dictionary.
+        """
+        if self.cache is not None:
+            self.tickers_data[ticker] = self.cache.get(
+                os.path.join(self.csv_dir, "%s.csv" % ticker),
+                "yahoo_daily_csv_bar",
+                lambda: self._read_ticker_price_csv(ticker),
+                ("Open", "High", "Low", "Close", "Adj Close")
+            )
+        else:
+            self.tickers_data[ticker] = self._read_ticker_price_csv(ticker)
         self.tickers_data[ticker]["Ticker"] = ticker
 
     def _merge_sort_ticker_data(self):
         """
-        Concatenates all of the separate equities DataFrames
-        into a single DataFrame that is time ordered, allowing tick
-        data events to be added to the queue in a chronological fashion.
+        Merges all of the separate equities DataFrames into a
+        ColumnarBarEventIterator whose parsed price columns are time
+        ordered, allowing bar events to be added to the queue in a
+        chronological fashion.
 
         Note that this is an idealised situation, utilised solely for
         backtesting. In live trading ticks may arrive "out of order".
         """
-        return pd.concat(
-            self.tickers_data.values()
-        ).sort_index().iterrows()
+        if self.chunksize is not None:
+            return ChunkedBarEventIterator(
+                OrderedDict(
+                    (ticker, self._read_ticker_price_csv(
+                        ticker, chunksize=self.chunksize
+                    )) for ticker in self.tickers
+                ), 86400, reuse_events=self.reuse_events
+            )
+        if self.group_bars:
+            iterator = ColumnarBarsEventIterator
+        else:
+            iterator = ColumnarBarEventIterator
+        return iterator(
+            self.tickers_data, 86400, reuse_events=self.reuse_events
+        )
 
     def subscribe_ticker(self, ticker):
         """
@@ -65,8 +125,11 @@ class YahooDailyCsvBarPriceHandler(AbstractBarPriceHandler):
         """
         if ticker not in self.tickers:
             try:
-                self._open_ticker_price_csv(ticker)
-                dft = self.tickers_data[ticker]
+                if self.chunksize is not None:
+                    dft = self._read_ticker_price_csv(ticker, nrows=1)
+                else:
+                    self._open_ticker_price_csv(ticker)
+                    dft = self.tickers_data[ticker]
                 row0 = dft.iloc[0]
 
                 close = PriceParser.parse(row0["Close"])
@@ -89,38 +152,15 @@ class YahooDailyCsvBarPriceHandler(AbstractBarPriceHandler):
                 "as is already subscribed." % ticker
             )
 
-    def _create_event(self, index, period, ticker, row):
-        """
-        Obtain all elements of the bar from a row of dataframe
-        and return a BarEvent
-        """
-        open_price = PriceParser.parse(row["Open"])
-        high_price = PriceParser.parse(row["High"])
-        low_price = PriceParser.parse(row["Low"])
-        close_price = PriceParser.parse(row["Close"])
-        adj_close_price = PriceParser.parse(row["Adj Close"])
-        volume = int(row["Volume"])
-        bev = BarEvent(
-            ticker, index, period, open_price,
-            high_price, low_price, close_price,
-            volume, adj_close_price
-        )
-        return bev
-
     def stream_next(self):
         """
         Place the next BarEvent onto the event queue.
         """
         try:
-            index, row = next(self.bar_stream)
+            bev = next(self.bar_stream)
         except StopIteration:
             self.continue_backtest = False
             return
-        # Obtain all elements of the bar from the dataframe
-        ticker = row["Ticker"]
-        period = 86400  # Seconds in a day
-        # Create the tick event for the queue
-        bev = self._create_event(index, period, ticker, row)
         # Store event
         self._store_event(bev)
         # Send event to queue
@@ -1,6 +1,44 @@
 from __future__ import division
-from multipledispatch import dispatch
 import numpy as np
+import pandas as pd
+
+
+def _resolve(table, typ, name):
+    """
+    Finds the handler registered for the closest base class of typ,
+    caching it in table so that the next lookup is a single dict get.
+    """
+    for base in typ.__mro__:
+        if base in table:
+            table[typ] = table[base]
+            return table[typ]
+    raise NotImplementedError(
+        "Could not find signature for %s: <%s>" % (name, typ.__name__)
+    )
+
+
+def _parse_int(x):
+    return x
+
+
+def _parse_float(x):
+    return int(x * PriceParser.PRICE_MULTIPLIER)
+
+
+def _parse_str(x):
+    return int(float(x) * PriceParser.PRICE_MULTIPLIER)
+
+
+def _display_parsed(x):
+    return round(x / PriceParser.PRICE_MULTIPLIER, PriceParser.DEFAULT_PREC)
+
+
+def _display_float(x):
+    return round(x, PriceParser.DEFAULT_PREC)
+
+
+def _display_parsed_dp(x, dp):
+    return round(x / PriceParser.PRICE_MULTIPLIER, dp)
 
 
 class PriceParser(object):
@@ -20,62 +58,102 @@ class PriceParser(object):
     # 10,000,000
     PRICE_MULTIPLIER = 10000000
     DEFAULT_PREC = 6
+    # Smallest magnitude that no longer fits into an int64
+    _INT64_LIMIT = 2.0 ** 63
+
+    # Type keyed dispatch tables. Exact types are looked up directly,
+    # subclasses of a registered type are resolved once and cached.
+    # Note that a plain float is displayed as is, whereas np.float64
+    # is taken to be in parsed units.
+    _parsers = {
+        int: _parse_int,
+        np.integer: _parse_int,
+        float: _parse_float,
+        np.floating: _parse_float,
+        str: _parse_str,
+    }
+    _displayers = {
+        int: _display_parsed,
+        np.integer: _display_parsed,
+        np.floating: _display_parsed,
+        float: _display_float,
+    }
+    _displayers_dp = {
+        int: _display_parsed_dp,
+        np.integer: _display_parsed_dp,
+        float: _display_parsed_dp,
+        np.floating: _display_parsed_dp,
+    }
 
     """Parse Methods. Multiplies a float out into an int if needed."""
 
     @staticmethod
-    @dispatch(int)
-    def parse(x):  # flake8: noqa
-        return x
-
-    @staticmethod
-    @dispatch(np.int64)
-    def parse(x):  # flake8: noqa
-        return x
-
-    @staticmethod
-    @dispatch(str)
-    def parse(x):  # flake8: noqa
-        return int(float(x) * PriceParser.PRICE_MULTIPLIER)
-
-    @staticmethod
-    @dispatch(float)
-    def parse(x):  # flake8: noqa
-        return int(x * PriceParser.PRICE_MULTIPLIER)
+    def parse(x):
+        parser = PriceParser._parsers.get(type(x))
+        if parser is None:
+            parser = _resolve(PriceParser._parsers, type(x), "parse")
+        return parser(x)
 
-    """Display Methods. Multiplies a float out into an int if needed."""
+    """Display Methods. Divides an int back out into a float."""
 
     @staticmethod
-    @dispatch(int)
-    def display(x):  # flake8: noqa
-        return round(x / PriceParser.PRICE_MULTIPLIER, PriceParser.DEFAULT_PREC)
+    def display(x, dp=None):
+        if dp is None:
+            displayer = PriceParser._displayers.get(type(x))
+            if displayer is None:
+                displayer = _resolve(PriceParser._displayers, type(x), "display")
+            return displayer(x)
+        displayer = PriceParser._displayers_dp.get(type(x))
+        if displayer is None:
+            displayer = _resolve(PriceParser._displayers_dp, type(x), "display")
+        return displayer(x, dp)
+
+    """Array Methods. Converts whole columns in a single vectorized pass."""
 
     @staticmethod
-    @dispatch(np.int64)
-    def display(x):  # flake8: noqa
-        return round(x / PriceParser.PRICE_MULTIPLIER, PriceParser.DEFAULT_PREC)
+    def parse_array(x):
+        """
+        Parses a NumPy array, pandas Series or DataFrame of prices
+        into the integer representation used by PriceParser.parse.
+
+        Integer input is assumed to be parsed already and is passed
+        through, float (or string) input is multiplied out and
+        truncated towards zero. The result is always int64 and keeps
+        the index/columns of pandas input.
+
+        Raises ValueError for NaN prices and OverflowError for prices
+        too large to be held in an int64.
+        """
+        if isinstance(x, (pd.Series, pd.DataFrame)):
+            values = PriceParser.parse_array(x.values)
+            if isinstance(x, pd.Series):
+                return pd.Series(values, index=x.index, name=x.name)
+            return pd.DataFrame(values, index=x.index, columns=x.columns)
+
+        arr = np.asarray(x)
+        if arr.dtype.kind in 'iu':
+            return arr.astype(np.int64)
+        if arr.dtype.kind != 'f':
+            arr = arr.astype(np.float64)
+        scaled = arr * PriceParser.PRICE_MULTIPLIER
+        if np.isnan(scaled).any():
+            raise ValueError("Cannot parse NaN prices")
+        if (np.abs(scaled) >= PriceParser._INT64_LIMIT).any():
+            raise OverflowError("Prices do not fit into int64 once parsed")
+        return scaled.astype(np.int64)
 
     @staticmethod
-    @dispatch(np.float64)
-    def display(x):  # flake8: noqa
-        return round(x / PriceParser.PRICE_MULTIPLIER, PriceParser.DEFAULT_PREC)
+    def display_array(x, dp=DEFAULT_PREC):
+        """
+        Converts a NumPy array, pandas Series or DataFrame of parsed
+        prices back into floats rounded to dp decimal places.
+
+        As with PriceParser.display for np.int64 and np.float64, both
+        integer and float input are taken to be in parsed units.
+        """
+        if isinstance(x, (pd.Series, pd.DataFrame)):
+            return (x / PriceParser.PRICE_MULTIPLIER).round(dp)
+        return np.round(
+            np.asarray(x, dtype=np.float64) / PriceParser.PRICE_MULTIPLIER, dp
+        )
 
-    @staticmethod
-    @dispatch(float)
-    def display(x):  # flake8: noqa
-        return round(x, PriceParser.DEFAULT_PREC)
-
-    @staticmethod
-    @dispatch(int, int)
-    def display(x, dp):  # flake8: noqa
-        return round(x / PriceParser.PRICE_MULTIPLIER, dp)
-
-    @staticmethod
-    @dispatch(np.int64, int)
-    def display(x, dp):  # flake8: noqa
-        return round(x / PriceParser.PRICE_MULTIPLIER, dp)
-
-    @staticmethod
-    @dispatch(float, int)
-    def display(x, dp):  # flake8: noqa
-        return round(x / PriceParser.PRICE_MULTIPLIER, dp)
@@ -0,0 +1,177 @@
+from __future__ import print_function
+
+import click
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ..compat import queue
+from ..event import EventQueue, EventType, SignalEvent, OrderEvent, FillEvent
+from ..price_handler import GenericPriceHandler
+from ..price_handler.iterator.columnar import ColumnarTickEventIterator
+from ..settings import DEFAULT
+from ..statistics.sampling import IntervalSampler
+from ..statistics.tearsheet import TearsheetStatistics
+from ..trading_session.backtest import Backtest
+
+
+class SignalEveryNStrategy(object):
+    """
+    Sends a SignalEvent every n ticks so that the whole
+    signal -> order -> fill chain goes through the loop.
+    """
+    def __init__(self, events_queue, n):
+        self.events_queue = events_queue
+        self.n = n
+        self.ticks = 0
+
+    def on_tick(self, event):
+        self.ticks += 1
+        if self.ticks % self.n == 0:
+            self.events_queue.put(SignalEvent(event.ticker, "BOT"))
+
+    def on_bar(self, event):
+        self.on_tick(event)
+
+
+class FlatPortfolio(object):
+    equity = 0
+    positions = {}
+    open_quantity = 0
+
+
+class PassThroughPortfolioHandler(object):
+    def __init__(self, events_queue):
+        self.events_queue = events_queue
+        self.price_handler = None
+        self.portfolio = FlatPortfolio()
+
+    def on_signal(self, event):
+        self.events_queue.put(OrderEvent(event.ticker, event.action, 1))
+
+    def on_fill(self, event):
+        pass
+
+    def update_portfolio_value(self, tickers=None):
+        pass
+
+
+class PassThroughExecutionHandler(object):
+    def __init__(self, events_queue):
+        self.events_queue = events_queue
+
+    def execute_order(self, event):
+        self.events_queue.put(FillEvent(
+            None, event.ticker, event.action, event.quantity,
+            "ARCA", 0, 0, None
+        ))
+
+
+class NullStatistics(object):
+    def update(self, event):
+        pass
+
+
+def legacy_run_backtest(backtest):
+    """
+    The exception driven, if/elif dispatching loop that
+    Backtest._run_backtest used before the dispatch table.
+    """
+    while backtest.price_handler.continue_backtest:
+        try:
+            event = backtest.events_queue.get(False)
+        except queue.Empty:
+            backtest.price_handler.stream_next()
+        else:
+            if event.type == EventType.TICK:
+                backtest.cur_time = event.time
+                backtest.strategy.on_tick(event)
+                backtest.portfolio_handler.update_portfolio_value()
+                backtest.statistics.update(event)
+            elif event.type == EventType.BAR:
+                backtest.cur_time = event.time
+                backtest.strategy.on_bar(event)
+                backtest.portfolio_handler.update_portfolio_value()
+                backtest.statistics.update(event)
+            elif event.type == EventType.SIGNAL:
+                backtest.portfolio_handler.on_signal(event)
+            elif event.type == EventType.ORDER:
+                backtest.execution_handler.execute_order(event)
+            elif event.type == EventType.FILL:
+                backtest.portfolio_handler.on_fill(event)
+
+
+def tearsheet_statistics(sampler=None):
+    """
+    Returns a factory of TearsheetStatistics recording the equity
+    with sampler, after every tick without one.
+    """
+    def statistics(portfolio_handler):
+        return TearsheetStatistics(
+            DEFAULT, portfolio_handler, title=["Benchmark"],
+            start_date=datetime(1900, 1, 1), sampler=sampler
+        )
+    return statistics
+
+
+def make_backtest(events_queue, ticks, signal_every, statistics=None):
+    index = pd.date_range("2016-02-01", periods=ticks, freq="250ms")
+    bid = 683.56 + np.cumsum(np.random.standard_normal(ticks)) * 0.01
+    df = pd.DataFrame({"Bid": bid, "Ask": bid + 0.02}, index=index)
+    price_handler = GenericPriceHandler(
+        events_queue, ColumnarTickEventIterator({"GOOG": df})
+    )
+    portfolio_handler = PassThroughPortfolioHandler(events_queue)
+    return Backtest(
+        price_handler, SignalEveryNStrategy(events_queue, signal_every),
+        portfolio_handler, PassThroughExecutionHandler(events_queue),
+        None, None,
+        NullStatistics() if statistics is None else statistics(portfolio_handler),
+        0
+    )
+
+
+def events_per_second(
+    events_queue, run_loop, ticks, signal_every, statistics=None
+):
+    backtest = make_backtest(events_queue, ticks, signal_every, statistics)
+    events = ticks + 3 * (ticks // signal_every)
+    t0 = time.time()
+    run_loop(backtest)
+    return events / (time.time() - t0)
+
+
+def run(ticks, signal_every, seed):
+    np.random.seed(seed)
+    results = [
+        ("queue.Queue, legacy loop", events_per_second(
+            queue.Queue(), legacy_run_backtest, ticks, signal_every)),
+        ("queue.Queue, dispatch table", events_per_second(
+            queue.Queue(), Backtest._run_backtest, ticks, signal_every)),
+        ("EventQueue, dispatch table", events_per_second(
+            EventQueue(), Backtest._run_backtest, ticks, signal_every)),
+        ("Tearsheet, every tick", events_per_second(
+            EventQueue(), Backtest._run_backtest, ticks, signal_every,
+            tearsheet_statistics())),
+        ("Tearsheet, 1 minute samples", events_per_second(
+            EventQueue(), Backtest._run_backtest, ticks, signal_every,
+            tearsheet_statistics(IntervalSampler(60)))),
+    ]
+    baseline = results[0][1]
+    for name, eps in results:
+        print("%-30s %12.0f events/s  x%.2f" % (name, eps, eps / baseline))
+    return results
+
+
+@click.command()
+@click.option('--ticks', default=200000, help='Number of ticks to stream')
+@click.option('--signal_every', default=10, help='Send a signal every n ticks')
+@click.option('--seed', default=42, help='Seed')
+def main(ticks, signal_every, seed):
+    return run(ticks, signal_every, seed)
+
+if __name__ == "__main__":
+    main()
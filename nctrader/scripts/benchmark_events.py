@@ -0,0 +1,143 @@
+from __future__ import print_function
+
+import click
+
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from ..event import EventType, TickEvent, BarEvent
+from ..price_handler.iterator.columnar import ColumnarTickEventIterator
+
+
+class LegacyTickEvent(object):
+    """
+    TickEvent as it was before slotting, with an instance __dict__.
+    """
+    def __init__(self, ticker, time, bid, ask):
+        self.type = EventType.TICK
+        self.ticker = ticker
+        self.time = time
+        self.bid = bid
+        self.ask = ask
+        self.priority = 100
+
+
+class LegacyBarEvent(object):
+    """
+    BarEvent as it was before slotting, building its lookup table
+    and readable period on every construction.
+    """
+    def __init__(
+        self, ticker, time, period,
+        open_price, high_price, low_price,
+        close_price, volume, adj_close_price=None
+    ):
+        self.type = EventType.BAR
+        self.ticker = ticker
+        self.time = time
+        self.period = period
+        self.open_price = open_price
+        self.high_price = high_price
+        self.low_price = low_price
+        self.close_price = close_price
+        self.volume = volume
+        self.adj_close_price = adj_close_price
+        self.period_readable = self._readable_period()
+        self.priority = 100
+
+    def _readable_period(self):
+        lut = {
+            1: "1sec", 5: "5sec", 10: "10sec", 15: "15sec", 30: "30sec",
+            60: "1min", 300: "5min", 600: "10min", 900: "15min",
+            1800: "30min", 3600: "1hr", 86400: "1day", 604800: "1wk"
+        }
+        if self.period in lut:
+            return lut[self.period]
+        else:
+            return "%ssec" % str(self.period)
+
+
+def construction_ns(make, number):
+    """
+    Best of three timings of make(), in nanoseconds per event.
+    """
+    return min(timeit.Timer(make).repeat(3, number)) / number * 1e9
+
+
+def bytes_per_event(make, count):
+    """
+    Memory allocated per event while holding count events alive.
+    """
+    tracemalloc.start()
+    events = [make() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Discount the list holding the events
+    return (size - len(events) * 8) / count
+
+
+def stream_ns(ticks, reuse_events):
+    """
+    Nanoseconds per TickEvent streamed by a columnar iterator.
+    """
+    index = pd.date_range("2016-02-01", periods=ticks, freq="250ms")
+    bid = 683.56 + np.cumsum(np.random.standard_normal(ticks)) * 0.01
+    df = pd.DataFrame({"Bid": bid, "Ask": bid + 0.02}, index=index)
+    iterator = ColumnarTickEventIterator(
+        {"GOOG": df}, reuse_events=reuse_events
+    )
+    t0 = time.time()
+    for event in iterator:
+        pass
+    return (time.time() - t0) / ticks * 1e9
+
+
+def run(number, ticks, seed):
+    np.random.seed(seed)
+    now = pd.Timestamp("2016-02-01 00:00:01.358")
+    makers = [
+        ("TickEvent", lambda: LegacyTickEvent(
+            "GOOG", now, 6835600000, 6835800000),
+         lambda: TickEvent("GOOG", now, 6835600000, 6835800000)),
+        ("BarEvent", lambda: LegacyBarEvent(
+            "GOOG", now, 86400, 6269500000, 6295100000, 6242400000,
+            6267500000, 3927000, 3130600000),
+         lambda: BarEvent(
+            "GOOG", now, 86400, 6269500000, 6295100000, 6242400000,
+            6267500000, 3927000, 3130600000)),
+    ]
+    results = []
+    print("%-12s %14s %14s %14s %14s" % (
+        "event", "legacy ns", "slotted ns", "legacy bytes", "slotted bytes"
+    ))
+    for name, legacy, slotted in makers:
+        row = (
+            name,
+            construction_ns(legacy, number), construction_ns(slotted, number),
+            bytes_per_event(legacy, number), bytes_per_event(slotted, number)
+        )
+        results.append(row)
+        print("%-12s %14.1f %14.1f %14.1f %14.1f" % row)
+
+    fresh = stream_ns(ticks, False)
+    reused = stream_ns(ticks, True)
+    results.append(("stream", fresh, reused))
+    print("ColumnarTickEventIterator: %.1f ns/tick, %.1f ns/tick reusing events" % (
+        fresh, reused
+    ))
+    return results
+
+
+@click.command()
+@click.option('--number', default=200000, help='Number of events per timing')
+@click.option('--ticks', default=500000, help='Number of ticks to stream')
+@click.option('--seed', default=42, help='Seed')
+def main(number, ticks, seed):
+    return run(number, ticks, seed)
+
+if __name__ == "__main__":
+    main()
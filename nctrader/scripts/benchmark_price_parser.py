@@ -0,0 +1,94 @@
+from __future__ import print_function
+
+import click
+
+import timeit
+from collections import OrderedDict
+
+import numpy as np
+
+from ..price_parser import PriceParser
+
+
+def multipledispatch_parser():
+    """
+    Builds the former multipledispatch based PriceParser.parse and
+    PriceParser.display, to be used as a reference. Returns None
+    when multipledispatch is not installed.
+    """
+    try:
+        from multipledispatch import Dispatcher
+    except ImportError:
+        return None
+
+    parse = Dispatcher('parse')
+    parse.add((int,), lambda x: x)
+    parse.add((np.int64,), lambda x: x)
+    parse.add((str,), lambda x: int(float(x) * PriceParser.PRICE_MULTIPLIER))
+    parse.add((float,), lambda x: int(x * PriceParser.PRICE_MULTIPLIER))
+
+    display = Dispatcher('display')
+    display.add(
+        (int,),
+        lambda x: round(x / PriceParser.PRICE_MULTIPLIER, PriceParser.DEFAULT_PREC)
+    )
+    display.add(
+        (np.int64,),
+        lambda x: round(x / PriceParser.PRICE_MULTIPLIER, PriceParser.DEFAULT_PREC)
+    )
+    display.add(
+        (np.float64,),
+        lambda x: round(x / PriceParser.PRICE_MULTIPLIER, PriceParser.DEFAULT_PREC)
+    )
+    display.add((float,), lambda x: round(x, PriceParser.DEFAULT_PREC))
+    return parse, display
+
+
+def per_call_ns(func, value, number):
+    """
+    Best of three timings of func(value), in nanoseconds per call.
+    """
+    timer = timeit.Timer(lambda: func(value))
+    return min(timer.repeat(3, number)) / number * 1e9
+
+
+def run(number):
+    inputs = OrderedDict([
+        ("int", 6835600000),
+        ("float", 683.56),
+        ("str", "683.56"),
+        ("np.int64", np.int64(6835600000)),
+        ("np.float64", np.float64(683.56)),
+        ("np.int32", np.int32(68356)),
+    ])
+    reference = multipledispatch_parser()
+
+    results = OrderedDict()
+    print("%-12s %-10s %14s %18s" % ("method", "input", "ns/call", "multipledispatch"))
+    for method in ("parse", "display"):
+        for name, value in inputs.items():
+            if method == "display" and name == "str":
+                continue
+            fast = per_call_ns(getattr(PriceParser, method), value, number)
+            ref = None
+            if reference is not None:
+                ref_func = reference[0] if method == "parse" else reference[1]
+                try:
+                    ref_func(value)
+                    ref = per_call_ns(ref_func, value, number)
+                except NotImplementedError:
+                    pass
+            results[(method, name)] = (fast, ref)
+            print("%-12s %-10s %14.1f %18s" % (
+                method, name, fast, "n/a" if ref is None else "%.1f" % ref
+            ))
+    return results
+
+
+@click.command()
+@click.option('--number', default=200000, help='Number of calls per timing')
+def main(number):
+    return run(number)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from __future__ import print_function
+
+import click
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+from ..compat import queue
+from ..price_handler.sqlite_bar import SqliteBarPriceHandler
+from ..price_handler.sqlite_db import db_session
+from .ingest_prices import ensure_symbol, insert_rows, migrate, schema_models
+
+
+def create_synthetic_db(db_uri, n_tickers, n_bars, seed=42, block=1440):
+    """
+    Bulk inserts n_tickers random walks of n_bars one minute
+    bars each into the sqlite schema database at db_uri, block
+    bars of every ticker at a time as a daily vendor update would,
+    so that tickers' rows are interleaved in the table.
+
+    Returns the engine and the insert time in seconds.
+    """
+    models, symbol_model, id_column = schema_models("sqlite")
+    engine = create_engine(db_uri)
+    migrate(engine, models)
+    table = models.BarData.__table__
+    columns = (id_column, "bar_size", "timestamp", "open_price",
+               "high_price", "low_price", "close_price", "volume",
+               "created_date", "last_updated_date")
+    rng = np.random.RandomState(seed)
+    closes = 100.0 + np.cumsum(rng.normal(0, 0.1, (n_tickers, n_bars)), 1)
+    volumes = rng.randint(100, 10000, (n_tickers, n_bars))
+    times = [datetime(2000, 1, 3) + timedelta(minutes=j) for j in range(n_bars)]
+    now = datetime.now()
+
+    started = time.time()
+    with engine.begin() as conn:
+        symbol_ids = [
+            ensure_symbol(
+                conn, symbol_model, models, "T%04d" % i, "CSI", "NYSE"
+            ) for i in range(n_tickers)
+        ]
+    for lo in range(0, n_bars, block):
+        hi = min(lo + block, n_bars)
+        rows = []
+        for i, symbol_id in enumerate(symbol_ids):
+            close = closes[i, lo:hi].tolist()
+            rows.extend(zip(
+                [symbol_id] * (hi - lo), ["1M"] * (hi - lo), times[lo:hi],
+                close, [c + 0.05 for c in close], [c - 0.05 for c in close],
+                close, volumes[i, lo:hi].tolist(),
+                [now] * (hi - lo), [now] * (hi - lo)
+            ))
+        with engine.begin() as conn:
+            insert_rows(conn, table, columns, rows)
+    return engine, time.time() - started
+
+
+def time_query(db_uri, tickers, start_date, end_date, repeat=3):
+    """
+    Best of repeat timings, in seconds, of a SqliteBarPriceHandler
+    loading tickers' bars between start_date and end_date, and the
+    number of bars.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.time()
+        price_handler = SqliteBarPriceHandler(
+            db_uri, queue.Queue(), tickers, bar_size="1M",
+            start_date=start_date, end_date=end_date
+        )
+        timings.append(time.time() - started)
+        db_session.remove()
+    bars = sum(len(df) for df in price_handler.tickers_data.values())
+    return min(timings), bars
+
+
+def run(db_path, n_tickers, n_bars, n_query):
+    if db_path == '':
+        db_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    db_uri = "sqlite:///%s" % db_path
+
+    engine, load_time = create_synthetic_db(db_uri, n_tickers, n_bars)
+    rows = n_tickers * n_bars
+    print("Loaded %d bars in %.1fs (%.0f rows/s)" % (
+        rows, load_time, rows / load_time
+    ))
+
+    tickers = ["T%04d" % i for i in range(min(n_query, n_tickers))]
+    start_date = datetime(2000, 1, 3) + timedelta(minutes=n_bars // 4)
+    end_date = start_date + timedelta(minutes=n_bars // 2)
+
+    # Time the queries of a database predating bar_data_ix1, then
+    # migrate it and time them again
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX bar_data_ix1"))
+    without_index, bars = time_query(db_uri, tickers, start_date, end_date)
+    started = time.time()
+    migrate(engine, schema_models("sqlite")[0])
+    migrate_time = time.time() - started
+    with_index, bars = time_query(db_uri, tickers, start_date, end_date)
+    engine.dispose()
+
+    print("Created bar_data_ix1 in %.1fs" % migrate_time)
+    print("Queried %d bars of %d tickers: %.3fs without bar_data_ix1, "
+          "%.3fs with" % (bars, len(tickers), without_index, with_index))
+    return {
+        "load": load_time,
+        "migrate": migrate_time,
+        "query_no_index": without_index,
+        "query_index": with_index
+    }
+
+
+@click.command()
+@click.option('--db_path', default='', help='Sqlite file to create (temporary)')
+@click.option('--n_tickers', default=20, help='Number of tickers')
+@click.option('--n_bars', default=100000, help='Number of one minute bars per ticker')
+@click.option('--n_query', default=5, help='Number of tickers queried')
+def main(db_path, n_tickers, n_bars, n_query):
+    return run(db_path, n_tickers, n_bars, n_query)
+
+if __name__ == "__main__":
+    main()
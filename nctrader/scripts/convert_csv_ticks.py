@@ -0,0 +1,125 @@
+from __future__ import print_function
+
+import click
+
+import os
+import re
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .. import settings
+from ..price_parser import PriceParser
+from ..price_handler.iterator.binary_tick import append_ticks
+
+
+TIME_FORMAT = "%d.%m.%Y %H:%M:%S.%f"
+
+
+def ticker_csv_files(csv_dir, ticker):
+    """
+    Returns the tick CSV files of ticker in csv_dir: TICKER.csv,
+    the file HistoricCSVTickPriceHandler reads, or when there is
+    none the daily TICKER_YYYYMMDD.csv files written by
+    generate_simulated_prices, in date order.
+
+    The two are never mixed, as they need not hold the same
+    period (e.g. data/GOOG.csv and data/GOOG_201401DD.csv).
+    """
+    if os.path.exists(os.path.join(csv_dir, "%s.csv" % ticker)):
+        return ["%s.csv" % ticker]
+    daily = re.compile(r"%s_\d{8}\.csv$" % re.escape(ticker))
+    return sorted(f for f in os.listdir(csv_dir) if daily.match(f))
+
+
+def convert_ticker(csv_dir, tick_dir, ticker, chunksize=1000000):
+    """
+    Converts the tick CSV files of ticker into its binary tick
+    files, replacing any previous conversion. The CSVs are read
+    chunksize rows at a time, so memory stays bounded.
+
+    The files are written aside and only replace the previous
+    ones once the whole conversion succeeded, so that rejected
+    input never leaves a truncated store behind.
+
+    Returns the number of ticks written.
+    """
+    if not os.path.isdir(tick_dir):
+        os.makedirs(tick_dir)
+    tmp_dir = tempfile.mkdtemp(prefix=".%s." % ticker, dir=tick_dir)
+    try:
+        count = _convert_ticker(csv_dir, tmp_dir, ticker, chunksize)
+        ticker_dir = os.path.join(tick_dir, ticker)
+        if os.path.isdir(ticker_dir):
+            os.rename(ticker_dir, os.path.join(tmp_dir, ".old"))
+        if count > 0:
+            os.rename(os.path.join(tmp_dir, ticker), ticker_dir)
+    finally:
+        shutil.rmtree(tmp_dir)
+    return count
+
+
+def _convert_ticker(csv_dir, tick_dir, ticker, chunksize):
+    count = 0
+    last_time = None
+    for fname in ticker_csv_files(csv_dir, ticker):
+        print("Convert '%s'" % fname)
+        chunks = pd.read_csv(
+            os.path.join(csv_dir, fname), header=0,
+            names=("Ticker", "Time", "Bid", "Ask"), chunksize=chunksize
+        )
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            times = pd.to_datetime(chunk["Time"], format=TIME_FORMAT).values
+            times = times.astype("datetime64[ns]").view(np.int64)
+            if (np.diff(times) < 0).any() or (
+                last_time is not None and times[0] < last_time
+            ):
+                raise ValueError(
+                    "Ticks of %s are not in time order in '%s'" % (
+                        ticker, fname
+                    )
+                )
+            append_ticks(
+                tick_dir, ticker, times,
+                PriceParser.parse_array(chunk["Bid"].values),
+                PriceParser.parse_array(chunk["Ask"].values)
+            )
+            last_time = times[-1]
+            count += len(times)
+    return count
+
+
+def run(csv_dir, tick_dir, tickers, chunksize, config=None):
+    if config is None:
+        config = settings.DEFAULT
+
+    if csv_dir == '':
+        csv_dir = os.path.expanduser(config.CSV_DATA_DIR)
+    else:
+        csv_dir = os.path.expanduser(csv_dir)
+    if tick_dir == '':
+        tick_dir = os.path.join(csv_dir, "ticks")
+    else:
+        tick_dir = os.path.expanduser(tick_dir)
+
+    counts = {}
+    for ticker in tickers:
+        counts[ticker] = convert_ticker(csv_dir, tick_dir, ticker, chunksize)
+        print("Saved %d '%s' ticks to '%s'" % (counts[ticker], ticker, tick_dir))
+    return counts
+
+
+@click.command()
+@click.option('--csv_dir', default='', help='Tick CSV directory (CSV_DATA_DIR)')
+@click.option('--tick_dir', default='', help='Binary tick directory (CSV_DATA_DIR/ticks)')
+@click.option('--tickers', default='GOOG', help='Tickers (use comma)')
+@click.option('--chunksize', default=1000000, help='Number of CSV rows read at a time')
+def main(csv_dir, tick_dir, tickers, chunksize, config=None):
+    return run(csv_dir, tick_dir, tickers.split(","), chunksize, config=config)
+
+if __name__ == "__main__":
+    main()
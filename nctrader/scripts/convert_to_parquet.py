@@ -0,0 +1,150 @@
+from __future__ import print_function
+
+import click
+
+import os
+import shutil
+
+import pandas as pd
+
+from .. import settings
+from ..compat import queue
+from ..price_handler.parquet import (
+    BAR_COLUMNS, TICK_COLUMNS, ticker_dir, write_partitions
+)
+from .convert_csv_ticks import TIME_FORMAT, ticker_csv_files
+
+
+def yahoo_bars(csv_dir, ticker):
+    """
+    Reads the Yahoo daily CSV of ticker as a DataFrame of the
+    Parquet dataset's bar columns.
+    """
+    df = pd.read_csv(
+        os.path.join(csv_dir, "%s.csv" % ticker), header=0,
+        parse_dates=True, index_col=0, names=(
+            "Date", "Open", "High", "Low", "Close", "Volume", "Adj Close"
+        )
+    )
+    df.columns = BAR_COLUMNS
+    df["volume"] = df["volume"].astype("int64")
+    return df
+
+
+def sql_bars(price_handler, ticker):
+    """
+    Returns the bars of ticker loaded by a SqliteBarPriceHandler
+    or DbBarPriceHandler as a DataFrame of the Parquet dataset's bar
+    columns, the close standing in for the missing adjusted close.
+    """
+    dft = price_handler.tickers_data[ticker]
+    df = pd.DataFrame(index=dft.index)
+    for column in BAR_COLUMNS[:5]:
+        df[column] = dft[[c for c in dft.columns if c.lower() == column][0]]
+    df["volume"] = df["volume"].astype("int64")
+    df["adj_close"] = df["close"]
+    return df
+
+
+def convert_ticks(csv_dir, dataset_dir, ticker, chunksize=1000000):
+    """
+    Converts all the tick CSV files of ticker into the dataset,
+    chunksize rows at a time. Returns the number of ticks written.
+    """
+    count = 0
+    part = 0
+    for fname in ticker_csv_files(csv_dir, ticker):
+        print("Convert '%s'" % fname)
+        chunks = pd.read_csv(
+            os.path.join(csv_dir, fname), header=0,
+            names=("Ticker", "Time", "Bid", "Ask"), chunksize=chunksize
+        )
+        for chunk in chunks:
+            df = pd.DataFrame(
+                {"bid": chunk["Bid"].values, "ask": chunk["Ask"].values},
+                index=pd.DatetimeIndex(
+                    pd.to_datetime(chunk["Time"], format=TIME_FORMAT)
+                ), columns=list(TICK_COLUMNS)
+            )
+            write_partitions(dataset_dir, ticker, df, part)
+            part += 1
+            count += len(df)
+    return count
+
+
+def run(
+    source, csv_dir, db_uri, dataset_dir, tickers, kind,
+    data_vendor, bar_size, chunksize, config=None
+):
+    """
+    Converts tickers' prices from source, 'csv' (Yahoo daily bar
+    or tick CSVs in csv_dir) or 'sqlite' (bars of the sqlite
+    database at db_uri), into the Parquet dataset in dataset_dir,
+    replacing any previous conversion.
+
+    Returns a dict of ticker -> number of rows written.
+    """
+    if config is None:
+        config = settings.DEFAULT
+
+    if csv_dir == '':
+        csv_dir = os.path.expanduser(config.CSV_DATA_DIR)
+    else:
+        csv_dir = os.path.expanduser(csv_dir)
+    if dataset_dir == '':
+        dataset_dir = os.path.join(csv_dir, "parquet")
+    else:
+        dataset_dir = os.path.expanduser(dataset_dir)
+
+    price_handler = None
+    if source == "sqlite":
+        from ..price_handler.sqlite_bar import SqliteBarPriceHandler
+        price_handler = SqliteBarPriceHandler(
+            db_uri, queue.Queue(), tickers,
+            data_vendor=data_vendor, bar_size=bar_size
+        )
+    elif source != "csv":
+        raise NotImplementedError("Unknown source '%s'" % source)
+
+    counts = {}
+    for ticker in tickers:
+        if os.path.isdir(ticker_dir(dataset_dir, ticker)):
+            shutil.rmtree(ticker_dir(dataset_dir, ticker))
+        if kind == "tick":
+            counts[ticker] = convert_ticks(
+                csv_dir, dataset_dir, ticker, chunksize
+            )
+        else:
+            if price_handler is None:
+                df = yahoo_bars(csv_dir, ticker)
+            else:
+                df = sql_bars(price_handler, ticker)
+            write_partitions(dataset_dir, ticker, df)
+            counts[ticker] = len(df)
+        print("Saved %d '%s' rows to '%s'" % (
+            counts[ticker], ticker, dataset_dir
+        ))
+    return counts
+
+
+@click.command()
+@click.option('--source', default='csv', help='csv or sqlite')
+@click.option('--csv_dir', default='', help='CSV directory (CSV_DATA_DIR)')
+@click.option('--db_uri', default='', help='Sqlite database URI')
+@click.option('--dataset_dir', default='', help='Parquet dataset directory (CSV_DATA_DIR/parquet)')
+@click.option('--tickers', default='GOOG', help='Tickers (use comma)')
+@click.option('--kind', default='bar', help='bar or tick (csv source only)')
+@click.option('--data_vendor', default='CSI', help='Data vendor (sqlite source)')
+@click.option('--bar_size', default='D', help='Bar size (sqlite source)')
+@click.option('--chunksize', default=1000000, help='Number of tick CSV rows read at a time')
+def main(
+    source, csv_dir, db_uri, dataset_dir, tickers, kind,
+    data_vendor, bar_size, chunksize, config=None
+):
+    return run(
+        source, csv_dir, db_uri, dataset_dir, tickers.split(","), kind,
+        data_vendor, bar_size, chunksize, config=config
+    )
+
+if __name__ == "__main__":
+    main()
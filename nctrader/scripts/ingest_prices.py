@@ -0,0 +1,255 @@
+from __future__ import print_function
+
+import click
+
+import csv
+import io
+import os
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import create_engine, inspect, select
+
+from .. import settings
+from .convert_csv_ticks import TIME_FORMAT, ticker_csv_files
+
+
+BAR_COLUMNS = (
+    "timestamp", "open_price", "high_price", "low_price", "close_price",
+    "volume"
+)
+TICK_COLUMNS = ("timestamp", "bid_price", "ask_price")
+
+
+def schema_models(schema):
+    """
+    Returns the models module of schema, 'sqlite' (sqlite_db, with
+    Symbol) or 'db' (db, with Asset), its symbol model and the name
+    of the symbol id column of bar_data and tick_data.
+    """
+    if schema == "sqlite":
+        from ..price_handler.sqlite_db import models
+        return models, models.Symbol, "symbol_id"
+    elif schema == "db":
+        from ..price_handler.db import models
+        return models, models.Asset, "asset_id"
+    raise NotImplementedError("Unknown schema '%s'" % schema)
+
+
+def migrate(engine, models):
+    """
+    Brings the database up to date with the models: creates the
+    missing tables, then the missing indexes of existing tables
+    (e.g. bar_data_ix1 on databases created before it).
+
+    Returns the names of the indexes created.
+    """
+    models.Base.metadata.create_all(engine)
+    inspector = inspect(engine)
+    created = []
+    for table in models.Base.metadata.sorted_tables:
+        existing = set(ix["name"] for ix in inspector.get_indexes(table.name))
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+                created.append(index.name)
+    return created
+
+
+def _get_or_create(conn, table, values, key):
+    """
+    Returns the id of the row of table whose key column is
+    values[key], inserting values when there is none.
+    """
+    qry = select([table.c.id]).where(table.c[key] == values[key])
+    row = conn.execute(qry).first()
+    if row is not None:
+        return row[0]
+    return conn.execute(table.insert().values(**values)).inserted_primary_key[0]
+
+
+def ensure_symbol(
+    conn, symbol_model, models, ticker, data_vendor, exchange,
+    type="STK", big_point_value=1, margin=0.0
+):
+    """
+    Returns the id of ticker's symbol (asset) of data_vendor,
+    creating it, with the given type, big_point_value and margin,
+    and the data vendor and exchange as needed.
+    """
+    data_vendor_id = _get_or_create(
+        conn, models.DataVendor.__table__, {"name": data_vendor}, "name"
+    )
+    exchange_id = _get_or_create(
+        conn, models.Exchange.__table__,
+        {"abbrev": exchange, "name": exchange}, "name"
+    )
+    table = symbol_model.__table__
+    qry = select([table.c.id]).where(
+        (table.c.ticker == ticker) & (table.c.data_vendor_id == data_vendor_id)
+    )
+    row = conn.execute(qry).first()
+    if row is not None:
+        return row[0]
+    return conn.execute(table.insert().values(
+        ticker=ticker, data_vendor_id=data_vendor_id, exchange_id=exchange_id,
+        type=type, big_point_value=big_point_value, margin=margin
+    )).inserted_primary_key[0]
+
+
+def insert_rows(conn, table, columns, rows):
+    """
+    Bulk inserts rows, tuples of the values of columns, into
+    table: with COPY on PostgreSQL and as a single executemany
+    elsewhere.
+    """
+    if not rows:
+        return
+    if conn.dialect.name == "postgresql":
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        buf.seek(0)
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(
+            "COPY %s (%s) FROM STDIN WITH CSV" % (
+                table.name, ", ".join(columns)
+            ), buf
+        )
+    else:
+        conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+def bar_batches(csv_path, symbol_id, bar_size, chunksize):
+    """
+    Reads a Yahoo daily CSV (Date, Open, High, Low, Close,
+    Volume, Adj Close) chunksize rows at a time and yields lists
+    of bar_data rows.
+    """
+    now = datetime.now()
+    chunks = pd.read_csv(
+        csv_path, header=0, parse_dates=["Date"], chunksize=chunksize,
+        names=("Date", "Open", "High", "Low", "Close", "Volume", "Adj Close")
+    )
+    for df in chunks:
+        yield list(zip(
+            [symbol_id] * len(df), [bar_size] * len(df),
+            df["Date"].dt.to_pydatetime().tolist(),
+            df["Open"].tolist(), df["High"].tolist(), df["Low"].tolist(),
+            df["Close"].tolist(), df["Volume"].astype("int64").tolist(),
+            [now] * len(df), [now] * len(df)
+        ))
+
+
+def tick_batches(csv_path, symbol_id, chunksize):
+    """
+    Reads a tick CSV (Ticker, Time, Bid, Ask) chunksize rows at a
+    time and yields lists of tick_data rows.
+    """
+    now = datetime.now()
+    chunks = pd.read_csv(
+        csv_path, header=0, chunksize=chunksize,
+        names=("Ticker", "Time", "Bid", "Ask")
+    )
+    for df in chunks:
+        times = pd.to_datetime(df["Time"], format=TIME_FORMAT)
+        yield list(zip(
+            [symbol_id] * len(df), times.dt.to_pydatetime().tolist(),
+            df["Bid"].tolist(), df["Ask"].tolist(),
+            [now] * len(df), [now] * len(df)
+        ))
+
+
+def ingest_ticker(
+    engine, schema, csv_dir, ticker, kind="bar", data_vendor="CSI",
+    exchange="NYSE", bar_size="D", chunksize=100000
+):
+    """
+    Bulk inserts the CSV files of ticker in csv_dir into bar_data
+    (kind 'bar', TICKER.csv Yahoo files) or tick_data (kind 'tick',
+    TICKER.csv or, without it, the TICKER_YYYYMMDD.csv tick files,
+    see ticker_csv_files), one transaction per chunksize rows.
+
+    Returns the number of rows inserted.
+    """
+    models, symbol_model, id_column = schema_models(schema)
+    with engine.begin() as conn:
+        symbol_id = ensure_symbol(
+            conn, symbol_model, models, ticker, data_vendor, exchange
+        )
+    if kind == "bar":
+        table = models.BarData.__table__
+        columns = (id_column, "bar_size") + BAR_COLUMNS
+        batches = bar_batches(
+            os.path.join(csv_dir, "%s.csv" % ticker),
+            symbol_id, bar_size, chunksize
+        )
+    elif kind == "tick":
+        table = models.TickData.__table__
+        columns = (id_column,) + TICK_COLUMNS
+        batches = (
+            rows for fname in ticker_csv_files(csv_dir, ticker)
+            for rows in tick_batches(
+                os.path.join(csv_dir, fname), symbol_id, chunksize
+            )
+        )
+    else:
+        raise NotImplementedError("Unknown kind '%s'" % kind)
+    columns += ("created_date", "last_updated_date")
+
+    count = 0
+    for rows in batches:
+        with engine.begin() as conn:
+            insert_rows(conn, table, columns, rows)
+        count += len(rows)
+    return count
+
+
+def run(
+    db_uri, csv_dir, tickers, kind, schema, data_vendor, exchange,
+    bar_size, chunksize, config=None
+):
+    if config is None:
+        config = settings.DEFAULT
+
+    if csv_dir == '':
+        csv_dir = os.path.expanduser(config.CSV_DATA_DIR)
+    else:
+        csv_dir = os.path.expanduser(csv_dir)
+
+    engine = create_engine(db_uri)
+    models = schema_models(schema)[0]
+    for name in migrate(engine, models):
+        print("Created index '%s'" % name)
+
+    counts = {}
+    for ticker in tickers:
+        counts[ticker] = ingest_ticker(
+            engine, schema, csv_dir, ticker, kind, data_vendor,
+            exchange, bar_size, chunksize
+        )
+        print("Inserted %d '%s' %s rows" % (counts[ticker], ticker, kind))
+    engine.dispose()
+    return counts
+
+
+@click.command()
+@click.option('--db_uri', help='Database URI, e.g. sqlite:///prices.db')
+@click.option('--csv_dir', default='', help='CSV directory (CSV_DATA_DIR)')
+@click.option('--tickers', default='GOOG', help='Tickers (use comma)')
+@click.option('--kind', default='bar', help='bar (Yahoo daily CSVs) or tick')
+@click.option('--schema', default='sqlite', help='sqlite (Symbol) or db (Asset) models')
+@click.option('--data_vendor', default='CSI', help='Data vendor name')
+@click.option('--exchange', default='NYSE', help='Exchange of new symbols')
+@click.option('--bar_size', default='D', help='Bar size of the bars')
+@click.option('--chunksize', default=100000, help='Number of rows inserted at a time')
+def main(
+    db_uri, csv_dir, tickers, kind, schema, data_vendor, exchange,
+    bar_size, chunksize, config=None
+):
+    return run(
+        db_uri, csv_dir, tickers.split(","), kind, schema, data_vendor,
+        exchange, bar_size, chunksize, config=config
+    )
+
+if __name__ == "__main__":
+    main()
@@ -28,13 +28,17 @@ def from_env(key, default_value=None, root=ENV_VAR_ROOT):
 
 DEFAULT = munchify({
     "CSV_DATA_DIR": from_env("CSV_DATA_DIR", "~/data"),
-    "OUTPUT_DIR": from_env("OUTPUT_DIR", "~/out")
+    "OUTPUT_DIR": from_env("OUTPUT_DIR", "~/out"),
+    "CACHE_DIR": from_env("CACHE_DIR", "~/cache"),
+    "CACHE_MAX_BYTES": 1024 ** 3
 })
 
 
 TEST = munchify({
     "CSV_DATA_DIR": "data",
-    "OUTPUT_DIR": "out"
+    "OUTPUT_DIR": "out",
+    "CACHE_DIR": "cache",
+    "CACHE_MAX_BYTES": 1024 ** 3
 })
 
 
@@ -1,6 +1,10 @@
 from abc import ABCMeta, abstractmethod
 
 from ..compat import pickle
+from .results import ResultsReader, results_path, write_results
+
+import datetime
+import os
 
 
 class AbstractStatistics(object):
@@ -22,6 +26,11 @@ class AbstractStatistics(object):
 
     __metaclass__ = ABCMeta
 
+    # An optional sampling.AbstractSampler, in which case the backtest
+    # calls sample() once per sampling period rather than update()
+    # after every price event
+    sampler = None
+
     @abstractmethod
     def update(self):
         """
@@ -31,6 +40,13 @@ class AbstractStatistics(object):
         """
         raise NotImplementedError("Should implement update()")
 
+    def sample(self, time):
+        """
+        Record the portfolio equity as of the end of the sampling
+        period labelled time.
+        """
+        raise NotImplementedError("Should implement sample()")
+
     @abstractmethod
     def get_results(self):
         """
@@ -52,8 +68,27 @@ class AbstractStatistics(object):
         """
         raise NotImplementedError("Should implement save()")
 
+    def save_results(self, filename=""):
+        """
+        Save only the results, i.e. the summary metrics, equity curve,
+        returns, drawdowns and positions, to filename.json and
+        filename.npz rather than pickling the whole statistics.
+        """
+        if filename == "":
+            now = datetime.datetime.utcnow()
+            filename = "results_" + now.strftime("%Y-%m-%d_%H%M%S")
+            filename = os.path.expanduser(os.path.join(self.config.OUTPUT_DIR, filename))
+        print("Save results to '%s'" % filename)
+        return write_results(self.get_results(), filename)
+
     @classmethod
     def load(cls, filename):
+        """
+        Loads pickled statistics or, from a results file written by
+        save_results, a ResultsReader.
+        """
+        if os.path.exists(results_path(filename) + ".json"):
+            return ResultsReader(filename)
         with open(filename, 'rb') as fd:
             stats = pickle.load(fd)
         return stats
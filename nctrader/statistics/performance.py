@@ -6,23 +6,23 @@ from scipy.stats import linregress
 def aggregate_returns(returns, convert_to):
     """
     Aggregates returns by day, week, month, or year.
-    """
-    def cumulate_returns(x):
-        return np.exp(np.log(1 + x).cumsum())[-1] - 1
 
+    The returns are compounded as a sum of log returns per group,
+    rather than per group Python calls.
+    """
+    index = pd.DatetimeIndex(returns.index)
     if convert_to == 'weekly':
-        return returns.groupby(
-            [lambda x: x.year,
-             lambda x: x.month,
-             lambda x: x.isocalendar()[1]]).apply(cumulate_returns)
+        keys = [index.year, index.month, index.isocalendar().week]
     elif convert_to == 'monthly':
-        return returns.groupby(
-            [lambda x: x.year, lambda x: x.month]).apply(cumulate_returns)
+        keys = [index.year, index.month]
     elif convert_to == 'yearly':
-        return returns.groupby(
-            [lambda x: x.year]).apply(cumulate_returns)
+        keys = [index.year]
     else:
-        ValueError('convert_to must be weekly, monthly or yearly')
+        raise ValueError('convert_to must be weekly, monthly or yearly')
+    log_returns = pd.Series(np.log1p(returns.values), index=returns.index)
+    return np.expm1(
+        log_returns.groupby([np.asarray(k) for k in keys]).sum()
+    )
 
 
 def create_cagr(equity, periods=252):
@@ -37,7 +37,7 @@ def create_cagr(equity, periods=252):
     periods - Daily (252), Hourly (252*6.5), Minutely(252*6.5*60) etc.
     """
     years = len(equity) / float(periods)
-    return (equity[-1] ** (1.0 / years)) - 1.0
+    return (equity.iloc[-1] ** (1.0 / years)) - 1.0
 
 
 def create_sharpe_ratio(returns, periods=252):
@@ -70,48 +70,84 @@ def create_sortino_ratio(returns, periods=252):
         return 0.0
 
 
-def create_drawdowns(returns):
+def create_drawdowns(returns, with_periods=False):
     """
     Calculate the largest peak-to-trough drawdown of the equity curve
     as well as the duration of the drawdown. Requires that the
     pnl_returns is a pandas Series.
 
+    The high water mark is a running maximum and the duration the
+    number of periods since it was last reached, so both are
+    computed with array operations rather than a Python loop. As
+    before, the first period is left out (NaN) and the duration is
+    NaN until the curve first reaches its high water mark.
+
     Parameters:
     equity - A pandas Series representing period percentage returns.
+    with_periods - Also return the table of drawdown periods.
 
     Returns:
-    drawdown, drawdown_max, duration
+    drawdown, drawdown_max, duration[, periods]
     """
-
-    # Calculate the cumulative returns curve
-    # and set up the High Water Mark
-    hwm = [0]
-
-    # Create the drawdown and duration series
-    idx = returns.index
-    drawdown = pd.Series(index=idx)
-    duration = pd.Series(index=idx)
-
-    # Loop over the index range
-    for t in range(1, len(idx)):
-        hwm.append(max(hwm[t - 1], returns.ix[t]))
-        drawdown.ix[t] = (hwm[t] - returns.ix[t]) / hwm[t]
-        duration.ix[t] = (0 if drawdown.ix[t] == 0 else duration.ix[t - 1] + 1)
-
-    #TODO: Vectorize drawdown calculations to make them faster
+    values = returns.values.astype(np.float64)
+    n = len(values)
+    drawdown = np.full(n, np.nan)
+    duration = np.full(n, np.nan)
+    if n > 1:
+        # The high water mark starts from 0 at the second period
+        hwm = np.fmax.accumulate(np.concatenate(([0.0], values[1:])))[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown[1:] = (hwm - values[1:]) / hwm
+        # Periods since the last one without drawdown
+        positions = np.arange(n)
+        at_hwm = drawdown == 0
+        last_hwm = np.maximum.accumulate(np.where(at_hwm, positions, -1))
+        reached = last_hwm >= 0
+        duration[reached] = positions[reached] - last_hwm[reached]
+
+    drawdown = pd.Series(drawdown, index=returns.index)
+    duration = pd.Series(duration, index=returns.index)
+    if not with_periods:
+        return drawdown, drawdown.max(), duration.max()
+    return (
+        drawdown, drawdown.max(), duration.max(),
+        _drawdown_periods(returns.index, drawdown.values, duration.values)
+    )
+
+
+def _drawdown_periods(index, drawdown, duration):
     """
-    dd =  1 - returns.div(returns.cummax())
-    dd_dur = dd.where(dd == 0, 1)
-    #print drawdown, dd
-    #print drawdown.max(), dd.max()
-    #print dd_dur.groupby(dd_dur).cumcount()
-    #print duration.max(), dd_dur.max()
-    dd.to_csv('~/dd.csv')
-    dd_dur.to_csv('~/dd_dir.csv')
-    a = dd_dur.groupby(dd_dur).cumcount()
+    Returns a DataFrame of one row per drawdown period, i.e. run of
+    periods below the high water mark: its start (the peak), trough
+    and recovery (NaT when not recovered) timestamps, its depth
+    and its duration in periods.
     """
-
-    return drawdown, drawdown.max(), duration.max()
+    under = drawdown > 0
+    n = len(drawdown)
+    # Starts and ends (exclusive) of the runs of periods under water
+    edges = np.diff(np.concatenate(([0], under.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return pd.DataFrame(
+            columns=["start", "trough", "recovery", "depth", "duration"]
+        )
+    depth = np.maximum.reduceat(np.where(under, drawdown, -np.inf), starts)
+    # The trough is the first deepest point of each run
+    run_ids = np.cumsum(edges[:-1] == 1) - 1
+    deepest = np.flatnonzero(under & (drawdown == depth[run_ids]))
+    first = np.unique(run_ids[deepest], return_index=True)[1]
+    troughs = deepest[first]
+    recovery = index.take(
+        np.where(ends < n, ends, -1), allow_fill=True, fill_value=pd.NaT
+    )
+    return pd.DataFrame({
+        "start": index[np.maximum(starts - 1, 0)],
+        "trough": index[troughs],
+        "recovery": recovery,
+        "depth": depth,
+        "duration": ends - starts
+    }, columns=["start", "trough", "recovery", "depth", "duration"])
 
 
 def rsquared(x, y):
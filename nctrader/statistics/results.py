@@ -0,0 +1,253 @@
+import datetime
+import json
+import numbers
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Bumped whenever the layout of the results files changes
+VERSION = 1
+
+
+def results_path(path):
+    """
+    Returns path without its .json or .npz extension, the results
+    of path being written to path.json and path.npz.
+    """
+    base, ext = os.path.splitext(path)
+    if ext in (".json", ".npz"):
+        return base
+    return path
+
+
+def _encode(arrays, key, values):
+    """
+    Stores the Series or Index values into arrays as key, and
+    returns the description of how to read them back.
+    """
+    values = pd.Series(values)
+    if values.dtype == object:
+        inferred = pd.api.types.infer_dtype(values, skipna=True)
+        if inferred in ("datetime", "datetime64", "date"):
+            values = pd.to_datetime(values)
+        elif inferred in ("timedelta", "timedelta64"):
+            values = pd.to_timedelta(values)
+        elif inferred in (
+            "integer", "floating", "mixed-integer-float", "decimal"
+        ):
+            values = pd.to_numeric(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        tz = values.dt.tz
+        if tz is not None:
+            values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        arrays[key] = values.values.astype("M8[ns]").view(np.int64)
+        return {"kind": "datetime", "tz": None if tz is None else str(tz)}
+    if pd.api.types.is_timedelta64_dtype(values):
+        arrays[key] = values.values.astype("m8[ns]").view(np.int64)
+        return {"kind": "timedelta"}
+    if pd.api.types.is_bool_dtype(values) or \
+            pd.api.types.is_numeric_dtype(values):
+        array = values.to_numpy()
+        if array.dtype == object:
+            array = values.to_numpy(dtype=float, na_value=np.nan)
+        arrays[key] = array
+        return {"kind": "number"}
+    null = values.isnull().values
+    arrays[key] = np.array(
+        [u"" if n else str(v) for v, n in zip(values, null)], dtype=str
+    )
+    if null.any():
+        arrays[key + ".null"] = null
+    return {"kind": "string"}
+
+
+def _decode(npz, key, kind):
+    """
+    Reads back the values stored as key by _encode.
+    """
+    array = npz[key]
+    if kind["kind"] == "datetime":
+        values = pd.DatetimeIndex(array.view("M8[ns]"))
+        if kind["tz"] is not None:
+            values = values.tz_localize("UTC").tz_convert(kind["tz"])
+        return values
+    if kind["kind"] == "timedelta":
+        return pd.TimedeltaIndex(array.view("m8[ns]"))
+    if kind["kind"] == "string":
+        values = array.astype(object)
+        if key + ".null" in npz.files:
+            values[npz[key + ".null"]] = None
+        return values
+    return array
+
+
+def _name(name):
+    return None if name is None else str(name)
+
+
+def _scalar(key, value):
+    """
+    Returns the JSON value of the summary metric value, NaN being
+    written as null.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return None if pd.isnull(value) else value.isoformat()
+    if isinstance(value, (datetime.timedelta, np.timedelta64)):
+        return None if pd.isnull(value) else str(pd.Timedelta(value))
+    raise ValueError(
+        "Cannot write the result '%s' of type %s" % (key, type(value))
+    )
+
+
+def write_results(results, path, metadata=None):
+    """
+    Writes the results dict of a statistics' get_results() to
+    path.json and path.npz, instead of pickling the statistics
+    along with the portfolio and price handlers they refer to.
+
+    The JSON header holds the scalar metrics (the summary), any
+    metadata and the layout of the Series (equity curve, returns,
+    drawdowns...) and DataFrames (positions, drawdown periods...)
+    which are stored column by column in the compressed NPZ, so
+    that each can be read back on its own.
+    """
+    path = results_path(path)
+    header = {
+        "version": VERSION, "summary": {}, "series": {}, "tables": {},
+        "metadata": metadata if metadata is not None else {},
+    }
+    arrays = {}
+    for key in sorted(results):
+        value = results[key]
+        if isinstance(value, pd.Series):
+            header["series"][key] = {
+                "name": _name(value.name),
+                "index_name": _name(value.index.name),
+                "index": _encode(arrays, key + ".index", value.index),
+                "values": _encode(arrays, key + ".values", value),
+                "length": len(value),
+            }
+        elif isinstance(value, pd.DataFrame):
+            header["tables"][key] = {
+                "columns": [str(c) for c in value.columns],
+                "index_name": _name(value.index.name),
+                "index": _encode(arrays, key + ".index", value.index),
+                "kinds": [
+                    _encode(arrays, "%s.c%d" % (key, i), value.iloc[:, i])
+                    for i in range(value.shape[1])
+                ],
+                "length": len(value),
+            }
+        else:
+            header["summary"][key] = _scalar(key, value)
+
+    # Written aside then renamed, the header last, so readers never
+    # see half written results
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp, "wb") as fd:
+        np.savez_compressed(fd, **arrays)
+    os.replace(tmp, path + ".npz")
+    with open(tmp, "w") as fd:
+        json.dump(header, fd, indent=1)
+    os.replace(tmp, path + ".json")
+    return path
+
+
+class ResultsReader(object):
+    """
+    ResultsReader reads the results written by write_results.
+
+    Only the JSON header is read on opening, so the summary is
+    available without touching the NPZ, and series or table reads
+    only that Series' or DataFrame's own columns.
+    """
+    def __init__(self, path):
+        self.path = results_path(path)
+        with open(self.path + ".json") as fd:
+            self.header = json.load(fd)
+        if self.header.get("version") != VERSION:
+            raise ValueError(
+                "Unsupported results version %s in '%s'" % (
+                    self.header.get("version"), self.path
+                )
+            )
+
+    @property
+    def summary(self):
+        """
+        The dict of the scalar metrics.
+        """
+        return self.header["summary"]
+
+    @property
+    def metadata(self):
+        return self.header["metadata"]
+
+    def series_names(self):
+        return sorted(self.header["series"])
+
+    def table_names(self):
+        return sorted(self.header["tables"])
+
+    def series(self, name):
+        """
+        Returns the Series name, e.g. "equity" or "drawdowns".
+        """
+        info = self.header["series"][name]
+        with np.load(self.path + ".npz") as npz:
+            return self._series(npz, name, info)
+
+    def table(self, name):
+        """
+        Returns the DataFrame name, e.g. "positions".
+        """
+        info = self.header["tables"][name]
+        with np.load(self.path + ".npz") as npz:
+            return self._table(npz, name, info)
+
+    def _series(self, npz, name, info):
+        index = pd.Index(
+            _decode(npz, name + ".index", info["index"]),
+            name=info["index_name"]
+        )
+        return pd.Series(
+            _decode(npz, name + ".values", info["values"]), index=index,
+            name=info["name"]
+        )
+
+    def _table(self, npz, name, info):
+        index = pd.Index(
+            _decode(npz, name + ".index", info["index"]),
+            name=info["index_name"]
+        )
+        return pd.DataFrame(
+            dict(
+                (column, _decode(npz, "%s.c%d" % (name, i), kind))
+                for i, (column, kind) in enumerate(
+                    zip(info["columns"], info["kinds"])
+                )
+            ), index=index, columns=info["columns"]
+        )
+
+    def get_results(self):
+        """
+        Returns the whole results dict, as returned by the
+        statistics' get_results() when written.
+        """
+        results = dict(self.summary)
+        with np.load(self.path + ".npz") as npz:
+            for name, info in self.header["series"].items():
+                results[name] = self._series(npz, name, info)
+            for name, info in self.header["tables"].items():
+                results[name] = self._table(npz, name, info)
+        return results
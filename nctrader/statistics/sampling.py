@@ -0,0 +1,80 @@
+import pandas as pd
+
+
+class AbstractSampler(object):
+    """
+    A sampler decides at which resolution of market time the
+    statistics record the portfolio equity.
+
+    The Backtest hands it the time of every price event before the
+    portfolio is revalued at that event's prices. When the time
+    starts a new sampling period, update returns the label of the
+    period just over, the portfolio then still holding its equity
+    as of the end of that period.
+
+    Without a sampler the statistics are updated after every price
+    event instead.
+    """
+    def __init__(self):
+        self.start = None
+
+    def update(self, time):
+        raise NotImplementedError("Should implement update()")
+
+    def close(self):
+        """
+        Returns the label of the still open period, if any, at the
+        end of the backtest.
+        """
+        start = self.start
+        self.start = None
+        return start
+
+
+class BarSampler(AbstractSampler):
+    """
+    Samples at the end of each bar period, i.e. once every tickers'
+    price events at a timestamp are in, each sample being labelled
+    with that timestamp.
+    """
+    def update(self, time):
+        if time == self.start:
+            return None
+        start = self.start
+        self.start = time
+        return start
+
+
+class IntervalSampler(AbstractSampler):
+    """
+    Samples every seconds of market time, the periods being
+    aligned to the epoch (or to midnight, in the times' own
+    timezone, for whole days) and labelled with their start.
+    Periods without any price event are not sampled.
+    """
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("The sampling interval must be positive")
+        super(IntervalSampler, self).__init__()
+        self.freq = pd.Timedelta(seconds=seconds)
+        self.end = None
+
+    def update(self, time):
+        if self.end is not None and time < self.end:
+            return None
+        start = self.start
+        self.start = pd.Timestamp(time).floor(self.freq)
+        self.end = self.start + self.freq
+        return start
+
+    def close(self):
+        self.end = None
+        return super(IntervalSampler, self).close()
+
+
+class DailySampler(IntervalSampler):
+    """
+    Samples the equity at the end of each day.
+    """
+    def __init__(self):
+        super(DailySampler, self).__init__(86400)
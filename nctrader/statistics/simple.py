@@ -32,6 +32,7 @@ class SimpleStatistics(AbstractStatistics):
         Takes in a portfolio handler.
         """
         self.config = config
+        self.portfolio_handler = portfolio_handler
         self.drawdowns = [0]
         self.equity = []
         self.equity_returns = [0.0]
@@ -42,10 +43,17 @@ class SimpleStatistics(AbstractStatistics):
         self.hwm = [current_equity]
         self.equity.append(current_equity)
 
-    def update(self, timestamp, portfolio_handler):
+    def update(self, timestamp, portfolio_handler=None):
         """
         Update all statistics that must be tracked over time.
+
+        Called by the Backtest with the price event alone, its time
+        being the timestamp and the portfolio handler the one given
+        on construction.
         """
+        if portfolio_handler is None:
+            timestamp = timestamp.time
+            portfolio_handler = self.portfolio_handler
         if timestamp != self.timeseries[-1]:
             # Retrieve equity value of Portfolio
             current_equity = PriceParser.display(portfolio_handler.portfolio.equity)
@@ -112,8 +120,8 @@ class SimpleStatistics(AbstractStatistics):
         try:
             top_index = equity_series[:bottom_index].idxmax()
             pct = (
-                (equity_series.ix[top_index] - equity_series.ix[bottom_index]) /
-                equity_series.ix[top_index] * 100
+                (equity_series.loc[top_index] - equity_series.loc[bottom_index]) /
+                equity_series.loc[top_index] * 100
             )
             return round(pct, 4)
         except ValueError:
@@ -0,0 +1,311 @@
+from .base import AbstractStatistics
+from ..compat import pickle
+from ..price_parser import PriceParser
+
+import copy
+import datetime
+import math
+import os
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+class RunningMoments(object):
+    """
+    Welford's online mean and variance of a stream of values,
+    in O(1) memory and without the cancellation of summing
+    squares.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def std(self, ddof=0):
+        """
+        Returns the standard deviation, NaN for too few values.
+        """
+        if self.count - ddof <= 0:
+            return np.nan
+        return math.sqrt(self.m2 / (self.count - ddof))
+
+
+class PerformanceAccumulator(object):
+    """
+    PerformanceAccumulator keeps the running state needed for the
+    performance statistics of an equity curve, updated with one
+    period's closing equity at a time in O(1) time and memory.
+
+    Returns are taken between successive periods, the first
+    period's return being 0, as in the TearsheetStatistics. The
+    drawdowns are measured from the high water mark of the whole
+    curve, including its first period.
+    """
+    def __init__(self):
+        self.periods = 0
+        self.first_equity = None
+        self.last_equity = None
+        self.returns = RunningMoments()
+        self.losses = RunningMoments()
+        self.hwm = None
+        self.max_drawdown = 0.0
+        self.duration = 0
+        self.max_duration = 0
+        self.exposed = 0
+
+    def add(self, equity, exposed=False):
+        """
+        Adds a period closing at equity, with open positions when
+        exposed.
+        """
+        self.periods += 1
+        if self.first_equity is None:
+            self.first_equity = equity
+            self.hwm = equity
+            ret = 0.0
+        else:
+            ret = equity / float(self.last_equity) - 1.0
+        self.last_equity = equity
+        self.returns.add(ret)
+        if ret < 0:
+            self.losses.add(ret)
+
+        if equity >= self.hwm:
+            self.hwm = equity
+            self.duration = 0
+        else:
+            drawdown = (self.hwm - equity) / float(self.hwm)
+            self.max_drawdown = max(self.max_drawdown, drawdown)
+            self.duration += 1
+            self.max_duration = max(self.max_duration, self.duration)
+        if exposed:
+            self.exposed += 1
+
+    def results(self, periods=252):
+        """
+        Returns a dict of the statistics, annualised for periods
+        periods a year (252 for daily bars).
+        """
+        results = {
+            "periods": self.periods,
+            "sharpe": 0.0,
+            "sortino": 0.0,
+            "max_drawdown_pct": self.max_drawdown,
+            "max_drawdown_duration": self.max_duration,
+            "cagr": np.nan,
+            "exposure": np.nan,
+            "total_return": np.nan,
+            "final_equity": np.nan,
+        }
+        if self.periods == 0:
+            return results
+        std = self.returns.std()
+        if std > 0:
+            results["sharpe"] = math.sqrt(periods) * self.returns.mean / std
+        loss_std = self.losses.std()
+        if loss_std > 0:
+            results["sortino"] = (
+                math.sqrt(periods) * self.returns.mean / loss_std
+            )
+        growth = self.last_equity / float(self.first_equity)
+        results["total_return"] = growth - 1.0
+        results["cagr"] = growth ** (periods / float(self.periods)) - 1.0
+        results["exposure"] = self.exposed / float(self.periods)
+        results["final_equity"] = PriceParser.display(self.last_equity)
+        return results
+
+
+class EquityBuffer(object):
+    """
+    EquityBuffer records an equity curve, as timestamps and
+    PriceParser equity integers, into NumPy arrays rather than
+    Python lists.
+
+    Without a path the arrays are preallocated for capacity
+    periods and doubled whenever full. With a path, each full
+    buffer is instead appended to that binary file, so memory
+    stays bounded to capacity periods however long the run.
+    """
+    DTYPE = np.dtype([("time", np.int64), ("equity", np.int64)])
+
+    def __init__(self, capacity=65536, path=None):
+        self.capacity = capacity
+        self.path = path
+        self.data = np.empty(capacity, dtype=self.DTYPE)
+        self.length = 0
+        self.spilled = 0
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def __len__(self):
+        return self.spilled + self.length
+
+    def append(self, timestamp, equity):
+        if self.length == len(self.data):
+            if self.path is None:
+                self.data = np.resize(self.data, 2 * len(self.data))
+            else:
+                self.flush()
+        self.data[self.length] = (pd.Timestamp(timestamp).value, equity)
+        self.length += 1
+
+    def flush(self):
+        """
+        Appends the buffered periods to the file at path.
+        """
+        if self.path is None or self.length == 0:
+            return
+        with open(self.path, "ab") as fd:
+            self.data[:self.length].tofile(fd)
+        self.spilled += self.length
+        self.length = 0
+
+    def to_series(self):
+        """
+        Returns the whole equity curve as a Series of PriceParser
+        integers indexed by timestamp.
+        """
+        data = self.data[:self.length]
+        if self.spilled > 0:
+            data = np.concatenate(
+                (np.fromfile(self.path, dtype=self.DTYPE), data)
+            )
+        return pd.Series(
+            data["equity"], index=pd.DatetimeIndex(data["time"].view("M8[ns]"))
+        )
+
+
+class StreamingStatistics(AbstractStatistics):
+    """
+    StreamingStatistics computes the Sharpe and Sortino ratios,
+    max drawdown and its duration, CAGR and exposure of a backtest
+    on the fly, in constant memory, for runs too long (e.g. tick
+    level) to keep their equity curve in Python lists.
+
+    The equity at the close of every timestamp, or of every
+    sampling period with a sampler, is added to a
+    PerformanceAccumulator and, optionally, recorded into an
+    EquityBuffer for plotting.
+    """
+    def __init__(
+        self, config, portfolio_handler, periods=252, start_date=None,
+        equity_buffer=None, sampler=None
+    ):
+        """
+        Takes in the config, a portfolio handler, the number of
+        periods a year used to annualise the statistics, an
+        optional start date before which the prices are ignored,
+        an optional EquityBuffer and an optional sampler.
+        """
+        self.config = config
+        self.portfolio_handler = portfolio_handler
+        self.periods = periods
+        self.start_date = start_date
+        self.equity_buffer = equity_buffer
+        self.sampler = sampler
+        self.accumulator = PerformanceAccumulator()
+        self.current_timestamp = None
+        self.current_equity = None
+        self.current_exposed = False
+
+    def update(self, event):
+        """
+        Records the portfolio equity as of the price event, closing
+        the previous timestamp's period when the time moves on.
+        """
+        if self.start_date is not None and event.time < self.start_date:
+            return
+        if event.time != self.current_timestamp:
+            if self.current_timestamp is not None:
+                self._add_period(self.accumulator, self.equity_buffer)
+            self.current_timestamp = event.time
+        portfolio = self.portfolio_handler.portfolio
+        self.current_equity = portfolio.equity
+        self.current_exposed = len(portfolio.positions) > 0
+
+    def sample(self, time):
+        """
+        Adds the period labelled time, closing at the current
+        portfolio equity.
+        """
+        if self.start_date is not None and time < self.start_date:
+            return
+        portfolio = self.portfolio_handler.portfolio
+        self.current_timestamp = time
+        self.current_equity = portfolio.equity
+        self.current_exposed = len(portfolio.positions) > 0
+        self._add_period(self.accumulator, self.equity_buffer)
+        self.current_timestamp = None
+
+    def _add_period(self, accumulator, equity_buffer):
+        accumulator.add(self.current_equity, self.current_exposed)
+        if equity_buffer is not None:
+            equity_buffer.append(self.current_timestamp, self.current_equity)
+
+    def get_results(self):
+        """
+        Return a dict with all important results & stats, including
+        the current, still open, period. With an equity buffer, the
+        equity curve is returned as well.
+        """
+        accumulator = self.accumulator
+        if self.current_timestamp is not None:
+            accumulator = copy.deepcopy(accumulator)
+            self._add_period(accumulator, None)
+        statistics = accumulator.results(self.periods)
+
+        if self.equity_buffer is not None:
+            equity = self.equity_buffer.to_series()
+            if self.current_timestamp is not None:
+                equity[pd.Timestamp(self.current_timestamp)] = self.current_equity
+            statistics["equity"] = PriceParser.display_array(equity)
+        return statistics
+
+    def plot_results(self):
+        """
+        Plots the equity curve and drawdowns, which needs an equity
+        buffer.
+        """
+        if self.equity_buffer is None:
+            print("No equity curve recorded to plot, use an EquityBuffer.")
+            return
+        equity = self.get_results()["equity"]
+        fig = plt.figure()
+        fig.patch.set_facecolor('white')
+        ax1 = fig.add_subplot(211, ylabel='Equity Value')
+        equity.plot(ax=ax1)
+        ax2 = fig.add_subplot(212, ylabel='Drawdowns')
+        (1.0 - equity / equity.cummax()).plot(ax=ax2, color='red')
+        fig.autofmt_xdate()
+        plt.show()
+
+    def get_filename(self, filename=""):
+        if filename == "":
+            now = datetime.datetime.utcnow()
+            filename = "statistics_" + now.strftime("%Y-%m-%d_%H%M%S") + ".pkl"
+            filename = os.path.expanduser(os.path.join(self.config.OUTPUT_DIR, filename))
+        return filename
+
+    def save(self, filename="", pickled=False):
+        """
+        Saves the results with save_results, after flushing the
+        equity buffer. With pickled, the whole statistics are
+        pickled to filename instead, along with the portfolio and
+        price handlers they refer to.
+        """
+        if self.equity_buffer is not None:
+            self.equity_buffer.flush()
+        if not pickled:
+            return self.save_results(filename)
+        filename = self.get_filename(filename)
+        print("Save results to '%s'" % filename)
+        with open(filename, 'wb') as fd:
+            pickle.dump(self, fd)
+        return filename
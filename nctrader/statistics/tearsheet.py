@@ -1,6 +1,9 @@
 from .base import AbstractStatistics
+from .results import ResultsReader, results_path
 from ..price_parser import PriceParser
 
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.ticker import FuncFormatter
 from matplotlib import cm
 from datetime import datetime
@@ -16,125 +19,24 @@ import matplotlib.dates as mdates
 import seaborn as sns
 import os
 import csv
+import multiprocessing
 
 
-class TearsheetStatistics(AbstractStatistics):
+class TearsheetPlotter(object):
     """
+    TearsheetPlotter draws the tearsheet of the results returned by
+    get_results(), using the title, benchmark and log_scale
+    attributes of the class it is mixed into.
     """
-    def __init__(self, config, portfolio_handler, title=None,
-                 benchmark=None, start_date=None, end_date=None
-    ):
-        """
-        Takes in the config, a portfolio handler, optional title
-        and benchmark.
-        """
-        self.config = config
-        self.portfolio_handler = portfolio_handler
-        self.price_handler = portfolio_handler.price_handler
-        self.title = '\n'.join(title)
-        self.benchmark = benchmark
-        self.start_date = start_date
-        self.end_date = end_date
-        self.equity = {}
-        self.equity_benchmark = {}
-        self.log_scale = False
-        self.equity_file = []
-        self.current_timestamp = None
-        self.current_line = OrderedDict()
-
-
-    def update(self, event):
-        """
-        Update equity curve and benchmark equity curve that must be tracked
-        over time.
-        """
-        if self.current_timestamp == None or event.time < self.start_date:
-            self.current_timestamp = event.time
-            return
-
-        if event.time != self.current_timestamp and len(self.current_line) > 0:
-            self.equity_file.append(self.current_line.copy())
-            self.current_line.clear()
-        else:
-            self.current_line['timestamp'] = event.time
-            self.equity[event.time] = PriceParser.display(
-                self.portfolio_handler.portfolio.equity
-            )
-            self.current_line['equity'] = PriceParser.display(
-                self.portfolio_handler.portfolio.equity
-            )
-            self.current_line['contracts'] = (
-                self.portfolio_handler.portfolio.open_quantity
-            )
-
-        self.current_timestamp = event.time
-
-
-    def get_results(self):
-        """
-        Return a dict with all important results & stats.
-        """
-        # Equity
-        equity_s = pd.Series(self.equity).sort_index()
-
-        # Returns
-        returns_s = equity_s.pct_change().fillna(0.0)
-
-        # Cummulative Returns
-        cum_returns_s = np.exp(np.log(1 + returns_s).cumsum())
-
-        # Drawdown, max drawdown, max drawdown duration
-        dd_s, max_dd, dd_dur = perf.create_drawdowns(cum_returns_s)
-
-        statistics = {}
-
-        # Equity statistics
-        statistics["sharpe"] = perf.create_sharpe_ratio(returns_s)
-        statistics["drawdowns"] = dd_s
-        # TODO: need to have max_drawdown so it can be printed at end of test
-        statistics["max_drawdown"] = max_dd
-        statistics["max_drawdown_pct"] = max_dd
-        statistics["max_drawdown_duration"] = dd_dur
-        statistics["equity"] = equity_s
-        statistics["returns"] = returns_s
-        statistics["cum_returns"] = cum_returns_s
-        statistics["positions"] = pd.DataFrame(self._get_positions())
-
-        # Benchmark statistics if benchmark ticker specified
-        if self.benchmark is not None:
-            equity_b = pd.Series(self.equity_benchmark).sort_index()
-            returns_b = equity_b.pct_change().fillna(0.0)
-            cum_returns_b = np.exp(np.log(1 + returns_b).cumsum())
-            dd_b, max_dd_b, dd_dur_b = perf.create_drawdowns(cum_returns_b)
-            statistics["sharpe_b"] = perf.create_sharpe_ratio(returns_b)
-            statistics["drawdowns_b"] = dd_b
-            statistics["max_drawdown_pct_b"] = max_dd_b
-            statistics["max_drawdown_duration_b"] = dd_dur_b
-            statistics["equity_b"] = equity_b
-            statistics["returns_b"] = returns_b
-            statistics["cum_returns_b"] = cum_returns_b
-
-        return statistics
-
-
-    def _get_positions(self):
+    def _aggregate_returns(self, stats, convert_to):
         """
-        Retrieve the list of closed Positions objects from the portfolio
-        and reformat into a pandas dataframe to be returned
+        Returns the monthly or yearly returns, aggregated once and
+        then kept in stats for the other panels.
         """
-        a = []
-        pos = self.portfolio_handler.portfolio.closed_positions
-        for p in pos:
-            d = p.__dict__()
-            a.append(d)
-
-        # append open positions at the end
-        pos = self.portfolio_handler.portfolio.get_open_positions()
-        for p in pos:
-            d = p.__dict__()
-            a.append(d)
-
-        return a
+        key = convert_to + "_returns"
+        if key not in stats:
+            stats[key] = perf.aggregate_returns(stats["returns"], convert_to)
+        return stats[key]
 
 
     def _plot_equity(self, stats, ax=None, **kwargs):
@@ -214,12 +116,10 @@ class TearsheetStatistics(AbstractStatistics):
         """
         Plots a heatmap of the monthly returns.
         """
-        returns = stats['returns']
         if ax is None:
             ax = plt.gca()
 
-        monthly_ret = perf.aggregate_returns(returns, 'monthly')
-        monthly_ret = monthly_ret.unstack()
+        monthly_ret = self._aggregate_returns(stats, 'monthly').unstack()
         monthly_ret = np.round(monthly_ret, 3)
         monthly_ret.rename(
             columns={1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr',
@@ -253,8 +153,6 @@ class TearsheetStatistics(AbstractStatistics):
         def format_perc(x, pos):
             return '%.0f%%' % x
 
-        returns = stats['returns']
-
         if ax is None:
             ax = plt.gca()
 
@@ -262,7 +160,7 @@ class TearsheetStatistics(AbstractStatistics):
         ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
         ax.yaxis.grid(linestyle=':')
 
-        yly_ret = perf.aggregate_returns(returns, 'yearly') * 100.0
+        yly_ret = self._aggregate_returns(stats, 'yearly') * 100.0
         yly_ret.plot(ax=ax, kind="bar")
         ax.set_title('Yearly Returns (%)', fontweight='bold')
         ax.set_ylabel('')
@@ -290,12 +188,13 @@ class TearsheetStatistics(AbstractStatistics):
         y_axis_formatter = FuncFormatter(format_perc)
         ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
 
-        tot_ret = cum_returns[-1] - 1.0
+        tot_ret = cum_returns.iloc[-1] - 1.0
         cagr = perf.create_cagr(cum_returns)
         sharpe = perf.create_sharpe_ratio(returns)
         sortino = perf.create_sortino_ratio(returns)
         rsq = perf.rsquared(range(cum_returns.shape[0]), cum_returns)
-        dd, dd_max, dd_dur = perf.create_drawdowns(cum_returns)
+        dd_max = stats["max_drawdown_pct"]
+        dd_dur = stats["max_drawdown_duration"]
         trd_yr = positions.shape[0] / (((returns.index[-1] - returns.index[0]).days + 1) / 365.0)
 
         ax.text(0.25, 8.9, 'Total Return', fontsize=8)
@@ -329,12 +228,13 @@ class TearsheetStatistics(AbstractStatistics):
         if self.benchmark is not None:
             returns_b = stats['returns_b']
             equity_b = stats['cum_returns_b']
-            tot_ret_b = equity_b[-1] - 1.0
+            tot_ret_b = equity_b.iloc[-1] - 1.0
             cagr_b = perf.create_cagr(equity_b)
             sharpe_b = perf.create_sharpe_ratio(returns_b)
             sortino_b = perf.create_sortino_ratio(returns_b)
             rsq_b = perf.rsquared(range(equity_b.shape[0]), equity_b)
-            dd_b, dd_max_b, dd_dur_b = perf.create_drawdowns(equity_b)
+            dd_max_b = stats["max_drawdown_pct_b"]
+            dd_dur_b = stats["max_drawdown_duration_b"]
 
             ax.text(9.75, 8.9, '{:.0%}'.format(tot_ret_b), fontweight='bold', horizontalalignment='right', fontsize=8)
             ax.text(9.75, 7.9, '{:.2%}'.format(cagr_b), fontweight='bold', horizontalalignment='right', fontsize=8)
@@ -447,16 +347,14 @@ class TearsheetStatistics(AbstractStatistics):
         def format_perc(x, pos):
             return '%.0f%%' % x
 
-        returns = stats['returns']
-
         if ax is None:
             ax = plt.gca()
 
         y_axis_formatter = FuncFormatter(format_perc)
         ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
 
-        mly_ret = perf.aggregate_returns(returns, 'monthly')
-        yly_ret = perf.aggregate_returns(returns, 'yearly')
+        mly_ret = self._aggregate_returns(stats, 'monthly')
+        yly_ret = self._aggregate_returns(stats, 'yearly')
 
         mly_pct = mly_ret[mly_ret >= 0].shape[0] / float(mly_ret.shape[0])
         mly_avg_win_pct = np.mean(mly_ret[mly_ret >= 0])
@@ -523,10 +421,7 @@ class TearsheetStatistics(AbstractStatistics):
         return ax
 
 
-    def plot_results(self, filename=None):
-        """
-        Plot the Tearsheet
-        """
+    def _set_style(self):
         rc = {
             'lines.linewidth': 1.0,
             'axes.facecolor': '0.995',
@@ -547,28 +442,34 @@ class TearsheetStatistics(AbstractStatistics):
         sns.set_style("whitegrid")
         sns.set_palette("deep", desat=.6)
 
+
+    def _plot_tearsheet(self, fig, stats):
+        """
+        Draws all the panels of the tearsheet onto fig, sharing
+        the one stats dict among them.
+        """
+        stats = dict(stats)
         vertical_sections = 5
-        fig = plt.figure(figsize=(10, vertical_sections * 3))
         fig.suptitle(self.title, y=0.96)
         gs = gridspec.GridSpec(vertical_sections, 3, wspace=0.25, hspace=0.5)
 
-        stats = self.get_results()
+        self._plot_equity(stats, ax=fig.add_subplot(gs[:2, :]))
+        self._plot_drawdown(stats, ax=fig.add_subplot(gs[2, :]))
+        self._plot_monthly_returns(stats, ax=fig.add_subplot(gs[3, :2]))
+        self._plot_yearly_returns(stats, ax=fig.add_subplot(gs[3, 2]))
+        self._plot_txt_curve(stats, ax=fig.add_subplot(gs[4, 0]))
+        self._plot_txt_trade(stats, ax=fig.add_subplot(gs[4, 1]))
+        self._plot_txt_time(stats, ax=fig.add_subplot(gs[4, 2]))
+        return fig
 
-        ax_equity = plt.subplot(gs[:2, :])
-        ax_drawdown = plt.subplot(gs[2, :])
-        ax_monthly_returns = plt.subplot(gs[3, :2])
-        ax_yearly_returns = plt.subplot(gs[3, 2])
-        ax_txt_curve = plt.subplot(gs[4, 0])
-        ax_txt_trade = plt.subplot(gs[4, 1])
-        ax_txt_time = plt.subplot(gs[4, 2])
 
-        self._plot_equity(stats, ax=ax_equity)
-        self._plot_drawdown(stats, ax=ax_drawdown)
-        self._plot_monthly_returns(stats, ax=ax_monthly_returns)
-        self._plot_yearly_returns(stats, ax=ax_yearly_returns)
-        self._plot_txt_curve(stats, ax=ax_txt_curve)
-        self._plot_txt_trade(stats, ax=ax_txt_trade)
-        self._plot_txt_time(stats, ax=ax_txt_time)
+    def plot_results(self, filename=None):
+        """
+        Plot the Tearsheet
+        """
+        self._set_style()
+        fig = plt.figure(figsize=(10, 15))
+        self._plot_tearsheet(fig, self.get_results())
 
         # Plot the figure
         plt.show()
@@ -577,13 +478,182 @@ class TearsheetStatistics(AbstractStatistics):
             fig.savefig(filename)
 
 
-    def save(self, filename=""):
+    def save_tearsheet(self, filename, stats=None, dpi=100):
+        """
+        Renders the tearsheet straight to filename, in the format
+        (png, svg, pdf...) given by its extension.
+
+        The figure is drawn on its own Agg canvas rather than through
+        pyplot, so nothing is shown, no interactive backend is needed
+        and the global style is left as it was. stats, the results of
+        get_results(), are computed when not given.
+        """
+        if stats is None:
+            stats = self.get_results()
+        with plt.rc_context():
+            self._set_style()
+            fig = Figure(figsize=(10, 15))
+            FigureCanvasAgg(fig)
+            self._plot_tearsheet(fig, stats)
+            fig.savefig(filename, dpi=dpi)
+        return filename
+
+
+class TearsheetStatistics(TearsheetPlotter, AbstractStatistics):
+    """
+    """
+    def __init__(self, config, portfolio_handler, title=None,
+                 benchmark=None, start_date=None, end_date=None, sampler=None
+    ):
+        """
+        Takes in the config, a portfolio handler, optional title
+        and benchmark, and an optional sampler setting the resolution
+        at which the equity is recorded.
+        """
+        self.config = config
+        self.portfolio_handler = portfolio_handler
+        self.price_handler = portfolio_handler.price_handler
+        self.title = '\n'.join(title)
+        self.benchmark = benchmark
+        self.start_date = start_date
+        self.end_date = end_date
+        self.sampler = sampler
+        self.equity = {}
+        self.equity_benchmark = {}
+        self.log_scale = False
+        self.equity_file = []
+        self.current_timestamp = None
+        self.current_line = OrderedDict()
+
+
+    def update(self, event):
+        """
+        Update equity curve and benchmark equity curve that must be tracked
+        over time.
+        """
+        if self.current_timestamp == None or event.time < self.start_date:
+            self.current_timestamp = event.time
+            return
+
+        if event.time != self.current_timestamp and len(self.current_line) > 0:
+            self.equity_file.append(self.current_line.copy())
+            self.current_line.clear()
+        else:
+            equity = self.portfolio_handler.portfolio.equity
+            self.current_line['timestamp'] = event.time
+            self.equity[event.time] = equity
+            self.current_line['equity'] = PriceParser.display(equity)
+            self.current_line['contracts'] = (
+                self.portfolio_handler.portfolio.open_quantity
+            )
+
+        self.current_timestamp = event.time
+
+    def sample(self, time):
+        """
+        Record the equity at the end of the sampling period labelled
+        time.
+        """
+        if self.start_date is not None and time < self.start_date:
+            return
+        equity = self.portfolio_handler.portfolio.equity
+        self.equity[time] = equity
+        self.equity_file.append(OrderedDict([
+            ('timestamp', time),
+            ('equity', PriceParser.display(equity)),
+            ('contracts', self.portfolio_handler.portfolio.open_quantity),
+        ]))
+
+
+    def get_results(self):
+        """
+        Return a dict with all important results & stats.
+        """
+        # Equity, kept in parsed units until now and converted in one pass
+        equity_s = PriceParser.display_array(
+            pd.Series(self.equity, dtype=np.int64).sort_index()
+        )
+
+        # Returns
+        returns_s = equity_s.pct_change().fillna(0.0)
+
+        # Cummulative Returns
+        cum_returns_s = np.exp(np.log(1 + returns_s).cumsum())
+
+        # Drawdown, max drawdown, max drawdown duration
+        dd_s, max_dd, dd_dur, dd_periods = perf.create_drawdowns(
+            cum_returns_s, with_periods=True
+        )
+
+        statistics = {}
+
+        # Equity statistics
+        statistics["sharpe"] = perf.create_sharpe_ratio(returns_s)
+        statistics["drawdowns"] = dd_s
+        # TODO: need to have max_drawdown so it can be printed at end of test
+        statistics["max_drawdown"] = max_dd
+        statistics["max_drawdown_pct"] = max_dd
+        statistics["max_drawdown_duration"] = dd_dur
+        statistics["drawdown_periods"] = dd_periods
+        statistics["equity"] = equity_s
+        statistics["returns"] = returns_s
+        statistics["cum_returns"] = cum_returns_s
+        statistics["positions"] = pd.DataFrame(self._get_positions())
+
+        # Benchmark statistics if benchmark ticker specified
+        if self.benchmark is not None:
+            equity_b = pd.Series(self.equity_benchmark).sort_index()
+            returns_b = equity_b.pct_change().fillna(0.0)
+            cum_returns_b = np.exp(np.log(1 + returns_b).cumsum())
+            dd_b, max_dd_b, dd_dur_b, dd_periods_b = perf.create_drawdowns(
+                cum_returns_b, with_periods=True
+            )
+            statistics["sharpe_b"] = perf.create_sharpe_ratio(returns_b)
+            statistics["drawdowns_b"] = dd_b
+            statistics["max_drawdown_pct_b"] = max_dd_b
+            statistics["max_drawdown_duration_b"] = dd_dur_b
+            statistics["drawdown_periods_b"] = dd_periods_b
+            statistics["equity_b"] = equity_b
+            statistics["returns_b"] = returns_b
+            statistics["cum_returns_b"] = cum_returns_b
+
+        return statistics
+
+
+    def _get_positions(self):
+        """
+        Retrieve the list of closed Positions objects from the portfolio
+        and reformat into a pandas dataframe to be returned
+        """
+        a = []
+        pos = self.portfolio_handler.portfolio.closed_positions
+        for p in pos:
+            d = p.__dict__()
+            a.append(d)
+
+        # append open positions at the end
+        pos = self.portfolio_handler.portfolio.get_open_positions()
+        for p in pos:
+            d = p.__dict__()
+            a.append(d)
+
+        return a
+
+
+    def save(self, filename="", headless=False):
+        """
+        Saves the tearsheet figure, positions and equity to the output
+        directory, the tearsheet also being shown unless headless.
+        """
         now = datetime.now()
 
         # Save tearsheet figure
         filename = "tearsheet_" + now.strftime("%Y-%m-%d") + ".png"
         filename = os.path.expanduser(os.path.join(self.config.OUTPUT_DIR, filename))
-        self.plot_results(filename)
+        if headless:
+            self.save_tearsheet(filename)
+        else:
+            self.plot_results(filename)
 
         # Save the list of positions
         filename = "positions_" + now.strftime("%Y-%m-%d") + ".csv"
@@ -604,3 +674,70 @@ class TearsheetStatistics(AbstractStatistics):
             writer.writeheader()
             for row in self.equity_file:
                 writer.writerow(row)
+
+
+class TearsheetRenderer(TearsheetPlotter):
+    """
+    TearsheetRenderer draws the tearsheet of results already computed,
+    a get_results() dict or the path of results written by
+    write_results, without the portfolio that produced them.
+    """
+    def __init__(self, results, title=None, benchmark=None, log_scale=False):
+        if not isinstance(results, dict):
+            results = ResultsReader(results).get_results()
+        self.results = results
+        self.title = "" if title is None else "\n".join(title)
+        self.benchmark = benchmark
+        self.log_scale = log_scale
+
+    def get_results(self):
+        return self.results
+
+
+def _render_job(job):
+    results, filename, title, benchmark, dpi = job
+    return TearsheetRenderer(results, title, benchmark).save_tearsheet(
+        filename, dpi=dpi
+    )
+
+
+def render_tearsheets(
+    jobs, processes=None, benchmark=None, dpi=100, overwrite=False
+):
+    """
+    Renders many tearsheets, e.g. those of a parameter sweep's runs,
+    in parallel worker processes and returns their filenames.
+
+    Parameters:
+    jobs - List of (results, filename) or (results, filename, title)
+        tuples, the results being a get_results() dict or the path
+        of results written by write_results.
+    processes - Number of worker processes, None for one per CPU
+        and 1 to render in this process.
+    benchmark - Name of the benchmark, when the results have one.
+    dpi - Resolution of the raster formats.
+    overwrite - Render again results read from a path even though
+        their tearsheet is newer than them.
+    """
+    tasks = []
+    for job in jobs:
+        results, filename = job[:2]
+        title = job[2] if len(job) > 2 else None
+        if not overwrite and not isinstance(results, dict) and \
+                os.path.exists(filename) and \
+                os.path.getmtime(filename) >= os.path.getmtime(
+                    results_path(results) + ".json"
+                ):
+            continue
+        tasks.append((results, filename, title, benchmark, dpi))
+
+    if processes == 1 or len(tasks) <= 1:
+        list(map(_render_job, tasks))
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            pool.map(_render_job, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    return [job[1] for job in jobs]
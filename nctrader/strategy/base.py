@@ -30,6 +30,27 @@ class AbstractStrategy(object):
         """
         raise NotImplementedError("Should implement on_tick()")
 
+    def on_bars(self, event):
+        """
+        Gets called whenever a cross-sectional BarsEvent is
+        received, i.e. when the price handler groups all bars
+        sharing a timestamp. By default every bar is handed
+        to on_bar in turn; override to work on the whole
+        cross-section at once.
+        """
+        for bar in event.bars():
+            self.on_bar(bar)
+
+    def declare_indicators(self, indicators):
+        """
+        Gets called once before a backtest starts with its
+        PrecomputedIndicators, on which the strategy may add the
+        indicators to compute over the loaded price history, e.g.
+        indicators.add("rsi", wilder_rsi, "close", period=2), and
+        keep to read them back in on_bar.
+        """
+        pass
+
 class Strategies(AbstractStrategy):
     """
     Strategies is a collection of strategy
@@ -44,3 +65,11 @@ class Strategies(AbstractStrategy):
     def on_tick(self, event):
         for strategy in self._lst_strategies:
             strategy.on_tick(event)
+
+    def on_bars(self, event):
+        for strategy in self._lst_strategies:
+            strategy.on_bars(event)
+
+    def declare_indicators(self, indicators):
+        for strategy in self._lst_strategies:
+            strategy.declare_indicators(indicators)
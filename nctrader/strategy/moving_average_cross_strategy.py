@@ -1,10 +1,7 @@
 from .base import AbstractStrategy
 
-from collections import deque
-
-import numpy as np
-
 from ..event import (SignalEvent, EventType)
+from ..indicators import SMA
 
 
 class MovingAverageCrossStrategy(AbstractStrategy):
@@ -25,24 +22,20 @@ class MovingAverageCrossStrategy(AbstractStrategy):
         self.long_window = long_window
         self.bars = 0
         self.invested = False
-        self.sw_bars = deque(maxlen=self.short_window)
-        self.lw_bars = deque(maxlen=self.long_window)
+        self.short_sma = SMA(self.short_window)
+        self.long_sma = SMA(self.long_window)
 
     def calculate_signals(self, event):
         # TODO: Only applies SMA to first ticker
         ticker = self.tickers[0]
         if event.type == EventType.BAR and event.ticker == ticker:
-            # Add latest adjusted closing price to the
-            # short and long window bars
-            self.lw_bars.append(event.adj_close_price)
-            if self.bars > self.long_window - self.short_window:
-                self.sw_bars.append(event.adj_close_price)
+            # Update the simple moving averages with the
+            # latest adjusted closing price
+            short_sma = self.short_sma.update(event.adj_close_price)
+            long_sma = self.long_sma.update(event.adj_close_price)
 
             # Enough bars are present for trading
             if self.bars > self.long_window:
-                # Calculate the simple moving averages
-                short_sma = np.mean(self.sw_bars)
-                long_sma = np.mean(self.lw_bars)
                 # Trading signals based on moving average cross
                 if short_sma > long_sma and not self.invested:
                     print("LONG: %s" % event.time)
@@ -1,7 +1,7 @@
 from __future__ import print_function
 
-from ..compat import queue
 from ..event import EventType
+from ..indicators import PrecomputedIndicators
 
 from datetime import datetime
 
@@ -26,10 +26,16 @@ class Backtest(object):
         self.position_sizer = position_sizer
         self.risk_manager = risk_manager
         self.statistics = statistics
+        self.sampler = getattr(statistics, "sampler", None)
         self.equity = equity
         self.end_date = end_date
         self.events_queue = price_handler.events_queue
         self.cur_time = None
+        self.indicators = PrecomputedIndicators(price_handler)
+        declare_indicators = getattr(strategy, "declare_indicators", None)
+        if declare_indicators is not None:
+            declare_indicators(self.indicators)
+            self.indicators.compute()
 
     def _default_dates(self, start_date, end_date):
         """
@@ -40,6 +46,54 @@ class Backtest(object):
             end_date = datetime(2099, 1, 1)
         return start_date, end_date
 
+    def _on_price(self, event):
+        """
+        Hands a TickEvent, BarEvent or BarsEvent to the strategy
+        and then revalues the positions in the event's tickers and
+        updates the statistics.
+        A BarsEvent carries a whole timestamp's cross-section, so
+        valuation and statistics then run once for all tickers.
+        Price events after the end date are skipped.
+
+        With a sampler, the statistics instead sample the equity
+        when an event starts a new sampling period, before its
+        prices revalue the portfolio, so that each sample holds the
+        equity at the end of its period.
+        """
+        if self.end_date is not None and event.time > self.end_date:
+            return
+        if self.sampler is not None:
+            time = self.sampler.update(event.time)
+            if time is not None:
+                self.statistics.sample(time)
+        self.cur_time = event.time
+        if event.type == EventType.TICK:
+            self.strategy.on_tick(event)
+            tickers = (event.ticker,)
+        elif event.type == EventType.BAR:
+            self.strategy.on_bar(event)
+            tickers = (event.ticker,)
+        else:
+            self.strategy.on_bars(event)
+            tickers = event.tickers
+        self.portfolio_handler.update_portfolio_value(tickers)
+        if self.sampler is None:
+            self.statistics.update(event)
+
+    def _event_handlers(self):
+        """
+        Returns the dispatch table mapping each EventType to
+        the component method that handles it.
+        """
+        return {
+            EventType.TICK: self._on_price,
+            EventType.BAR: self._on_price,
+            EventType.BARS: self._on_price,
+            EventType.SIGNAL: self.portfolio_handler.on_signal,
+            EventType.ORDER: self.execution_handler.execute_order,
+            EventType.FILL: self.portfolio_handler.on_fill,
+        }
+
     def _run_backtest(self):
         """
         Carries out an infinite while loop that polls the
@@ -47,36 +101,32 @@ class Backtest(object):
         strategy component of the execution handler. The
         loop continue until the event queue has been
         emptied.
+
+        Events are dispatched through a table keyed by
+        EventType. The queue is checked with empty() rather
+        than by catching queue.Empty, which together with an
+        EventQueue keeps the loop free of locks and exceptions.
         """
         print("Running Backtest...")
-        while self.price_handler.continue_backtest:
+        handlers = self._event_handlers()
+        events_queue = self.events_queue
+        price_handler = self.price_handler
+        while price_handler.continue_backtest:
+            if events_queue.empty():
+                price_handler.stream_next()
+                continue
+            event = events_queue.get(False)
             try:
-                event = self.events_queue.get(False)
-            except queue.Empty:
-                self.price_handler.stream_next()
-            else:
-                if ((event.type == EventType.TICK or event.type == EventType.BAR)
-                    and event.time > self.end_date
-                ):
-                    continue
-                if event.type == EventType.TICK:
-                    self.cur_time = event.time
-                    self.strategy.on_tick(event)
-                    self.portfolio_handler.update_portfolio_value()
-                    self.statistics.update(event)
-                if event.type == EventType.BAR:
-                    self.cur_time = event.time
-                    self.strategy.on_bar(event)
-                    self.portfolio_handler.update_portfolio_value()
-                    self.statistics.update(event)
-                elif event.type == EventType.SIGNAL:
-                    self.portfolio_handler.on_signal(event)
-                elif event.type == EventType.ORDER:
-                    self.execution_handler.execute_order(event)
-                elif event.type == EventType.FILL:
-                    self.portfolio_handler.on_fill(event)
-                else:
-                    raise NotImplemented("Unsupported event.type '%s'" % event.type)
+                handler = handlers[event.type]
+            except KeyError:
+                raise NotImplementedError(
+                    "Unsupported event.type '%s'" % event.type
+                )
+            handler(event)
+        if self.sampler is not None:
+            time = self.sampler.close()
+            if time is not None:
+                self.statistics.sample(time)
 
     def simulate_trading(self, testing=False):
         """
@@ -0,0 +1,205 @@
+from __future__ import print_function
+
+import itertools
+import multiprocessing
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ..event import EventQueue
+from ..execution_handler.ib_simulated import IBSimulatedExecutionHandler
+from ..portfolio_handler import PortfolioHandler
+from ..position_sizer.fixed import FixedPositionSizer
+from ..risk_manager.example import ExampleRiskManager
+from ..statistics.tearsheet import TearsheetStatistics
+from .backtest import Backtest
+
+
+def expand_grid(param_grid):
+    """
+    Expands a dict of parameter name -> list of values into a
+    list of dicts, one per combination of the values.
+    """
+    names = list(param_grid.keys())
+    return [
+        OrderedDict(zip(names, values))
+        for values in itertools.product(*[param_grid[n] for n in names])
+    ]
+
+
+def summarise(statistics):
+    """
+    Reduces the results of a TearsheetStatistics or SimpleStatistics
+    to the scalar statistics making up one row of a sweep's results
+    table, the statistics only kept by the former being NaN for the
+    latter.
+    """
+    results = statistics.get_results()
+    equity = results["equity"]
+    if len(equity) > 0:
+        final_equity = equity.iloc[-1]
+        total_return = final_equity / equity.iloc[0] - 1.0
+    else:
+        final_equity = np.nan
+        total_return = np.nan
+    if "positions" in results:
+        trades = len(results["positions"])
+    else:
+        trades = np.nan
+    return OrderedDict([
+        ("sharpe", results["sharpe"]),
+        ("max_drawdown_pct", results["max_drawdown_pct"]),
+        ("max_drawdown_duration",
+         results.get("max_drawdown_duration", np.nan)),
+        ("total_return", total_return),
+        ("final_equity", final_equity),
+        ("trades", trades),
+    ])
+
+
+# The sweep being run by a pool worker, set once per process
+_worker_sweep = None
+
+
+def _init_worker(sweep):
+    global _worker_sweep
+    _worker_sweep = sweep
+
+
+def _run_worker(params):
+    return _worker_sweep.run_params(params)
+
+
+class ParameterSweep(object):
+    """
+    Runs a Backtest of a strategy for every combination of a
+    parameter grid and collects their statistics into a single
+    results table.
+
+    The price handler is given already loaded, e.g. a
+    SqliteBarPriceHandler subscribed to its tickers, and every
+    run streams from a copy of it. With several processes the
+    pool workers are forked from this process where supported,
+    so all runs share one copy of the parsed price arrays.
+
+    The portfolio, execution and statistics components of each
+    run are built by make_backtest, which can be overridden.
+    """
+    def __init__(
+        self, config, price_handler, strategy_factory, param_grid,
+        initial_equity, start_date=None, end_date=None, processes=None,
+        statistics_factory=None
+    ):
+        """
+        Parameters:
+        config - The settings, handed to the statistics.
+        price_handler - A price handler that has not yet streamed.
+        strategy_factory - Called as strategy_factory(events_queue,
+            **params) for every combination, e.g.
+            functools.partial(MovingAverageCrossStrategy, tickers).
+        param_grid - Dict of parameter name -> list of values.
+        initial_equity - The starting cash, in parsed units.
+        start_date - Optional start of the statistics.
+        end_date - Optional end date of every backtest.
+        processes - Number of worker processes, None for one
+            per CPU and 1 to run in this process.
+        statistics_factory - Called as statistics_factory(config,
+            portfolio_handler) for every run, e.g. SimpleStatistics,
+            None for TearsheetStatistics.
+        """
+        self.config = config
+        self.price_handler = price_handler
+        self.strategy_factory = strategy_factory
+        self.param_grid = param_grid
+        self.initial_equity = initial_equity
+        self.start_date = start_date
+        self.end_date = end_date
+        self.processes = processes
+        self.statistics_factory = statistics_factory
+
+    def make_backtest(self, price_handler, strategy):
+        """
+        Assembles the Backtest of one run around its price handler
+        copy and strategy, with a fixed position sizer, simulated
+        execution without compliance (so that runs do not write
+        trade logs) and the statistics of statistics_factory, by
+        default TearsheetStatistics.
+        """
+        events_queue = price_handler.events_queue
+        position_sizer = FixedPositionSizer()
+        risk_manager = ExampleRiskManager()
+        portfolio_handler = PortfolioHandler(
+            self.initial_equity, events_queue, price_handler,
+            position_sizer, risk_manager
+        )
+        execution_handler = IBSimulatedExecutionHandler(
+            events_queue, price_handler
+        )
+        if self.statistics_factory is not None:
+            statistics = self.statistics_factory(
+                self.config, portfolio_handler
+            )
+        else:
+            start_date = self.start_date
+            if start_date is None:
+                start_date = datetime(1900, 1, 1)
+            statistics = TearsheetStatistics(
+                self.config, portfolio_handler, title=[""],
+                start_date=start_date, end_date=self.end_date
+            )
+        return Backtest(
+            price_handler, strategy,
+            portfolio_handler, execution_handler,
+            position_sizer, risk_manager,
+            statistics, self.initial_equity, self.end_date
+        )
+
+    def run_params(self, params):
+        """
+        Runs the backtest of one parameter combination and
+        returns its summarised statistics.
+        """
+        events_queue = EventQueue()
+        price_handler = self.price_handler.copy(events_queue)
+        strategy = self.strategy_factory(events_queue, **params)
+        backtest = self.make_backtest(price_handler, strategy)
+        backtest._run_backtest()
+        return summarise(backtest.statistics)
+
+    def _pool(self):
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        return context.Pool(
+            self.processes, initializer=_init_worker, initargs=(self,)
+        )
+
+    def run(self):
+        """
+        Runs every combination of the grid and returns a DataFrame
+        with one row per run: its parameters followed by its
+        statistics.
+        """
+        combinations = expand_grid(self.param_grid)
+        if self.processes == 1:
+            rows = [self.run_params(params) for params in combinations]
+        else:
+            pool = self._pool()
+            try:
+                rows = pool.map(_run_worker, combinations, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+
+        results = []
+        for params, row in zip(combinations, rows):
+            result = OrderedDict(params)
+            result.update(row)
+            results.append(result)
+        columns = list(self.param_grid.keys())
+        if len(rows) > 0:
+            columns += list(rows[0].keys())
+        return pd.DataFrame(results, columns=columns)
@@ -0,0 +1,156 @@
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from nctrader.compat import queue
+from nctrader.event import EventQueue, SignalEvent, OrderEvent, FillEvent
+from nctrader.price_handler import GenericPriceHandler
+from nctrader.price_handler.iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarBarsEventIterator
+)
+from nctrader.strategy.base import AbstractStrategy
+from nctrader.trading_session.backtest import Backtest
+
+
+class StrategyMock(AbstractStrategy):
+    def __init__(self, events_queue):
+        self.events_queue = events_queue
+        self.bars = []
+
+    def on_bar(self, event):
+        self.bars.append(event.time)
+        if len(self.bars) == 1:
+            self.events_queue.put(SignalEvent(event.ticker, "BOT"))
+
+
+class PortfolioHandlerMock(object):
+    def __init__(self, events_queue):
+        self.events_queue = events_queue
+        self.log = []
+
+    def on_signal(self, event):
+        self.log.append("SIGNAL")
+        self.events_queue.put(OrderEvent(event.ticker, event.action, 100))
+
+    def on_fill(self, event):
+        self.log.append("FILL")
+
+    def update_portfolio_value(self, tickers=None):
+        self.log.append("VALUE")
+
+
+class ExecutionHandlerMock(object):
+    def __init__(self, events_queue):
+        self.events_queue = events_queue
+
+    def execute_order(self, event):
+        self.events_queue.put(FillEvent(
+            None, event.ticker, event.action, event.quantity,
+            "ARCA", 0, 0, None
+        ))
+
+
+class StatisticsMock(object):
+    def __init__(self):
+        self.updates = 0
+
+    def update(self, event):
+        self.updates += 1
+
+
+class TestEventQueue(unittest.TestCase):
+    def test_fifo_and_empty(self):
+        events_queue = EventQueue()
+        self.assertTrue(events_queue.empty())
+        self.assertRaises(queue.Empty, events_queue.get, False)
+        events_queue.put(1)
+        events_queue.put(2)
+        self.assertEqual(events_queue.qsize(), 2)
+        self.assertEqual(events_queue.get(False), 1)
+        self.assertEqual(events_queue.get(False), 2)
+        self.assertTrue(events_queue.empty())
+
+
+class TestBacktestDispatch(unittest.TestCase):
+    """
+    Test that the backtest loop routes every event type to
+    the right component, with both queue implementations,
+    and skips bars after the end date.
+    """
+    def _run(
+        self, events_queue, end_date=None,
+        iterator=ColumnarBarEventIterator, reuse_events=False
+    ):
+        df = pd.DataFrame(
+            {"Open": [1.0, 2.0, 3.0], "High": [1.0, 2.0, 3.0],
+             "Low": [1.0, 2.0, 3.0], "Close": [1.0, 2.0, 3.0],
+             "Volume": [10, 20, 30], "Adj Close": [1.0, 2.0, 3.0]},
+            index=pd.to_datetime(["2016-01-04", "2016-01-05", "2016-01-06"])
+        )
+        price_handler = GenericPriceHandler(
+            events_queue, iterator(
+                {"GOOG": df, "MSFT": df * 2}, 86400,
+                reuse_events=reuse_events
+            )
+        )
+        self.strategy = StrategyMock(events_queue)
+        self.portfolio_handler = PortfolioHandlerMock(events_queue)
+        self.statistics = StatisticsMock()
+        backtest = Backtest(
+            price_handler, self.strategy, self.portfolio_handler,
+            ExecutionHandlerMock(events_queue), None, None,
+            self.statistics, 0, end_date
+        )
+        backtest._run_backtest()
+        return backtest
+
+    def test_dispatch(self):
+        for events_queue in (EventQueue(), queue.Queue()):
+            self._run(events_queue)
+            self.assertEqual(len(self.strategy.bars), 6)
+            self.assertEqual(self.statistics.updates, 6)
+            self.assertEqual(
+                self.portfolio_handler.log,
+                ["VALUE", "SIGNAL", "FILL"] + ["VALUE"] * 5
+            )
+
+    def test_grouped_bars(self):
+        """
+        With a BarsEvent per timestamp the strategy still sees
+        every bar, but valuation and statistics run once per
+        timestamp.
+        """
+        backtest = self._run(
+            EventQueue(), iterator=ColumnarBarsEventIterator
+        )
+        self.assertEqual(len(self.strategy.bars), 6)
+        self.assertEqual(self.statistics.updates, 3)
+        self.assertEqual(
+            self.portfolio_handler.log,
+            ["VALUE", "SIGNAL", "FILL", "VALUE", "VALUE"]
+        )
+        self.assertEqual(
+            backtest.price_handler.get_last_close("MSFT"), 6 * 10000000
+        )
+
+    def test_reuse_events(self):
+        """
+        A recycled price event is fully handled before the
+        next one is streamed.
+        """
+        backtest = self._run(EventQueue(), reuse_events=True)
+        self.assertEqual(len(set(self.strategy.bars)), 3)
+        self.assertEqual(self.statistics.updates, 6)
+        self.assertEqual(
+            backtest.price_handler.get_last_close("MSFT"), 6 * 10000000
+        )
+
+    def test_end_date(self):
+        backtest = self._run(EventQueue(), datetime(2016, 1, 5))
+        self.assertEqual(len(self.strategy.bars), 4)
+        self.assertEqual(backtest.cur_time, datetime(2016, 1, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
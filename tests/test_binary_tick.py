@@ -0,0 +1,175 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from nctrader.event import EventQueue
+from nctrader.price_handler.binary_tick import BinaryTickPriceHandler
+from nctrader.price_handler.historic_csv_tick import HistoricCSVTickPriceHandler
+from nctrader.price_handler.iterator.binary_tick import open_ticks
+from nctrader.price_parser import PriceParser
+from nctrader.scripts import convert_csv_ticks
+
+
+def write_csv(path, ticker, rows):
+    with open(path, "w") as fd:
+        fd.write("Ticker,Time,Bid,Ask\n")
+        for time, bid, ask in rows:
+            fd.write("%s,%s,%s,%s\n" % (ticker, time, bid, ask))
+
+
+class TestBinaryTickPriceHandler(unittest.TestCase):
+    """
+    Test that ticks converted from CSV to binary tick files
+    stream exactly as HistoricCSVTickPriceHandler streams the
+    same CSVs.
+    """
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        self.tick_dir = os.path.join(self.csv_dir, "ticks")
+        self.goog_rows = [
+            ("01.02.2016 00:00:01.358", 683.56000, 683.58000),
+            ("01.02.2016 00:00:02.544", 683.55998, 683.58002),
+            ("01.02.2016 00:00:03.765", 683.55999, 683.58001),
+            ("02.02.2016 00:00:01.562", 683.56001, 683.57999),
+        ]
+        self.amzn_rows = [
+            ("01.02.2016 00:00:01.578", 502.10001, 502.11999),
+            ("01.02.2016 00:00:02.544", 502.09999, 502.12001),
+            ("02.02.2016 00:00:01.562", 502.10000, 502.12000),
+        ]
+        write_csv(
+            os.path.join(self.csv_dir, "GOOG_20160201.csv"),
+            "GOOG", self.goog_rows[:3]
+        )
+        write_csv(
+            os.path.join(self.csv_dir, "GOOG_20160202.csv"),
+            "GOOG", self.goog_rows[3:]
+        )
+        write_csv(
+            os.path.join(self.csv_dir, "AMZN.csv"), "AMZN", self.amzn_rows
+        )
+        counts = convert_csv_ticks.run(
+            self.csv_dir, self.tick_dir, ["GOOG", "AMZN"], chunksize=2
+        )
+        self.assertEqual(counts, {"GOOG": 4, "AMZN": 3})
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+
+    def _stream(self, price_handler):
+        events = []
+        while price_handler.continue_backtest:
+            price_handler.stream_next()
+            while not price_handler.events_queue.empty():
+                events.append(str(price_handler.events_queue.get(False)))
+        return events
+
+    def test_binary_files(self):
+        times, bids, asks = open_ticks(self.tick_dir, "GOOG")
+        self.assertIsInstance(times, np.memmap)
+        self.assertEqual(
+            bids.tolist(),
+            [PriceParser.parse(r[1]) for r in self.goog_rows]
+        )
+        self.assertEqual(asks[3], PriceParser.parse(683.57999))
+
+    def test_same_stream_as_csv(self):
+        write_csv(
+            os.path.join(self.csv_dir, "GOOG.csv"), "GOOG", self.goog_rows
+        )
+        csv_events = self._stream(HistoricCSVTickPriceHandler(
+            self.csv_dir, EventQueue(), ["GOOG", "AMZN"]
+        ))
+        price_handler = BinaryTickPriceHandler(
+            self.tick_dir, EventQueue(), ["GOOG", "AMZN"]
+        )
+        self.assertEqual(
+            price_handler.get_best_bid_ask("AMZN"),
+            (PriceParser.parse(502.10001), PriceParser.parse(502.11999))
+        )
+        binary_events = self._stream(price_handler)
+        self.assertEqual(len(binary_events), 7)
+        self.assertEqual(binary_events, csv_events)
+
+    def test_out_of_order(self):
+        write_csv(
+            os.path.join(self.csv_dir, "MSFT.csv"), "MSFT",
+            [self.amzn_rows[1], self.amzn_rows[0]]
+        )
+        self.assertRaises(
+            ValueError, convert_csv_ticks.convert_ticker,
+            self.csv_dir, self.tick_dir, "MSFT"
+        )
+        self.assertEqual(sorted(os.listdir(self.tick_dir)), ["AMZN", "GOOG"])
+
+    def test_rejected_input_keeps_store(self):
+        write_csv(
+            os.path.join(self.csv_dir, "GOOG_20160203.csv"), "GOOG",
+            [self.goog_rows[0]]
+        )
+        self.assertRaises(
+            ValueError, convert_csv_ticks.convert_ticker,
+            self.csv_dir, self.tick_dir, "GOOG", 2
+        )
+        times, bids, asks = open_ticks(self.tick_dir, "GOOG")
+        self.assertEqual(
+            bids.tolist(),
+            [PriceParser.parse(r[1]) for r in self.goog_rows]
+        )
+        self.assertEqual(sorted(os.listdir(self.tick_dir)), ["AMZN", "GOOG"])
+
+    def test_ticker_csv_files(self):
+        csv_dir = os.path.join(self.csv_dir, "files")
+        os.makedirs(csv_dir)
+        for fname in (
+            "GOOG_20170102.csv", "GOOG_20170101.csv",
+            "GOOG_B.csv", "GOOG_X_20170101.csv", "GOOG_201701.csv",
+            "GOOGL.csv", "GOOG_20170103.txt"
+        ):
+            open(os.path.join(csv_dir, fname), "w").close()
+        self.assertEqual(
+            convert_csv_ticks.ticker_csv_files(csv_dir, "GOOG"),
+            ["GOOG_20170101.csv", "GOOG_20170102.csv"]
+        )
+        self.assertEqual(
+            convert_csv_ticks.ticker_csv_files(csv_dir, "GOOG_B"),
+            ["GOOG_B.csv"]
+        )
+        # TICKER.csv, read by HistoricCSVTickPriceHandler, comes first
+        open(os.path.join(csv_dir, "GOOG.csv"), "w").close()
+        self.assertEqual(
+            convert_csv_ticks.ticker_csv_files(csv_dir, "GOOG"),
+            ["GOOG.csv"]
+        )
+
+    def test_data_dir(self):
+        data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        counts = convert_csv_ticks.run(
+            data_dir, self.tick_dir, ["GOOG"], 100000
+        )
+        csv_handler = HistoricCSVTickPriceHandler(
+            data_dir, EventQueue(), ["GOOG"]
+        )
+        self.assertEqual(
+            counts["GOOG"], len(csv_handler.tickers_data["GOOG"])
+        )
+        self.assertEqual(
+            self._stream(BinaryTickPriceHandler(
+                self.tick_dir, EventQueue(), ["GOOG"]
+            )),
+            self._stream(csv_handler)
+        )
+
+    def test_missing_ticker(self):
+        price_handler = BinaryTickPriceHandler(
+            self.tick_dir, EventQueue(), ["GOOG", "MSFT"]
+        )
+        self.assertEqual(list(price_handler.tickers.keys()), ["GOOG"])
+        self.assertEqual(len(price_handler.tick_stream), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
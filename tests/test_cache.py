@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from munch import munchify
+
+from nctrader.event import EventQueue
+from nctrader.price_handler.cache import ParsedDataCache
+from nctrader.price_handler.historic_csv_tick import (
+    HistoricCSVTickPriceHandler
+)
+from nctrader.price_handler.yahoo_daily_csv_bar import (
+    YahooDailyCsvBarPriceHandler
+)
+from nctrader.price_parser import PriceParser
+
+
+def stream(price_handler):
+    events = []
+    while price_handler.continue_backtest:
+        price_handler.stream_next()
+        while not price_handler.events_queue.empty():
+            events.append(str(price_handler.events_queue.get(False)))
+    return events
+
+
+class TestParsedDataCache(unittest.TestCase):
+    """
+    Test the invalidation and LRU eviction of the parsed data
+    cache, and that the CSV price handlers stream the same events
+    with it.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = ParsedDataCache.from_config(munchify({
+            "CACHE_DIR": os.path.join(self.tmp_dir, "cache")
+        }))
+        self.data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self.csv_dir = os.path.join(self.tmp_dir, "csv")
+        os.makedirs(self.csv_dir)
+        for fname in ("SP500TR.csv", "AMZN.csv", "MSFT.csv", "GOOG.csv"):
+            shutil.copy(os.path.join(self.data_dir, fname), self.csv_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_yahoo_bars(self):
+        expected = stream(YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"]
+        ))
+        for _ in range(2):
+            price_handler = YahooDailyCsvBarPriceHandler(
+                self.csv_dir, EventQueue(), ["SP500TR"], cache=self.cache
+            )
+            dft = price_handler.tickers_data["SP500TR"]
+            self.assertEqual(dft["Close"].iloc[0], PriceParser.parse(1132.98999))
+            self.assertEqual(stream(price_handler), expected)
+            self.assertEqual(len(os.listdir(self.cache.cache_dir)), 1)
+
+    def test_ticks(self):
+        tickers = ["AMZN", "MSFT"]
+        expected = stream(HistoricCSVTickPriceHandler(
+            self.csv_dir, EventQueue(), tickers
+        ))
+        for _ in range(2):
+            price_handler = HistoricCSVTickPriceHandler(
+                self.csv_dir, EventQueue(), tickers, cache=self.cache
+            )
+            self.assertEqual(stream(price_handler), expected)
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 2)
+
+    def test_invalidation(self):
+        path = os.path.join(self.csv_dir, "SP500TR.csv")
+        price_handler = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"], cache=self.cache
+        )
+        self.assertIsNotNone(self.cache.load(path, "yahoo_daily_csv_bar"))
+        with open(path) as fd:
+            lines = fd.readlines()
+        with open(path, "w") as fd:
+            fd.writelines(lines[:11])
+        self.assertIsNone(self.cache.load(path, "yahoo_daily_csv_bar"))
+        price_handler = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"], cache=self.cache
+        )
+        self.assertEqual(len(price_handler.tickers_data["SP500TR"]), 10)
+
+    def test_corrupt_entry(self):
+        path = os.path.join(self.csv_dir, "SP500TR.csv")
+        expected = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"], cache=self.cache
+        ).tickers_data["SP500TR"]
+        entry = self.cache.entry_path(path, "yahoo_daily_csv_bar")
+        for garbage in (b"PK\x03\x04 not a zip", b""):
+            with open(entry, "wb") as fd:
+                fd.write(garbage)
+            self.assertIsNone(self.cache.load(path, "yahoo_daily_csv_bar"))
+            self.assertFalse(os.path.exists(entry))
+        # Truncated entries are re-parsed by the price handler
+        with open(entry, "wb") as fd:
+            fd.write(b"PK\x03\x04 not a zip")
+        price_handler = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"], cache=self.cache
+        )
+        self.assertEqual(
+            price_handler.tickers_data["SP500TR"]["Close"].tolist(),
+            expected["Close"].tolist()
+        )
+        self.assertIsNotNone(self.cache.load(path, "yahoo_daily_csv_bar"))
+
+    def test_lru_eviction(self):
+        amzn = os.path.join(self.csv_dir, "AMZN.csv")
+        msft = os.path.join(self.csv_dir, "MSFT.csv")
+        goog = os.path.join(self.csv_dir, "GOOG.csv")
+        HistoricCSVTickPriceHandler(
+            self.csv_dir, EventQueue(), ["AMZN", "MSFT"], cache=self.cache
+        )
+        time.sleep(0.01)
+        # AMZN becomes the most recently used
+        self.assertIsNotNone(self.cache.load(amzn, "historic_csv_tick"))
+        entry_size = self.cache.size() // 2
+        self.cache.max_bytes = self.cache.size() + entry_size // 2
+        time.sleep(0.01)
+        HistoricCSVTickPriceHandler(
+            self.csv_dir, EventQueue(), ["GOOG"], cache=self.cache
+        )
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+        self.assertIsNone(self.cache.load(msft, "historic_csv_tick"))
+        self.assertIsNotNone(self.cache.load(amzn, "historic_csv_tick"))
+        self.assertIsNotNone(self.cache.load(goog, "historic_csv_tick"))
+
+
+if __name__ == "__main__":
+    unittest.main()
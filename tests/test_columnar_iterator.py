@@ -0,0 +1,158 @@
+import unittest
+
+import pandas as pd
+
+from nctrader.price_parser import PriceParser
+from nctrader.price_handler.iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarBarsEventIterator,
+    ColumnarTickEventIterator
+)
+
+
+def ohlcv_frames():
+    """
+    Two tickers' daily bars, with one shared and one
+    distinct timestamp each.
+    """
+    columns = ["Open", "High", "Low", "Close", "Volume", "Adj Close"]
+    goog = pd.DataFrame(
+        [[626.95, 629.51, 624.24, 626.75, 3927000, 313.06],
+         [627.18, 627.84, 621.54, 623.99, 6031900, 311.68]],
+        index=pd.to_datetime(["2010-01-04", "2010-01-05"]),
+        columns=columns
+    )
+    msft = pd.DataFrame(
+        [[30.62, 31.10, 30.59, 30.95, 38409100, 25.12],
+         [30.85, 31.10, 30.64, 30.96, 49749600, 25.13]],
+        index=pd.to_datetime(["2010-01-04", "2010-01-06"]),
+        columns=columns
+    )
+    return goog, msft
+
+
+class TestColumnarBarEventIterator(unittest.TestCase):
+    """
+    Test that two tickers' OHLCV DataFrames are merged into
+    a single time ordered stream of BarEvents, with prices
+    already converted by the PriceParser.
+    """
+    def setUp(self):
+        self.goog, self.msft = ohlcv_frames()
+        self.iterator = ColumnarBarEventIterator(
+            {"GOOG": self.goog, "MSFT": self.msft}, 86400
+        )
+
+    def test_stream_order_and_values(self):
+        """
+        Bars come out ordered by time, with ties kept in
+        subscription order.
+        """
+        bars = list(self.iterator)
+        self.assertEqual(len(bars), 4)
+        self.assertEqual(
+            [(b.ticker, b.time.strftime("%Y-%m-%d")) for b in bars],
+            [("GOOG", "2010-01-04"), ("MSFT", "2010-01-04"),
+             ("GOOG", "2010-01-05"), ("MSFT", "2010-01-06")]
+        )
+        bev = bars[2]
+        self.assertEqual(bev.open_price, PriceParser.parse(627.18))
+        self.assertEqual(bev.high_price, PriceParser.parse(627.84))
+        self.assertEqual(bev.low_price, PriceParser.parse(621.54))
+        self.assertEqual(bev.close_price, PriceParser.parse(623.99))
+        self.assertEqual(bev.adj_close_price, PriceParser.parse(311.68))
+        self.assertEqual(bev.volume, 6031900)
+        self.assertEqual(bev.period, 86400)
+        self.assertIs(type(bev.close_price), int)
+        self.assertIs(type(bev.volume), int)
+
+    def test_without_adj_close(self):
+        iterator = ColumnarBarEventIterator(
+            {"GOOG": self.goog}, 86400,
+            columns=("Open", "High", "Low", "Close", "Volume", None)
+        )
+        bev = next(iterator)
+        self.assertEqual(bev.close_price, PriceParser.parse(626.75))
+        self.assertIsNone(bev.adj_close_price)
+
+    def test_reuse_events(self):
+        """
+        In reuse mode the same, re-initialised, event instance
+        comes out of every next().
+        """
+        iterator = ColumnarBarEventIterator(
+            {"GOOG": self.goog, "MSFT": self.msft}, 86400,
+            reuse_events=True
+        )
+        first = next(iterator)
+        self.assertEqual(first.ticker, "GOOG")
+        second = next(iterator)
+        self.assertIs(second, first)
+        self.assertEqual(second.ticker, "MSFT")
+        self.assertEqual(second.close_price, PriceParser.parse(30.95))
+
+    def test_empty(self):
+        iterator = ColumnarBarEventIterator({}, 86400)
+        self.assertEqual(len(iterator), 0)
+        self.assertRaises(StopIteration, lambda: next(iterator))
+
+
+class TestColumnarBarsEventIterator(unittest.TestCase):
+    """
+    Test that bars sharing a timestamp are grouped into a
+    single cross-sectional BarsEvent.
+    """
+    def setUp(self):
+        self.goog, self.msft = ohlcv_frames()
+
+    def test_grouped_stream(self):
+        iterator = ColumnarBarsEventIterator(
+            {"GOOG": self.goog, "MSFT": self.msft}, 86400
+        )
+        self.assertEqual(len(iterator), 3)
+        groups = list(iterator)
+        self.assertEqual(
+            [g.tickers for g in groups],
+            [["GOOG", "MSFT"], ["GOOG"], ["MSFT"]]
+        )
+        first = groups[0]
+        self.assertEqual(
+            first.close_price.tolist(),
+            [PriceParser.parse(626.75), PriceParser.parse(30.95)]
+        )
+        self.assertEqual(first.volume.tolist(), [3927000, 38409100])
+        self.assertEqual(
+            first.adj_close_price.tolist(),
+            [PriceParser.parse(313.06), PriceParser.parse(25.12)]
+        )
+        bars = list(first.bars())
+        self.assertEqual([b.ticker for b in bars], ["GOOG", "MSFT"])
+        self.assertEqual(bars[1].open_price, PriceParser.parse(30.62))
+        self.assertEqual(bars[1].time, first.time)
+
+    def test_empty_grouped(self):
+        iterator = ColumnarBarsEventIterator({}, 86400)
+        self.assertEqual(len(iterator), 0)
+        self.assertRaises(StopIteration, lambda: next(iterator))
+
+
+class TestColumnarTickEventIterator(unittest.TestCase):
+    def test_stream_order_and_values(self):
+        goog = pd.DataFrame(
+            {"Bid": [683.56, 683.55998], "Ask": [683.58, 683.58002]},
+            index=pd.to_datetime(
+                ["2016-02-01 00:00:01.358", "2016-02-01 00:00:02.544"]
+            )
+        )
+        amzn = pd.DataFrame(
+            {"Bid": [502.10001], "Ask": [502.11999]},
+            index=pd.to_datetime(["2016-02-01 00:00:01.562"])
+        )
+        ticks = list(ColumnarTickEventIterator({"GOOG": goog, "AMZN": amzn}))
+        self.assertEqual([t.ticker for t in ticks], ["GOOG", "AMZN", "GOOG"])
+        self.assertEqual(ticks[1].bid, PriceParser.parse(502.10001))
+        self.assertEqual(ticks[1].ask, PriceParser.parse(502.11999))
+        self.assertEqual(ticks[2].bid, PriceParser.parse(683.55998))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import pickle
+import unittest
+from datetime import datetime
+
+from nctrader.event import EventType, TickEvent, BarEvent, FillEvent
+
+
+class TestSlottedEvents(unittest.TestCase):
+    """
+    Test that events carry no instance __dict__ while keeping
+    their type, priority and readable period.
+    """
+    def setUp(self):
+        self.bev = BarEvent(
+            "GOOG", datetime(2016, 1, 4), 86400,
+            6269500000, 6295100000, 6242400000, 6267500000, 3927000
+        )
+
+    def test_no_instance_dict(self):
+        tev = TickEvent("GOOG", datetime(2016, 1, 4), 6835600000, 6835800000)
+        for event in (tev, self.bev):
+            self.assertFalse(hasattr(event, "__dict__"))
+        self.assertRaises(AttributeError, setattr, tev, "foo", 1)
+
+    def test_type_and_priority(self):
+        fev = FillEvent(None, "GOOG", "BOT", 100, "ARCA", 0, 0, None)
+        self.assertEqual(self.bev.type, EventType.BAR)
+        self.assertEqual(self.bev.typename, "BAR")
+        self.assertEqual(fev.priority, 400)
+        self.assertTrue(self.bev < fev)
+
+    def test_period_readable(self):
+        self.assertEqual(self.bev.period_readable, "1day")
+        self.bev.period = 120
+        self.assertEqual(self.bev.period_readable, "120sec")
+
+    def test_pickle(self):
+        bev = pickle.loads(pickle.dumps(self.bev))
+        self.assertEqual(bev.close_price, 6267500000)
+        self.assertIsNone(bev.adj_close_price)
+
+
+if __name__ == "__main__":
+    unittest.main()
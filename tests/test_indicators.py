@@ -0,0 +1,306 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nctrader.event import EventQueue
+from nctrader.indicators import (
+    ATR, EMA, SMA, Highest, KeyedIndicator, Lowest, PrecomputedIndicators,
+    RollingStd, WilderRSI, atr, ema, highest, lowest, rolling_std, sma,
+    wilder_rsi
+)
+from nctrader.price_handler import GenericPriceHandler
+from nctrader.price_handler.iterator.columnar import ColumnarBarEventIterator
+from nctrader.price_parser import PriceParser
+from nctrader.strategy.base import AbstractStrategy
+from nctrader.trading_session.backtest import Backtest
+
+from test_backtest import (
+    ExecutionHandlerMock, PortfolioHandlerMock, StatisticsMock
+)
+
+
+def pandas_wilder_rsi(series, period=2):
+    """
+    The pandas RSI formerly recomputed per bar by examples/rsi2.py,
+    over the whole series.
+    """
+    delta = series.diff().dropna()
+    u = delta * 0
+    d = u.copy()
+    u[delta > 0] = delta[delta > 0]
+    d[delta < 0] = -delta[delta < 0]
+    u.iloc[period - 1] = np.mean(u.iloc[:period])
+    u = u.iloc[period - 1:]
+    d.iloc[period - 1] = np.mean(d.iloc[:period])
+    d = d.iloc[period - 1:]
+    rs = u.ewm(com=period - 1, adjust=False).mean() / \
+        d.ewm(com=period - 1, adjust=False).mean()
+    return 100 - 100 / (1 + rs)
+
+
+def wilder_atr(df, period):
+    prev_close = df["close"].shift(1)
+    tr = pd.concat([
+        df["high"] - df["low"], (df["high"] - prev_close).abs(),
+        (df["low"] - prev_close).abs()
+    ], axis=1).max(axis=1)
+    tr.iloc[period - 1] = tr.iloc[:period].mean()
+    return tr.iloc[period - 1:].ewm(alpha=1.0 / period, adjust=False).mean()
+
+
+def stream(indicator, values):
+    return [indicator.update(v) for v in values]
+
+
+class TestStreamingIndicators(unittest.TestCase):
+    """
+    Test that the O(1) streaming indicators match their pandas
+    counterparts computed over the whole history.
+    """
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.close = pd.Series(100.0 + np.cumsum(rng.normal(0, 1, 500)))
+        self.high = self.close + rng.uniform(0, 2, 500)
+        self.low = self.close - rng.uniform(0, 2, 500)
+
+    def assertMatches(self, streamed, expected):
+        expected = [None if pd.isnull(x) else x for x in expected]
+        self.assertEqual(len(streamed), len(expected))
+        for s, e in zip(streamed, expected):
+            if e is None:
+                self.assertIsNone(s)
+            else:
+                self.assertAlmostEqual(s, e, places=8)
+
+    def test_sma(self):
+        self.assertMatches(
+            stream(SMA(20), self.close), self.close.rolling(20).mean()
+        )
+
+    def test_sma_price_parser_ints(self):
+        closes = PriceParser.parse_array(self.close.values).tolist()
+        streamed = stream(SMA(20), closes)
+        self.assertEqual(streamed[-1], np.mean(closes[-20:]))
+
+    def test_ema(self):
+        for adjust in (True, False):
+            self.assertMatches(
+                stream(EMA(10, adjust=adjust), self.close),
+                self.close.ewm(span=10, adjust=adjust).mean()
+            )
+
+    def test_wilder_rsi(self):
+        for period in (2, 14):
+            expected = pandas_wilder_rsi(self.close, period)
+            streamed = stream(WilderRSI(period), self.close)
+            self.assertEqual(streamed[:period], [None] * period)
+            self.assertMatches(streamed[period:], expected)
+
+    def test_wilder_rsi_flat(self):
+        rsi = WilderRSI(2)
+        streamed = stream(rsi, [10, 11, 12, 12])
+        self.assertEqual(streamed[:3], [None, None, 100.0])
+        self.assertEqual(streamed[3], 100.0)
+        self.assertTrue(np.isnan(stream(WilderRSI(2), [5, 5, 5])[-1]))
+
+    def test_atr(self):
+        df = pd.DataFrame(
+            {"high": self.high, "low": self.low, "close": self.close}
+        )
+        atr = ATR(14)
+        streamed = [
+            atr.update(h, l, c)
+            for h, l, c in zip(self.high, self.low, self.close)
+        ]
+        self.assertEqual(streamed[:13], [None] * 13)
+        self.assertMatches(streamed[13:], wilder_atr(df, 14))
+
+    def test_rolling_std(self):
+        for ddof in (0, 1):
+            self.assertMatches(
+                stream(RollingStd(20, ddof), self.close),
+                self.close.rolling(20).std(ddof=ddof)
+            )
+
+    def test_rolling_std_large_offset(self):
+        # Compared to a two-pass std, as the values' own precision
+        # is then about 1e-7
+        values = (1e9 + self.close).values
+        streamed = stream(RollingStd(20), values)
+        for i in range(19, len(values)):
+            self.assertAlmostEqual(
+                streamed[i], np.std(values[i - 19:i + 1], ddof=1), places=4
+            )
+
+    def test_highest_lowest(self):
+        for period in (1, 5, 50):
+            self.assertMatches(
+                stream(Highest(period), self.close),
+                self.close.rolling(period).max()
+            )
+            self.assertMatches(
+                stream(Lowest(period), self.close),
+                self.close.rolling(period).min()
+            )
+
+    def test_keyed(self):
+        smas = KeyedIndicator(SMA, 2)
+        self.assertIsNone(smas.value("GOOG"))
+        smas.update("GOOG", 1)
+        smas.update("MSFT", 10)
+        self.assertEqual(smas.update("GOOG", 3), 2)
+        self.assertIsNone(smas.value("MSFT"))
+        self.assertEqual(smas.update("MSFT", 20), 15)
+        self.assertTrue(smas["GOOG"].ready)
+
+
+def ohlcv_frames(n=300, seed=3):
+    rng = np.random.RandomState(seed)
+    frames = {}
+    times = pd.date_range("2015-01-01", periods=n, freq="D")
+    for i, ticker in enumerate(("GOOG", "MSFT")):
+        close = 100.0 + np.cumsum(rng.normal(0, 1, n))
+        # MSFT misses every third day
+        keep = slice(None) if i == 0 else (np.arange(n) % 3 != 0)
+        frames[ticker] = pd.DataFrame({
+            "Open": close + rng.normal(0, 0.5, n),
+            "High": close + rng.uniform(0.5, 2, n),
+            "Low": close - rng.uniform(0.5, 2, n),
+            "Close": close, "Volume": rng.randint(100, 1000, n),
+            "Adj Close": close
+        }, index=times)[keep]
+    return frames
+
+
+class TestVectorizedIndicators(unittest.TestCase):
+    """
+    Test that the vectorized indicators compute the same values
+    as the streaming ones.
+    """
+    def setUp(self):
+        rng = np.random.RandomState(11)
+        self.close = PriceParser.parse_array(
+            100.0 + np.cumsum(rng.normal(0, 1, 300))
+        )
+        self.high = self.close + PriceParser.parse_array(rng.uniform(0, 2, 300))
+        self.low = self.close - PriceParser.parse_array(rng.uniform(0, 2, 300))
+
+    def assertSame(self, vectorized, streamed):
+        self.assertEqual(len(vectorized), len(streamed))
+        for v, s in zip(vectorized, streamed):
+            if s is None:
+                self.assertTrue(np.isnan(v))
+            else:
+                self.assertLessEqual(abs(v - s), 1e-9 * max(abs(s), 1.0))
+
+    def test_against_streaming(self):
+        closes = self.close.tolist()
+        for function, indicator in (
+            (lambda v: sma(v, 20), SMA(20)),
+            (lambda v: ema(v, 20), EMA(20)),
+            (lambda v: ema(v, 20, adjust=False), EMA(20, adjust=False)),
+            (lambda v: wilder_rsi(v, 2), WilderRSI(2)),
+            (lambda v: wilder_rsi(v, 14), WilderRSI(14)),
+            (lambda v: rolling_std(v, 20), RollingStd(20)),
+            (lambda v: highest(v, 20), Highest(20)),
+            (lambda v: lowest(v, 20), Lowest(20)),
+        ):
+            self.assertSame(function(self.close), stream(indicator, closes))
+
+    def test_atr(self):
+        indicator = ATR(14)
+        streamed = [
+            indicator.update(h, l, c) for h, l, c in zip(
+                self.high.tolist(), self.low.tolist(), self.close.tolist()
+            )
+        ]
+        self.assertSame(atr(self.high, self.low, self.close, 14), streamed)
+
+
+class IndicatorStrategy(AbstractStrategy):
+    """
+    Reads the precomputed RSI and SMA on every bar, along with
+    the same indicators streamed from the bars themselves.
+    """
+    def __init__(self):
+        self.rsi = KeyedIndicator(WilderRSI, 2)
+        self.sma = KeyedIndicator(SMA, 10)
+        self.seen = []
+
+    def declare_indicators(self, indicators):
+        self.indicators = indicators
+        indicators.add("rsi", wilder_rsi, "close", period=2)
+        indicators.add("sma", sma, "adj_close", tickers=["MSFT"], period=10)
+
+    def on_bar(self, event):
+        self.seen.append((
+            event.ticker,
+            self.rsi.update(event.ticker, event.close_price),
+            self.indicators.value("rsi", event.ticker),
+            self.sma.update(event.ticker, event.adj_close_price),
+            self.indicators.value("sma", "MSFT")
+            if event.ticker == "MSFT" else None,
+            self.indicators.history("rsi", event.ticker, 3)
+        ))
+
+    def on_tick(self, event):
+        pass
+
+
+class TestPrecomputedIndicators(unittest.TestCase):
+    """
+    Test that indicators precomputed by the backtest read back,
+    bar by bar, exactly as if computed from the bars streamed so
+    far.
+    """
+    def test_backtest(self):
+        events_queue = EventQueue()
+        price_handler = GenericPriceHandler(
+            events_queue, ColumnarBarEventIterator(ohlcv_frames(), 86400)
+        )
+        strategy = IndicatorStrategy()
+        backtest = Backtest(
+            price_handler, strategy, PortfolioHandlerMock(events_queue),
+            ExecutionHandlerMock(events_queue), None, None,
+            StatisticsMock(), 0
+        )
+        self.assertIs(strategy.indicators, backtest.indicators)
+        self.assertIsNone(backtest.indicators.value("rsi", "GOOG"))
+        backtest._run_backtest()
+
+        self.assertEqual(len(strategy.seen), 500)
+        rsis = {"GOOG": [], "MSFT": []}
+        for ticker, rsi, pre_rsi, ma, pre_ma, history in strategy.seen:
+            rsis[ticker].append(pre_rsi)
+            if rsi is None:
+                self.assertIsNone(pre_rsi)
+            else:
+                self.assertAlmostEqual(pre_rsi, rsi, places=9)
+            if ticker == "MSFT":
+                if ma is None:
+                    self.assertIsNone(pre_ma)
+                else:
+                    self.assertAlmostEqual(pre_ma, ma, places=6)
+            # The history ends with the current bar's value
+            self.assertLessEqual(len(history), 3)
+            if pre_rsi is not None:
+                self.assertAlmostEqual(history[-1], pre_rsi, places=9)
+        self.assertIsNotNone(rsis["MSFT"][-1])
+        self.assertRaises(KeyError, backtest.indicators.value, "sma", "GOOG")
+
+    def test_read_only(self):
+        price_handler = GenericPriceHandler(
+            EventQueue(), ColumnarBarEventIterator(ohlcv_frames(), 86400)
+        )
+        indicators = PrecomputedIndicators(price_handler)
+        indicators.add("hh", highest, "high", period=5)
+        indicators.compute()
+        price_handler.stream_next()
+        history = indicators.history("hh", "GOOG", 10)
+        self.assertEqual(len(history), 1)
+        self.assertRaises(ValueError, history.__setitem__, 0, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
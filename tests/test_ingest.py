@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from nctrader.event import EventQueue
+from nctrader.price_handler.historic_csv_tick import HistoricCSVTickPriceHandler
+from nctrader.price_handler.sqlite_bar import SqliteBarPriceHandler
+from nctrader.price_handler.sqlite_db import db_session
+from nctrader.price_handler.yahoo_daily_csv_bar import (
+    YahooDailyCsvBarPriceHandler
+)
+from nctrader.scripts import ingest_prices
+
+
+class TestIngestPrices(unittest.TestCase):
+    """
+    Test the bulk ingestion of vendor CSVs into the sqlite schema
+    and the migration adding its indexes.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_uri = "sqlite:///%s" % os.path.join(self.tmp_dir, "prices.db")
+        self.csv_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+
+    def tearDown(self):
+        db_session.remove()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_ingest_bars(self):
+        counts = ingest_prices.run(
+            self.db_uri, self.csv_dir, ["SP500TR"], "bar", "sqlite",
+            "CSI", "NYSE", "D", 500
+        )
+        csv_handler = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"]
+        )
+        self.assertEqual(
+            counts["SP500TR"], len(csv_handler.tickers_data["SP500TR"])
+        )
+
+        price_handler = SqliteBarPriceHandler(
+            self.db_uri, EventQueue(), ["SP500TR"]
+        )
+        self.assertEqual(
+            price_handler.tickers["SP500TR"]["close"],
+            csv_handler.tickers["SP500TR"]["close"]
+        )
+        self.assertEqual(price_handler.tickers_info["SP500TR"].type, "STK")
+        csv_closes = []
+        sql_closes = []
+        for handler, closes in (
+            (csv_handler, csv_closes), (price_handler, sql_closes)
+        ):
+            while handler.continue_backtest:
+                handler.stream_next()
+                while not handler.events_queue.empty():
+                    bev = handler.events_queue.get(False)
+                    closes.append((bev.time, bev.close_price, bev.volume))
+        self.assertEqual(sql_closes, csv_closes)
+
+    def test_ingest_ticks(self):
+        counts = ingest_prices.run(
+            self.db_uri, self.csv_dir, ["AMZN"], "tick", "sqlite",
+            "CSI", "NYSE", "D", 1000
+        )
+        engine = create_engine(self.db_uri)
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT COUNT(*) FROM tick_data")).scalar()
+        engine.dispose()
+        self.assertEqual(rows, counts["AMZN"])
+        self.assertEqual(rows, 10)
+
+    def test_ingest_ticks_of_csv_handler(self):
+        # GOOG.csv (2016) is ingested, not the daily 2014 GOOG files
+        counts = ingest_prices.run(
+            self.db_uri, self.csv_dir, ["GOOG"], "tick", "sqlite",
+            "CSI", "NYSE", "D", 1000
+        )
+        csv_handler = HistoricCSVTickPriceHandler(
+            self.csv_dir, EventQueue(), ["GOOG"]
+        )
+        self.assertEqual(counts["GOOG"], len(csv_handler.tickers_data["GOOG"]))
+        engine = create_engine(self.db_uri)
+        with engine.connect() as conn:
+            first, last = conn.execute(text(
+                "SELECT MIN(timestamp), MAX(timestamp) FROM tick_data"
+            )).fetchone()
+        engine.dispose()
+        self.assertTrue(first.startswith("2016-02-01"))
+        self.assertTrue(last.startswith("2016-02-01"))
+
+    def test_migrate(self):
+        engine = create_engine(self.db_uri)
+        models = ingest_prices.schema_models("sqlite")[0]
+        self.assertEqual(
+            sorted(ingest_prices.migrate(engine, models)), []
+        )
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX bar_data_ix1"))
+        self.assertEqual(
+            ingest_prices.migrate(engine, models), ["bar_data_ix1"]
+        )
+        self.assertEqual(ingest_prices.migrate(engine, models), [])
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import unittest
+
+from nctrader.event import EventQueue
+from nctrader.price_handler.historic_csv_tick import (
+    HistoricCSVTickPriceHandler
+)
+from nctrader.price_handler.iterator.columnar import ColumnarBarEventIterator
+from nctrader.price_handler.iterator.merge import (
+    ChunkedBarEventIterator, merge_sorted
+)
+from nctrader.price_handler.yahoo_daily_csv_bar import (
+    YahooDailyCsvBarPriceHandler
+)
+
+from test_columnar_iterator import ohlcv_frames
+
+
+def frame_chunks(df, size):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+class TestMergeSorted(unittest.TestCase):
+    """
+    Test the lazy k-way merge of several tickers' blocks.
+    """
+    def test_order_and_ties(self):
+        a = [([1, 3], ["a1", "a3"]), ([3, 5], ["a3b", "a5"])]
+        b = [([], []), ([2, 3], ["b2", "b3"])]
+        merged = list(merge_sorted([iter(a), iter(b)]))
+        self.assertEqual(
+            [(rank, row) for rank, key, row in merged],
+            [(0, "a1"), (1, "b2"), (0, "a3"), (0, "a3b"),
+             (1, "b3"), (0, "a5")]
+        )
+        self.assertEqual([key for _, key, _ in merged], [1, 2, 3, 3, 3, 5])
+
+    def test_out_of_order(self):
+        blocks = [([1, 4], ["x", "y"]), ([2], ["z"])]
+        self.assertRaises(ValueError, list, merge_sorted([iter(blocks)]))
+
+    def test_lazy(self):
+        def blocks():
+            yield [1, 2], ["first", "second"]
+            raise AssertionError("read too far")
+        self.assertEqual(next(merge_sorted([blocks()])), (0, 1, "first"))
+
+
+class TestChunkedBarEventIterator(unittest.TestCase):
+    """
+    Test that chunked DataFrames stream the same BarEvents as
+    the in-memory ColumnarBarEventIterator.
+    """
+    def test_same_as_columnar(self):
+        goog, msft = ohlcv_frames()
+        expected = [
+            str(e) for e in ColumnarBarEventIterator(
+                {"GOOG": goog, "MSFT": msft}, 86400
+            )
+        ]
+        chunked = [
+            str(e) for e in ChunkedBarEventIterator(
+                {"GOOG": frame_chunks(goog, 1), "MSFT": frame_chunks(msft, 3)},
+                86400
+            )
+        ]
+        self.assertEqual(chunked, expected)
+
+
+class TestChunkedCsvPriceHandlers(unittest.TestCase):
+    """
+    Test that the chunked CSV price handlers stream the same
+    events as the ones loading the whole CSVs.
+    """
+    def setUp(self):
+        self.csv_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+
+    def _stream(self, price_handler):
+        events = []
+        while price_handler.continue_backtest:
+            price_handler.stream_next()
+            while not price_handler.events_queue.empty():
+                events.append(str(price_handler.events_queue.get(False)))
+        return events
+
+    def test_yahoo_daily_bars(self):
+        full = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"]
+        )
+        chunked = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"], chunksize=100
+        )
+        self.assertEqual(chunked.tickers, full.tickers)
+        self.assertNotIn("SP500TR", chunked.tickers_data)
+        events = self._stream(chunked)
+        self.assertGreater(len(events), 100)
+        self.assertEqual(events, self._stream(full))
+
+    def test_historic_ticks(self):
+        tickers = ["GOOG", "AMZN", "MSFT"]
+        full = HistoricCSVTickPriceHandler(self.csv_dir, EventQueue(), tickers)
+        chunked = HistoricCSVTickPriceHandler(
+            self.csv_dir, EventQueue(), tickers, chunksize=7
+        )
+        self.assertEqual(chunked.tickers, full.tickers)
+        events = self._stream(chunked)
+        self.assertGreater(len(events), 7)
+        self.assertEqual(events, self._stream(full))
+
+
+if __name__ == "__main__":
+    unittest.main()
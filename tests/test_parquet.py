@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from nctrader.event import EventQueue
+from nctrader.price_handler.historic_csv_tick import (
+    HistoricCSVTickPriceHandler
+)
+from nctrader.price_handler.yahoo_daily_csv_bar import (
+    YahooDailyCsvBarPriceHandler
+)
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+if pyarrow is not None:
+    from nctrader.price_handler.parquet import (
+        ParquetBarPriceHandler, ParquetTickPriceHandler
+    )
+    from nctrader.scripts import convert_to_parquet
+
+
+def stream(price_handler):
+    events = []
+    while price_handler.continue_backtest:
+        price_handler.stream_next()
+        while not price_handler.events_queue.empty():
+            events.append(str(price_handler.events_queue.get(False)))
+    return events
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestParquetPriceHandlers(unittest.TestCase):
+    """
+    Test that prices converted to a Parquet dataset stream as the
+    CSV handlers stream the original CSVs.
+    """
+    def setUp(self):
+        self.csv_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self.dataset_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dataset_dir)
+
+    def _convert(self, tickers, kind):
+        return convert_to_parquet.run(
+            "csv", self.csv_dir, "", self.dataset_dir, tickers, kind,
+            "CSI", "D", 4
+        )
+
+    def test_bars(self):
+        counts = self._convert(["SP500TR"], "bar")
+        self.assertTrue(os.path.isdir(os.path.join(
+            self.dataset_dir, "ticker=SP500TR", "year=2010"
+        )))
+        price_handler = ParquetBarPriceHandler(
+            self.dataset_dir, EventQueue(), ["SP500TR"]
+        )
+        csv_handler = YahooDailyCsvBarPriceHandler(
+            self.csv_dir, EventQueue(), ["SP500TR"]
+        )
+        self.assertEqual(price_handler.tickers, csv_handler.tickers)
+        events = stream(price_handler)
+        self.assertEqual(len(events), counts["SP500TR"])
+        self.assertEqual(events, stream(csv_handler))
+
+    def test_date_window(self):
+        self._convert(["SP500TR"], "bar")
+        price_handler = ParquetBarPriceHandler(
+            self.dataset_dir, EventQueue(), ["SP500TR"],
+            start_date=datetime(2011, 12, 30), end_date=datetime(2012, 1, 5)
+        )
+        dft = price_handler.tickers_data["SP500TR"]
+        self.assertEqual(
+            [t.strftime("%Y-%m-%d") for t in dft.index],
+            ["2011-12-30", "2012-01-03", "2012-01-04", "2012-01-05"]
+        )
+
+    def test_ticks(self):
+        self._convert(["GOOG", "AMZN", "MSFT"], "tick")
+        price_handler = ParquetTickPriceHandler(
+            self.dataset_dir, EventQueue(), ["GOOG", "AMZN", "MSFT", "IBM"]
+        )
+        self.assertEqual(
+            sorted(price_handler.tickers), ["AMZN", "GOOG", "MSFT"]
+        )
+        csv_handler = HistoricCSVTickPriceHandler(
+            self.csv_dir, EventQueue(), ["AMZN", "MSFT"]
+        )
+        price_handler = ParquetTickPriceHandler(
+            self.dataset_dir, EventQueue(), ["AMZN", "MSFT"]
+        )
+        self.assertEqual(stream(price_handler), stream(csv_handler))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nctrader.statistics.performance import aggregate_returns, create_drawdowns
+
+
+def loop_drawdowns(returns):
+    """
+    The former, loop based, create_drawdowns.
+    """
+    hwm = [0]
+    idx = returns.index
+    drawdown = pd.Series(np.nan, index=idx)
+    duration = pd.Series(np.nan, index=idx)
+    for t in range(1, len(idx)):
+        hwm.append(max(hwm[t - 1], returns.iloc[t]))
+        drawdown.iloc[t] = (hwm[t] - returns.iloc[t]) / hwm[t]
+        duration.iloc[t] = (
+            0 if drawdown.iloc[t] == 0 else duration.iloc[t - 1] + 1
+        )
+    return drawdown, drawdown.max(), duration.max(), duration
+
+
+class TestCreateDrawdowns(unittest.TestCase):
+    """
+    Test that the vectorized drawdowns are identical to the loop
+    based ones, and the table of drawdown periods.
+    """
+    def test_same_as_loop(self):
+        rng = np.random.RandomState(5)
+        for n in (0, 1, 2, 10, 1000):
+            returns = pd.Series(
+                np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+                index=pd.date_range("2010-01-01", periods=n, freq="min")
+            )
+            # Flat stretches and a first period below the second
+            if n > 5:
+                returns.iloc[3:6] = returns.iloc[2]
+            expected = loop_drawdowns(returns)
+            drawdown, dd_max, dd_dur = create_drawdowns(returns)
+            pd.testing.assert_series_equal(drawdown, expected[0])
+            self.assertTrue(
+                np.isnan(dd_max) and np.isnan(expected[1]) or
+                dd_max == expected[1]
+            )
+            self.assertTrue(
+                np.isnan(dd_dur) and np.isnan(expected[2]) or
+                dd_dur == expected[2]
+            )
+
+    def test_duration_series(self):
+        returns = pd.Series(
+            [1.0, 1.1, 1.0, 1.2, 1.1, 1.05, 1.3, 1.2],
+            index=pd.date_range("2016-01-01", periods=8)
+        )
+        drawdown, dd_max, dd_dur, periods = create_drawdowns(
+            returns, with_periods=True
+        )
+        self.assertEqual(dd_dur, 2)
+        self.assertAlmostEqual(dd_max, 0.125)
+        self.assertEqual(
+            periods["start"].tolist(),
+            [pd.Timestamp(d) for d in ("2016-01-02", "2016-01-04", "2016-01-07")]
+        )
+        self.assertEqual(
+            periods["trough"].tolist(),
+            [pd.Timestamp(d) for d in ("2016-01-03", "2016-01-06", "2016-01-08")]
+        )
+        self.assertEqual(
+            periods["recovery"].tolist()[:2],
+            [pd.Timestamp("2016-01-04"), pd.Timestamp("2016-01-07")]
+        )
+        self.assertTrue(pd.isnull(periods["recovery"].iloc[2]))
+        self.assertEqual(periods["duration"].tolist(), [1, 2, 1])
+        self.assertAlmostEqual(periods["depth"].iloc[1], 0.125)
+        self.assertAlmostEqual(periods["depth"].max(), dd_max)
+
+    def test_no_drawdown(self):
+        returns = pd.Series(
+            [1.0, 1.1, 1.2], index=pd.date_range("2016-01-01", periods=3)
+        )
+        periods = create_drawdowns(returns, with_periods=True)[3]
+        self.assertEqual(len(periods), 0)
+        self.assertEqual(
+            list(periods.columns),
+            ["start", "trough", "recovery", "depth", "duration"]
+        )
+
+
+class TestAggregateReturns(unittest.TestCase):
+    def test_same_as_compounding_per_group(self):
+        rng = np.random.RandomState(9)
+        returns = pd.Series(
+            rng.normal(0, 0.01, 900),
+            index=pd.date_range("2015-12-20", periods=900, freq="D")
+        )
+        for convert_to, keys in (
+            ("weekly", [lambda x: x.year, lambda x: x.month,
+                        lambda x: x.isocalendar()[1]]),
+            ("monthly", [lambda x: x.year, lambda x: x.month]),
+            ("yearly", [lambda x: x.year]),
+        ):
+            expected = returns.groupby(keys).apply(
+                lambda x: np.exp(np.log(1 + x).cumsum()).iloc[-1] - 1
+            )
+            aggregated = aggregate_returns(returns, convert_to)
+            self.assertEqual(list(aggregated.index), list(expected.index))
+            np.testing.assert_allclose(
+                aggregated.values, expected.values, rtol=1e-12, atol=1e-15
+            )
+        self.assertRaises(ValueError, aggregate_returns, returns, "daily")
+
+
+if __name__ == "__main__":
+    unittest.main()
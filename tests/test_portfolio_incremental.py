@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+from munch import Munch
+
+from nctrader.portfolio import Portfolio
+from nctrader.price_parser import PriceParser
+from nctrader.price_handler.base import AbstractBarPriceHandler
+
+
+class PriceHandlerMock(AbstractBarPriceHandler):
+    def __init__(self, tickers):
+        self.tickers = {}
+        self.tickers_info = {}
+        for ticker in tickers:
+            self.tickers[ticker] = {}
+            self.tickers_info[ticker] = Munch(
+                type="STK", margin=0, big_point_value=1
+            )
+
+    def set_close(self, ticker, close, timestamp):
+        self.tickers[ticker]["close"] = PriceParser.parse(close)
+        self.tickers[ticker]["timestamp"] = timestamp
+
+
+class TestIncrementalValuation(unittest.TestCase):
+    """
+    Test that re-marking only the positions whose prices just
+    changed gives the same equity and unrealised PnL, to the
+    unit, as revaluing every position after each update.
+    """
+    def test_matches_full_revaluation(self):
+        tickers = ["AMZN", "GOOG", "MSFT", "XOM"]
+        rs = np.random.RandomState(7)
+        price_handlers = [PriceHandlerMock(tickers), PriceHandlerMock(tickers)]
+        cash = PriceParser.parse(500000.00)
+        incremental, full = [Portfolio(ph, cash) for ph in price_handlers]
+        closes = dict((ticker, 100.0) for ticker in tickers)
+        timestamp = datetime(2016, 1, 4)
+        for ticker in tickers:
+            for ph in price_handlers:
+                ph.set_close(ticker, closes[ticker], timestamp)
+
+        for i in range(500):
+            timestamp += timedelta(minutes=1)
+            ticker = tickers[rs.randint(len(tickers))]
+            closes[ticker] = round(closes[ticker] + rs.normal(), 2)
+            for ph in price_handlers:
+                ph.set_close(ticker, closes[ticker], timestamp)
+            incremental._update_portfolio([ticker])
+            full._update_portfolio()
+
+            if rs.rand() < 0.2:
+                action = "BOT" if rs.rand() < 0.5 else "SLD"
+                quantity = int(rs.randint(1, 4)) * 100
+                price = PriceParser.parse(closes[ticker])
+                for portfolio in (incremental, full):
+                    portfolio.transact_position(
+                        action, ticker, quantity, price,
+                        PriceParser.parse(1.00), timestamp, None
+                    )
+
+            self.assertEqual(incremental.equity, full.equity)
+            self.assertEqual(incremental.unrealised_pnl, full.unrealised_pnl)
+            self.assertEqual(incremental.realised_pnl, full.realised_pnl)
+
+        self.assertTrue(len(full.closed_positions) > 0)
+        for ticker in incremental.positions:
+            self.assertEqual(
+                incremental.positions[ticker].time_in_pos,
+                full.positions[ticker].time_in_pos
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+from nctrader.position import LotLedger, Position
+from nctrader.price_parser import PriceParser
+
+
+class TestLotLedger(unittest.TestCase):
+    """
+    Test that the ledger aggregates follow lots being added
+    and closed out in FIFO order.
+    """
+    def test_fifo_close_out(self):
+        lots = LotLedger()
+        lots.append(100, 10, 4, 1004)
+        lots.append(50, 20, 2, 1002)
+        self.assertEqual(lots.open_quantity, 150)
+        self.assertEqual(lots.cost_basis(1), 100 * 10 + 50 * 20 + 4 + 2)
+
+        lots.close_head(100)
+        self.assertEqual(lots.head, 1)
+        lots.close_head(25)
+        self.assertEqual(lots.head, 1)
+        self.assertEqual(lots.open_quantity, 25)
+        self.assertEqual(lots.cost_basis(1), 25 * 20 + 1)
+        self.assertEqual(lots.cost_basis(-1), -25 * 20 + 1)
+
+        lots.close_head(25)
+        self.assertEqual(lots.head, 2)
+        self.assertEqual(lots.cost_basis(1), 0)
+        lots.append(10, 30, 1, 301)
+        self.assertEqual(lots.cost_basis(1), 10 * 30 + 1)
+        self.assertEqual(lots.total_quantity, 160)
+        self.assertEqual(lots.total_init_cost, 1004 + 1002 + 301)
+        self.assertEqual(
+            lots.lots()[1],
+            {'quantity': 50, 'remaining_qty': 0, 'price': 20,
+             'comm': 2, 'init_cost': 1002}
+        )
+
+
+class TestPartialFillsSPYPosition(unittest.TestCase):
+    """
+    Test a long SPY position built from two lots, partially
+    closed out across both of them and then closed.
+    """
+    def setUp(self):
+        self.position = Position(
+            "BOT", "SPY", "STK", 0, 100,
+            PriceParser.parse(220.45), PriceParser.parse(1.00),
+            PriceParser.parse(220.45), PriceParser.parse(220.47), 0
+        )
+
+    def test_partial_close_out(self):
+        self.position.transact_shares(
+            "BOT", 50, PriceParser.parse(221.10), PriceParser.parse(1.00)
+        )
+        self.position.transact_shares(
+            "SLD", 120, PriceParser.parse(222.30), PriceParser.parse(1.20)
+        )
+        self.position.update_market_value(
+            PriceParser.parse(222.00), PriceParser.parse(222.02), 2
+        )
+        self.assertEqual(self.position.quantity, 150)
+        self.assertEqual(self.position.open_quantity, 30)
+        self.assertEqual(
+            PriceParser.display(self.position.entry_price, 5), 220.68
+        )
+        self.assertEqual(
+            PriceParser.display(self.position.exit_price, 5), 222.29
+        )
+        # 30 * 221.10 plus 30/50 of the second lot's commission
+        self.assertEqual(
+            PriceParser.display(self.position.cost_basis, 5), 6633.60
+        )
+        self.assertEqual(
+            PriceParser.display(self.position.market_value, 5), 6660.00
+        )
+        self.assertEqual(
+            PriceParser.display(self.position.unrealised_pnl), 26.40
+        )
+        # 100 * 1.85 - 1.00 + 20 * 1.20 - 0.40 - 1.20
+        self.assertEqual(
+            PriceParser.display(self.position.realised_pnl), 206.40
+        )
+        self.assertEqual(self.position.bots.head, 1)
+
+        self.position.transact_shares(
+            "SLD", 30, PriceParser.parse(223.00), PriceParser.parse(1.00)
+        )
+        self.position.update_market_value(
+            PriceParser.parse(223.00), PriceParser.parse(223.02), 3
+        )
+        self.assertEqual(self.position.open_quantity, 0)
+        self.assertEqual(self.position.cost_basis, 0)
+        self.assertEqual(self.position.market_value, 0)
+        self.assertEqual(
+            PriceParser.display(self.position.realised_pnl), 261.80
+        )
+        self.assertEqual(
+            PriceParser.display(self.position.total_commission), 4.20
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from munch import Munch
+
+from nctrader.event import EventQueue
+from nctrader.price_handler.iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarTickEventIterator
+)
+from nctrader.price_handler.store import PriceStore
+
+from test_columnar_iterator import ohlcv_frames
+
+
+class TestPriceStore(unittest.TestCase):
+    """
+    Test that iterators attached to a PriceStore stream the same
+    events as the iterator it was written from, straight from
+    the memory mapped arrays.
+    """
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        goog, msft = ohlcv_frames()
+        self.tickers_data = {"GOOG": goog, "MSFT": msft}
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_bars(self):
+        iterator = ColumnarBarEventIterator(self.tickers_data, 86400)
+        PriceStore.write(
+            self.path, iterator, {"GOOG": Munch(
+                type="STK", margin=0, big_point_value=1, tick_size=0.01
+            )}
+        )
+        store = PriceStore.attach(self.path)
+        self.assertIsInstance(store.values, np.memmap)
+        attached = store.iterator()
+        self.assertTrue(np.shares_memory(attached.values, store.values))
+        self.assertTrue(np.shares_memory(attached.index.values, store.times))
+        self.assertEqual(
+            [str(e) for e in attached], [str(e) for e in iterator.copy()]
+        )
+        self.assertEqual(store.tickers_info["GOOG"].big_point_value, 1)
+
+        grouped = store.iterator(group_bars=True)
+        self.assertEqual(len(grouped), 3)
+        self.assertEqual(next(grouped).tickers, ["GOOG", "MSFT"])
+
+    def test_price_handler(self):
+        PriceStore.write(
+            self.path, ColumnarBarEventIterator(self.tickers_data, 86400)
+        )
+        store = PriceStore.attach(self.path)
+        handlers = [store.price_handler(EventQueue()) for i in range(2)]
+        for price_handler in handlers:
+            while price_handler.continue_backtest:
+                price_handler.stream_next()
+            self.assertEqual(
+                price_handler.get_last_close("MSFT"), 309600000
+            )
+            self.assertEqual(len(price_handler.events_queue), 4)
+
+    def test_ticks_with_timezone(self):
+        index = pd.DatetimeIndex(
+            ["2016-02-01 09:30:01.358", "2016-02-01 09:30:02.544"],
+            tz="US/Eastern"
+        )
+        goog = pd.DataFrame(
+            {"Bid": [683.56, 683.55998], "Ask": [683.58, 683.58002]},
+            index=index
+        )
+        iterator = ColumnarTickEventIterator({"GOOG": goog})
+        store = PriceStore.write(self.path, iterator)
+        self.assertTrue(store.istick())
+        ticks = list(store.iterator())
+        self.assertEqual(ticks[1].time, index[1])
+        self.assertEqual(ticks[1].bid, iterator.values[1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nctrader.price_parser import PriceParser
+
+
+class TestPriceParserArray(unittest.TestCase):
+    """
+    Test that the vectorized parse_array/display_array methods
+    agree with the scalar parse/display methods.
+    """
+    def setUp(self):
+        self.floats = np.array([10.1234567, 0.1, 683.55998, -2.5, 0.0])
+
+    def test_parse_array_matches_parse(self):
+        parsed = PriceParser.parse_array(self.floats)
+        self.assertEqual(parsed.dtype, np.int64)
+        self.assertEqual(
+            parsed.tolist(), [PriceParser.parse(float(x)) for x in self.floats]
+        )
+
+    def test_parse_array_int_passthrough(self):
+        parsed = PriceParser.parse_array(np.array([200, 300], dtype=np.int32))
+        self.assertEqual(parsed.dtype, np.int64)
+        self.assertEqual(parsed.tolist(), [200, 300])
+
+    def test_parse_array_strings(self):
+        parsed = PriceParser.parse_array(np.array(["10.1234567", "0.1"]))
+        self.assertEqual(parsed.tolist(), [101234567, 1000000])
+
+    def test_parse_array_pandas(self):
+        index = pd.date_range("2016-01-01", periods=5)
+        s = pd.Series(self.floats, index=index, name="Close")
+        parsed = PriceParser.parse_array(s)
+        self.assertIsInstance(parsed, pd.Series)
+        self.assertEqual(parsed.name, "Close")
+        self.assertTrue(parsed.index.equals(index))
+        self.assertEqual(parsed.iloc[0], 101234567)
+
+        df = pd.DataFrame({"Bid": self.floats, "Ask": self.floats + 0.02})
+        parsed = PriceParser.parse_array(df)
+        self.assertEqual(list(parsed.columns), ["Bid", "Ask"])
+        self.assertTrue((parsed.dtypes == np.int64).all())
+
+    def test_parse_array_errors(self):
+        self.assertRaises(
+            ValueError, PriceParser.parse_array, np.array([1.0, np.nan])
+        )
+        self.assertRaises(
+            OverflowError, PriceParser.parse_array, np.array([1.0, 1e12])
+        )
+
+    def test_display_array(self):
+        parsed = PriceParser.parse_array(self.floats)
+        displayed = PriceParser.display_array(parsed)
+        self.assertEqual(
+            displayed.tolist(),
+            [PriceParser.display(x) for x in parsed.tolist()]
+        )
+        displayed = PriceParser.display_array(pd.Series(parsed), 2)
+        self.assertEqual(displayed.iloc[0], 10.12)
+
+
+if __name__ == "__main__":
+    unittest.main()
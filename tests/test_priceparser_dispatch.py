@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from nctrader.price_parser import PriceParser
+
+
+class TestPriceParserDispatch(unittest.TestCase):
+    """
+    Test the type keyed dispatch of PriceParser.parse and
+    PriceParser.display, including NumPy scalar types.
+    """
+    def test_parse_numpy_scalars(self):
+        self.assertEqual(PriceParser.parse(np.float64(10.1234567)), 101234567)
+        self.assertIs(type(PriceParser.parse(np.float64(10.5))), int)
+        self.assertEqual(PriceParser.parse(np.int64(200)), 200)
+        self.assertEqual(PriceParser.parse(np.int32(200)), 200)
+        self.assertEqual(PriceParser.parse(np.float32(1.5)), 15000000)
+        self.assertEqual(PriceParser.parse("10.5"), 105000000)
+
+    def test_display(self):
+        self.assertEqual(PriceParser.display(101234567), 10.123457)
+        self.assertEqual(PriceParser.display(101234567, 2), 10.12)
+        self.assertEqual(PriceParser.display(np.int64(101234567)), 10.123457)
+        self.assertEqual(PriceParser.display(np.int32(5000000)), 0.5)
+        # Plain floats are displayed as is, NumPy floats are parsed units
+        self.assertEqual(PriceParser.display(10.1234567), 10.123457)
+        self.assertEqual(PriceParser.display(np.float64(101234567.0)), 10.123457)
+        self.assertEqual(PriceParser.display(101234567.0, 2), 10.12)
+
+    def test_unsupported_type(self):
+        self.assertRaises(NotImplementedError, PriceParser.parse, None)
+        self.assertRaises(NotImplementedError, PriceParser.display, "10.5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import os
+import unittest
+
+import pandas as pd
+
+from nctrader.event import BarEvent, EventQueue, TickEvent
+from nctrader.price_handler.generic import GenericPriceHandler
+from nctrader.price_handler.historic_csv_tick import (
+    HistoricCSVTickPriceHandler
+)
+from nctrader.price_handler.iterator.columnar import ColumnarBarEventIterator
+from nctrader.price_handler.resample import (
+    BarAggregator, ResampledBarPriceHandler, bar_period
+)
+from nctrader.price_parser import PriceParser
+
+
+def stream(price_handler):
+    events = []
+    while price_handler.continue_backtest:
+        price_handler.stream_next()
+        while not price_handler.events_queue.empty():
+            events.append(str(price_handler.events_queue.get(False)))
+    return events
+
+
+def minute_frames():
+    """
+    Two tickers' one minute bars from 09:58 to 10:06, MSFT
+    missing 10:03.
+    """
+    columns = ["Open", "High", "Low", "Close", "Volume", "Adj Close"]
+    times = pd.date_range("2016-01-04 09:58", periods=9, freq="min")
+    goog = pd.DataFrame(
+        [[100.0 + i, 100.5 + i, 99.5 + i, 100.25 + i, 10 * (i + 1), 50.0 + i]
+         for i in range(9)], index=times, columns=columns
+    )
+    msft = pd.DataFrame(
+        [[50.0 - i, 50.5 - i, 49.5 - i, 50.25 - i, 100, 25.0 - i]
+         for i in range(9)], index=times, columns=columns
+    ).drop(times[5])
+    return goog, msft
+
+
+class TestBarPeriod(unittest.TestCase):
+    def test_bar_period(self):
+        self.assertEqual(bar_period("D"), 86400)
+        self.assertEqual(bar_period("1M"), 60)
+        self.assertEqual(bar_period("5M"), 300)
+        self.assertEqual(bar_period("4H"), 14400)
+        self.assertEqual(bar_period("30S"), 30)
+        self.assertRaises(ValueError, bar_period, "0M")
+        self.assertRaises(ValueError, bar_period, "5Y")
+
+
+class TestBarAggregator(unittest.TestCase):
+    """
+    Test that bars are aggregated correctly and only handed out
+    once their period is over.
+    """
+    def test_ticks(self):
+        aggregator = BarAggregator(60)
+        p = PriceParser.parse
+        t = pd.Timestamp("2016-01-04 10:00:00")
+        ticks = [
+            (t + pd.Timedelta(seconds=1), 10.0, 10.2),
+            (t + pd.Timedelta(seconds=20), 10.4, 10.6),
+            (t + pd.Timedelta(seconds=40), 9.8, 10.0),
+            (t + pd.Timedelta(seconds=59), 10.1, 10.3),
+        ]
+        for time, bid, ask in ticks:
+            self.assertEqual(
+                aggregator.update(TickEvent("GOOG", time, p(bid), p(ask))), []
+            )
+        # Not over until the end of the minute
+        self.assertEqual(aggregator.close(t + pd.Timedelta(seconds=59)), [])
+        bars = aggregator.update(TickEvent(
+            "GOOG", t + pd.Timedelta(seconds=60), p(10.0), p(10.2)
+        ))
+        self.assertEqual(len(bars), 1)
+        bar = bars[0]
+        self.assertEqual(bar.time, t)
+        self.assertEqual(bar.period, 60)
+        self.assertEqual(
+            (bar.open_price, bar.high_price, bar.low_price, bar.close_price),
+            (p(10.1), p(10.5), p(9.9), p(10.2))
+        )
+        self.assertEqual(bar.volume, 4)
+        self.assertEqual(len(aggregator.close(t + pd.Timedelta(seconds=120))), 1)
+        self.assertEqual(aggregator.close(), [])
+
+    def test_bars_all_tickers_closed_in_order(self):
+        aggregator = BarAggregator(300)
+        t = pd.Timestamp("2016-01-04 10:00")
+        aggregator.update(BarEvent("MSFT", t, 60, 5, 6, 4, 5, 100, 5))
+        aggregator.update(BarEvent("GOOG", t, 60, 50, 60, 40, 55, 10, 55))
+        aggregator.update(
+            BarEvent("GOOG", t + pd.Timedelta(minutes=4), 60, 55, 70, 45, 65, 20, 64)
+        )
+        bars = aggregator.update(
+            BarEvent("GOOG", t + pd.Timedelta(minutes=5), 60, 1, 1, 1, 1, 1, 1)
+        )
+        self.assertEqual([b.ticker for b in bars], ["MSFT", "GOOG"])
+        goog = bars[1]
+        self.assertEqual(
+            (goog.open_price, goog.high_price, goog.low_price,
+             goog.close_price, goog.volume, goog.adj_close_price),
+            (50, 70, 40, 65, 30, 64)
+        )
+        self.assertRaises(ValueError, aggregator.update, BarEvent(
+            "MSFT", t + pd.Timedelta(minutes=4), 60, 5, 6, 4, 5, 100, 5
+        ))
+        self.assertRaises(ValueError, aggregator.update, BarEvent(
+            "MSFT", t + pd.Timedelta(minutes=5), 86400, 5, 6, 4, 5, 100, 5
+        ))
+
+
+class TestResampledBarPriceHandler(unittest.TestCase):
+    """
+    Test that resampling up front and event by event stream the
+    same bars.
+    """
+    def test_minute_bars(self):
+        goog, msft = minute_frames()
+        iterator = ColumnarBarEventIterator({"GOOG": goog, "MSFT": msft}, 60)
+        source = GenericPriceHandler(EventQueue(), iterator.copy())
+        price_handler = ResampledBarPriceHandler(source, EventQueue(), "5M")
+        self.assertIsNone(price_handler.bar_stream)
+        streamed = stream(price_handler)
+
+        source.bar_stream = iterator
+        price_handler = ResampledBarPriceHandler(source, EventQueue(), "5M")
+        self.assertIsNotNone(price_handler.bar_stream)
+        self.assertEqual(stream(price_handler), streamed)
+
+        p = PriceParser.parse
+        self.assertEqual(streamed, [str(e) for e in [
+            BarEvent("GOOG", pd.Timestamp("2016-01-04 09:55"), 300,
+                     p(100.0), p(101.5), p(99.5), p(101.25), 30, p(51.0)),
+            BarEvent("MSFT", pd.Timestamp("2016-01-04 09:55"), 300,
+                     p(50.0), p(50.5), p(48.5), p(49.25), 200, p(24.0)),
+            BarEvent("GOOG", pd.Timestamp("2016-01-04 10:00"), 300,
+                     p(102.0), p(106.5), p(101.5), p(106.25), 250, p(56.0)),
+            BarEvent("MSFT", pd.Timestamp("2016-01-04 10:00"), 300,
+                     p(48.0), p(48.5), p(43.5), p(44.25), 400, p(19.0)),
+            BarEvent("GOOG", pd.Timestamp("2016-01-04 10:05"), 300,
+                     p(107.0), p(108.5), p(106.5), p(108.25), 170, p(58.0)),
+            BarEvent("MSFT", pd.Timestamp("2016-01-04 10:05"), 300,
+                     p(43.0), p(43.5), p(41.5), p(42.25), 200, p(17.0)),
+        ]])
+
+    def test_ticks(self):
+        data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        source = HistoricCSVTickPriceHandler(data_dir, EventQueue(), ["GOOG"])
+        price_handler = ResampledBarPriceHandler(source, EventQueue(), "5S")
+        self.assertIsNotNone(price_handler.bar_stream)
+        upfront = stream(price_handler)
+
+        source = GenericPriceHandler(EventQueue(), HistoricCSVTickPriceHandler(
+            data_dir, EventQueue(), ["GOOG"]
+        ).tick_stream)
+        price_handler = ResampledBarPriceHandler(source, EventQueue(), "5S")
+        self.assertIsNone(price_handler.bar_stream)
+        self.assertEqual(stream(price_handler), upfront)
+        self.assertEqual(len(upfront), 3)
+
+    def test_coarser_source(self):
+        goog, msft = minute_frames()
+        source = GenericPriceHandler(EventQueue(), ColumnarBarEventIterator(
+            {"GOOG": goog}, 86400
+        ))
+        source.bar_stream = source.price_event_iterator
+        self.assertRaises(
+            ValueError, ResampledBarPriceHandler, source, EventQueue(), "1H"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from nctrader import settings
+from nctrader.statistics import load
+from nctrader.statistics import performance as perf
+from nctrader.statistics.results import ResultsReader, write_results
+from nctrader.statistics.streaming import EquityBuffer, StreamingStatistics
+
+
+def tearsheet_results():
+    """
+    A results dict laid out as TearsheetStatistics.get_results().
+    """
+    rng = np.random.RandomState(4)
+    times = pd.date_range("2015-01-01", periods=500, freq="D")
+    equity = pd.Series(
+        100000.0 * np.exp(np.cumsum(rng.normal(0, 0.01, 500))), index=times
+    )
+    returns = equity.pct_change().fillna(0.0)
+    cum_returns = np.exp(np.log(1 + returns).cumsum())
+    drawdowns, max_dd, dd_dur, dd_periods = perf.create_drawdowns(
+        cum_returns, with_periods=True
+    )
+    positions = pd.DataFrame([
+        OrderedDict([
+            ("id", 1), ("ticker", "GOOG"), ("action", "BOT"),
+            ("quantity", 100), ("entry_date", datetime(2015, 1, 5)),
+            ("entry_price", 512.25), ("exit_date", datetime(2015, 2, 3)),
+            ("exit_price", 530.5), ("exit_name", "target"),
+            ("realised_pnl", 1825.0),
+        ]),
+        OrderedDict([
+            ("id", 2), ("ticker", "MSFT"), ("action", "SLD"),
+            ("quantity", 50), ("entry_date", datetime(2016, 5, 1)),
+            ("entry_price", 45.0), ("exit_date", None),
+            ("exit_price", None), ("exit_name", None),
+            ("realised_pnl", 0.0),
+        ]),
+    ])
+    return {
+        "sharpe": perf.create_sharpe_ratio(returns),
+        "drawdowns": drawdowns,
+        "max_drawdown": max_dd,
+        "max_drawdown_pct": max_dd,
+        "max_drawdown_duration": dd_dur,
+        "drawdown_periods": dd_periods,
+        "equity": equity,
+        "returns": returns,
+        "cum_returns": cum_returns,
+        "positions": positions,
+        "sortino": np.nan,
+        "periods": np.int64(500),
+    }
+
+
+class TestResults(unittest.TestCase):
+    """
+    Test writing the results and reading them back whole or in
+    parts.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "results")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        results = tearsheet_results()
+        write_results(results, self.path, metadata={"strategy": "MAC"})
+        self.assertTrue(os.path.exists(self.path + ".json"))
+        self.assertTrue(os.path.exists(self.path + ".npz"))
+
+        loaded = ResultsReader(self.path + ".npz").get_results()
+        self.assertEqual(sorted(loaded), sorted(results))
+        for key in ("equity", "returns", "cum_returns", "drawdowns"):
+            pd.testing.assert_series_equal(
+                loaded[key], results[key], check_freq=False,
+                check_index_type=False
+            )
+        periods = results["drawdown_periods"]
+        self.assertEqual(
+            list(loaded["drawdown_periods"].columns), list(periods.columns)
+        )
+        for column in periods.columns:
+            self.assertEqual(
+                loaded["drawdown_periods"][column].tolist(),
+                periods[column].tolist()
+            )
+        positions = loaded["positions"]
+        self.assertEqual(
+            list(positions.columns), list(results["positions"].columns)
+        )
+        self.assertEqual(positions["ticker"].tolist(), ["GOOG", "MSFT"])
+        self.assertEqual(positions["exit_name"].iloc[0], "target")
+        self.assertTrue(pd.isnull(positions["exit_name"].iloc[1]))
+        self.assertEqual(
+            positions["entry_date"].tolist(),
+            [pd.Timestamp("2015-01-05"), pd.Timestamp("2016-05-01")]
+        )
+        self.assertTrue(pd.isnull(positions["exit_date"].iloc[1]))
+        self.assertTrue(np.isnan(positions["exit_price"].iloc[1]))
+        self.assertEqual(positions["quantity"].tolist(), [100, 50])
+        self.assertAlmostEqual(loaded["sharpe"], results["sharpe"])
+        self.assertEqual(loaded["periods"], 500)
+        self.assertIsNone(loaded["sortino"])
+
+    def test_partial_reads(self):
+        write_results(tearsheet_results(), self.path)
+        reader = ResultsReader(self.path)
+        self.assertEqual(
+            reader.series_names(),
+            ["cum_returns", "drawdowns", "equity", "returns"]
+        )
+        self.assertEqual(
+            reader.table_names(), ["drawdown_periods", "positions"]
+        )
+        # The summary needs only the header
+        os.remove(self.path + ".npz")
+        self.assertEqual(reader.summary["periods"], 500)
+        self.assertEqual(ResultsReader(self.path).summary, reader.summary)
+        self.assertRaises(IOError, reader.series, "equity")
+
+    def test_header_is_small(self):
+        write_results(tearsheet_results(), self.path)
+        with open(self.path + ".json") as fd:
+            header = json.load(fd)
+        self.assertEqual(header["series"]["equity"]["length"], 500)
+        self.assertLess(os.path.getsize(self.path + ".json"), 8192)
+
+    def test_tz_aware(self):
+        times = pd.date_range(
+            "2016-03-10 09:30", periods=10, freq="D", tz="US/Eastern"
+        )
+        equity = pd.Series(np.arange(10.0), index=times, name="equity")
+        write_results({"equity": equity}, self.path)
+        loaded = ResultsReader(self.path).series("equity")
+        pd.testing.assert_series_equal(
+            loaded, equity, check_freq=False, check_index_type=False
+        )
+
+    def test_unsupported(self):
+        self.assertRaises(
+            ValueError, write_results, {"trades": [1, 2]}, self.path
+        )
+
+    def test_save_results_and_load(self):
+        class PortfolioMock(object):
+            equity = 0
+            positions = {}
+
+        class PortfolioHandlerMock(object):
+            portfolio = PortfolioMock()
+
+        class EventMock(object):
+            def __init__(self, time):
+                self.time = time
+
+        statistics = StreamingStatistics(
+            settings.TEST, PortfolioHandlerMock(),
+            equity_buffer=EquityBuffer()
+        )
+        for i, time in enumerate(pd.date_range("2016-01-01", periods=20)):
+            statistics.portfolio_handler.portfolio.equity = (100 + i) * 10 ** 7
+            statistics.update(EventMock(time))
+        path = statistics.save_results(self.path)
+        results = load(path + ".json")
+        self.assertIsInstance(results, ResultsReader)
+        expected = statistics.get_results()
+        self.assertEqual(results.summary["periods"], 20)
+        self.assertAlmostEqual(
+            results.summary["total_return"], expected["total_return"]
+        )
+        self.assertEqual(
+            results.series("equity").tolist(), expected["equity"].tolist()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from nctrader import settings
+from nctrader.event import EventQueue
+from nctrader.price_handler import GenericPriceHandler
+from nctrader.price_handler.iterator.columnar import (
+    ColumnarBarEventIterator, ColumnarTickEventIterator
+)
+from nctrader.price_parser import PriceParser
+from nctrader.statistics.sampling import (
+    BarSampler, DailySampler, IntervalSampler
+)
+from nctrader.statistics.streaming import EquityBuffer, StreamingStatistics
+from nctrader.statistics.tearsheet import TearsheetStatistics
+from nctrader.strategy.base import AbstractStrategy
+from nctrader.trading_session.backtest import Backtest
+
+from test_backtest import ExecutionHandlerMock, PortfolioHandlerMock
+
+
+class PortfolioMock(object):
+    def __init__(self):
+        self.equity = 0
+        self.positions = {}
+        self.open_quantity = 0
+
+
+class ValuingPortfolioHandlerMock(PortfolioHandlerMock):
+    """
+    Values the portfolio at the sum of the tickers' latest bid or
+    close, only when asked to, like the PortfolioHandler.
+    """
+    def __init__(self, price_handler):
+        super(ValuingPortfolioHandlerMock, self).__init__(
+            price_handler.events_queue
+        )
+        self.price_handler = price_handler
+        self.portfolio = PortfolioMock()
+
+    def update_portfolio_value(self, tickers=None):
+        self.portfolio.equity = sum(
+            prices.get("bid", prices.get("close", 0))
+            for prices in self.price_handler.tickers.values()
+        )
+
+
+class NullStrategy(AbstractStrategy):
+    def on_tick(self, event):
+        pass
+
+    def on_bar(self, event):
+        pass
+
+
+def run_backtest(price_handler, statistics_cls, sampler, **kwargs):
+    portfolio_handler = ValuingPortfolioHandlerMock(price_handler)
+    statistics = statistics_cls(
+        settings.TEST, portfolio_handler, sampler=sampler, **kwargs
+    )
+    backtest = Backtest(
+        price_handler, NullStrategy(), portfolio_handler,
+        ExecutionHandlerMock(price_handler.events_queue), None, None,
+        statistics, 0
+    )
+    backtest._run_backtest()
+    return statistics
+
+
+def tick_frame():
+    """
+    Irregular ticks over two days, with a gap of several minutes.
+    """
+    rng = np.random.RandomState(2)
+    seconds = np.cumsum(rng.randint(1, 20, 3000))
+    seconds[1500:] += 86400 + 600
+    index = pd.Timestamp("2016-01-04 09:30") + pd.to_timedelta(seconds, "s")
+    bid = 100.0 + np.cumsum(rng.normal(0, 0.05, len(index)))
+    return pd.DataFrame({"Bid": bid, "Ask": bid + 0.02}, index=index)
+
+
+class TestSamplers(unittest.TestCase):
+    def test_bar_sampler(self):
+        sampler = BarSampler()
+        t = pd.Timestamp("2016-01-04")
+        labels = [
+            sampler.update(t), sampler.update(t),
+            sampler.update(t + pd.Timedelta(days=1)),
+            sampler.update(t + pd.Timedelta(days=2))
+        ]
+        self.assertEqual(labels, [None, None, t, t + pd.Timedelta(days=1)])
+        self.assertEqual(sampler.close(), t + pd.Timedelta(days=2))
+        self.assertIsNone(sampler.close())
+
+    def test_interval_sampler(self):
+        sampler = IntervalSampler(300)
+        t = pd.Timestamp("2016-01-04 10:03")
+        self.assertIsNone(sampler.update(t))
+        self.assertIsNone(sampler.update(t + pd.Timedelta(seconds=119)))
+        self.assertEqual(
+            sampler.update(t + pd.Timedelta(seconds=120)),
+            pd.Timestamp("2016-01-04 10:00")
+        )
+        # Empty periods are skipped
+        self.assertEqual(
+            sampler.update(t + pd.Timedelta(minutes=30)),
+            pd.Timestamp("2016-01-04 10:05")
+        )
+        self.assertEqual(sampler.close(), pd.Timestamp("2016-01-04 10:30"))
+        self.assertRaises(ValueError, IntervalSampler, 0)
+
+    def test_daily_sampler_local_midnight(self):
+        sampler = DailySampler()
+        t = pd.Timestamp("2016-01-04 23:00", tz="US/Eastern")
+        sampler.update(t)
+        self.assertIsNone(sampler.update(t + pd.Timedelta(minutes=59)))
+        self.assertEqual(
+            sampler.update(t + pd.Timedelta(hours=1)),
+            pd.Timestamp("2016-01-04", tz="US/Eastern")
+        )
+
+
+class TestSampledStatistics(unittest.TestCase):
+    """
+    Test that sampled statistics record the equity as of the
+    last price event of each sampling period.
+    """
+    def setUp(self):
+        self.df = tick_frame()
+
+    def tick_handler(self):
+        return GenericPriceHandler(
+            EventQueue(), ColumnarTickEventIterator({"GOOG": self.df})
+        )
+
+    def expected(self, freq):
+        bid = pd.Series(
+            PriceParser.parse_array(self.df["Bid"].values), index=self.df.index
+        )
+        return bid.groupby(bid.index.floor(freq)).last()
+
+    def test_streaming_statistics(self):
+        for sampler, freq in (
+            (IntervalSampler(60), "60s"), (DailySampler(), "D")
+        ):
+            statistics = run_backtest(
+                self.tick_handler(), StreamingStatistics, sampler,
+                equity_buffer=EquityBuffer()
+            )
+            expected = self.expected(freq)
+            equity = statistics.equity_buffer.to_series()
+            self.assertEqual(equity.tolist(), expected.tolist())
+            self.assertEqual(list(equity.index), list(expected.index))
+            self.assertEqual(
+                statistics.get_results()["periods"], len(expected)
+            )
+
+    def test_tearsheet_statistics(self):
+        statistics = run_backtest(
+            self.tick_handler(), TearsheetStatistics, IntervalSampler(60),
+            title=["Sampled"], start_date=datetime(2016, 1, 4, 10)
+        )
+        expected = self.expected("60s")
+        expected = expected[expected.index >= datetime(2016, 1, 4, 10)]
+        equity = pd.Series(statistics.equity).sort_index()
+        self.assertEqual(equity.tolist(), expected.tolist())
+        self.assertEqual(list(equity.index), list(expected.index))
+        self.assertEqual(len(statistics.equity_file), len(expected))
+        self.assertEqual(
+            statistics.equity_file[-1]["equity"],
+            PriceParser.display(expected.iloc[-1])
+        )
+
+    def test_bar_sampler_closes_timestamps(self):
+        times = pd.date_range("2016-01-04", periods=5, freq="D")
+        frames = {
+            ticker: pd.DataFrame({
+                "Open": close, "High": close, "Low": close, "Close": close,
+                "Volume": 100, "Adj Close": close
+            }, index=times)
+            for ticker, close in (
+                ("GOOG", 100.0 + np.arange(5)), ("MSFT", 50.0 - np.arange(5))
+            )
+        }
+        price_handler = GenericPriceHandler(
+            EventQueue(), ColumnarBarEventIterator(frames, 86400)
+        )
+        statistics = run_backtest(
+            price_handler, StreamingStatistics, BarSampler(),
+            equity_buffer=EquityBuffer()
+        )
+        equity = statistics.equity_buffer.to_series()
+        # Both tickers are valued at every timestamp
+        self.assertEqual(
+            equity.tolist(), [PriceParser.parse(150.0)] * len(times)
+        )
+        self.assertEqual(list(equity.index), list(times))
+
+
+if __name__ == "__main__":
+    unittest.main()
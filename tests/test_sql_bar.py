@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from nctrader.event import EventQueue
+from nctrader.price_handler.sqlite_bar import SqliteBarPriceHandler
+from nctrader.price_handler.sqlite_db import Base, db_session
+from nctrader.price_handler.sqlite_db.models import (
+    BarData, DataVendor, Exchange, Symbol
+)
+from nctrader.price_parser import PriceParser
+
+
+def create_bar_db(path, tickers_closes, start=datetime(2010, 1, 4)):
+    """
+    Creates a sqlite database with daily bars of the given
+    tickers, one per day from start, and returns its URI.
+    """
+    uri = "sqlite:///%s" % path
+    engine = create_engine(uri)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Exchange.__table__.insert(), [
+            {"id": 1, "abbrev": "NYSE", "name": "New York Stock Exchange"}
+        ])
+        conn.execute(DataVendor.__table__.insert(), [
+            {"id": 1, "name": "CSI"}
+        ])
+        for symbol_id, (ticker, closes) in enumerate(
+            tickers_closes.items(), 1
+        ):
+            conn.execute(Symbol.__table__.insert(), [{
+                "id": symbol_id, "exchange_id": 1, "data_vendor_id": 1,
+                "ticker": ticker, "big_point_value": 1, "margin": 0.0
+            }])
+            conn.execute(BarData.__table__.insert(), [{
+                "symbol_id": symbol_id, "bar_size": "D",
+                "timestamp": start + timedelta(days=i),
+                "open_price": close, "high_price": close + 1.0,
+                "low_price": close - 1.0, "close_price": close,
+                "volume": 1000 + i
+            } for i, close in enumerate(closes)])
+    engine.dispose()
+    return uri
+
+
+class TestSqliteBarPriceHandler(unittest.TestCase):
+    """
+    Test the date window and chunked streaming of the
+    SqliteBarPriceHandler.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.uri = create_bar_db(
+            os.path.join(cls.tmp_dir, "bars.db"), {
+                "GOOG": [600.0 + i for i in range(10)],
+                "MSFT": [30.0 + i / 4.0 for i in range(7)],
+            }
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        db_session.remove()
+        shutil.rmtree(cls.tmp_dir)
+
+    def _stream(self, price_handler):
+        events = []
+        while price_handler.continue_backtest:
+            price_handler.stream_next()
+            while not price_handler.events_queue.empty():
+                events.append(str(price_handler.events_queue.get(False)))
+        return events
+
+    def test_stream(self):
+        price_handler = SqliteBarPriceHandler(
+            self.uri, EventQueue(), ["GOOG", "MSFT"]
+        )
+        self.assertEqual(
+            price_handler.get_last_close("MSFT"), PriceParser.parse(30.0)
+        )
+        self.assertEqual(len(self._stream(price_handler)), 17)
+
+    def test_date_window(self):
+        price_handler = SqliteBarPriceHandler(
+            self.uri, EventQueue(), ["GOOG", "MSFT"],
+            start_date=datetime(2010, 1, 6), end_date=datetime(2010, 1, 11)
+        )
+        self.assertEqual(len(price_handler.tickers_data["GOOG"]), 6)
+        self.assertEqual(
+            price_handler.tickers["GOOG"]["timestamp"], datetime(2010, 1, 6)
+        )
+        self.assertEqual(
+            price_handler.get_last_close("GOOG"), PriceParser.parse(602.0)
+        )
+        events = self._stream(price_handler)
+        self.assertEqual(len(events), 6 + 5)
+
+    def test_chunked_same_stream(self):
+        kwargs = {"start_date": datetime(2010, 1, 5)}
+        full = SqliteBarPriceHandler(
+            self.uri, EventQueue(), ["GOOG", "MSFT"], **kwargs
+        )
+        chunked = SqliteBarPriceHandler(
+            self.uri, EventQueue(), ["GOOG", "MSFT"], chunksize=2, **kwargs
+        )
+        self.assertEqual(chunked.tickers_data, {})
+        self.assertEqual(chunked.tickers, full.tickers)
+        events = self._stream(chunked)
+        self.assertEqual(len(events), 15)
+        self.assertEqual(events, self._stream(full))
+
+    def test_bulk_subscription(self):
+        """
+        Prices and symbol information of all tickers are loaded
+        with one query each, equal timestamps streaming in
+        subscription order.
+        """
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", count)
+        try:
+            price_handler = SqliteBarPriceHandler(
+                self.uri, EventQueue(), ["MSFT", "GOOG", "IBM"]
+            )
+        finally:
+            event.remove(Engine, "before_cursor_execute", count)
+        # The data vendor, the prices and the symbols
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(sorted(price_handler.tickers), ["GOOG", "MSFT"])
+        self.assertEqual(sorted(price_handler.tickers_info), ["GOOG", "MSFT"])
+        self.assertEqual(price_handler.tickers_info["GOOG"].big_point_value, 1)
+        bars = []
+        while price_handler.continue_backtest:
+            price_handler.stream_next()
+            while not price_handler.events_queue.empty():
+                bars.append(price_handler.events_queue.get(False).ticker)
+        self.assertEqual(bars[:4], ["MSFT", "GOOG", "MSFT", "GOOG"])
+
+    def test_chunked_subscribe_tickers(self):
+        price_handler = SqliteBarPriceHandler(
+            self.uri, EventQueue(), ["GOOG"], chunksize=3,
+            start_date=datetime(2010, 1, 8)
+        )
+        price_handler.subscribe_tickers(["MSFT", "GOOG"])
+        self.assertEqual(
+            price_handler.tickers["MSFT"]["close"], PriceParser.parse(31.0)
+        )
+        self.assertEqual(
+            price_handler.tickers["GOOG"]["timestamp"], datetime(2010, 1, 8)
+        )
+        price_handler.bar_stream = price_handler._merge_sort_ticker_data()
+        events = self._stream(price_handler)
+        self.assertEqual(len(events), 6 + 3)
+        self.assertIn("Ticker: MSFT", events[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
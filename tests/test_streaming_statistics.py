@@ -0,0 +1,184 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nctrader import settings
+from nctrader.price_parser import PriceParser
+from nctrader.statistics import load
+from nctrader.statistics import performance as perf
+from nctrader.statistics.results import ResultsReader
+from nctrader.statistics.streaming import (
+    EquityBuffer, RunningMoments, StreamingStatistics
+)
+
+
+class PortfolioMock(object):
+    def __init__(self):
+        self.equity = 0
+        self.positions = {}
+
+
+class PortfolioHandlerMock(object):
+    def __init__(self):
+        self.portfolio = PortfolioMock()
+
+
+class EventMock(object):
+    def __init__(self, time):
+        self.time = time
+
+
+def run(equity, times, statistics, exposed=()):
+    """
+    Streams two price events per timestamp, the portfolio's
+    equity only settling on the second.
+    """
+    portfolio = statistics.portfolio_handler.portfolio
+    for i, (time, value) in enumerate(zip(times, equity)):
+        portfolio.positions = {"GOOG": None} if i in exposed else {}
+        portfolio.equity = value - 1000
+        statistics.update(EventMock(time))
+        portfolio.equity = value
+        statistics.update(EventMock(time))
+    return statistics.get_results()
+
+
+class TestRunningMoments(unittest.TestCase):
+    def test_against_numpy(self):
+        values = np.random.RandomState(1).normal(1e6, 1.0, 1000)
+        moments = RunningMoments()
+        for value in values:
+            moments.add(value)
+        self.assertAlmostEqual(moments.mean, values.mean(), places=6)
+        self.assertAlmostEqual(moments.std(), values.std(), places=8)
+        self.assertAlmostEqual(moments.std(1), values.std(ddof=1), places=8)
+        self.assertTrue(np.isnan(RunningMoments().std()))
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    """
+    Test the online statistics against the ones computed over the
+    whole equity curve.
+    """
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        n = 2000
+        self.times = pd.date_range("2010-01-01", periods=n, freq="min")
+        curve = 100000.0 * np.exp(np.cumsum(rng.normal(0.0001, 0.002, n)))
+        self.equity = PriceParser.parse_array(curve).tolist()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_statistics(self):
+        statistics = StreamingStatistics(
+            settings.TEST, PortfolioHandlerMock(), periods=252 * 390,
+            equity_buffer=EquityBuffer()
+        )
+        results = run(
+            self.equity, self.times, statistics, exposed=range(0, 2000, 4)
+        )
+        equity = pd.Series(
+            PriceParser.display_array(np.array(self.equity)), index=self.times
+        )
+        pd.testing.assert_series_equal(
+            results["equity"], equity, check_freq=False, check_index_type=False
+        )
+        returns = equity.pct_change().fillna(0.0)
+        self.assertAlmostEqual(
+            results["sharpe"],
+            perf.create_sharpe_ratio(returns, 252 * 390), places=8
+        )
+        self.assertAlmostEqual(
+            results["sortino"],
+            perf.create_sortino_ratio(returns, 252 * 390), places=8
+        )
+        drawdown = 1.0 - equity / equity.cummax()
+        self.assertAlmostEqual(
+            results["max_drawdown_pct"], drawdown.max(), places=10
+        )
+        at_hwm = (drawdown == 0).values
+        durations = [0]
+        for flag in at_hwm[1:]:
+            durations.append(0 if flag else durations[-1] + 1)
+        self.assertEqual(results["max_drawdown_duration"], max(durations))
+        growth = equity.iloc[-1] / equity.iloc[0]
+        self.assertAlmostEqual(results["total_return"], growth - 1.0)
+        self.assertAlmostEqual(
+            results["cagr"], growth ** (252 * 390 / 2000.0) - 1.0
+        )
+        self.assertAlmostEqual(results["exposure"], 0.25)
+        self.assertEqual(results["periods"], 2000)
+        self.assertAlmostEqual(results["final_equity"], equity.iloc[-1])
+
+    def test_results_while_running(self):
+        statistics = StreamingStatistics(settings.TEST, PortfolioHandlerMock())
+        run(self.equity[:10], self.times[:10], statistics)
+        self.assertEqual(statistics.get_results()["periods"], 10)
+        # Asking for the results does not close the current period
+        self.assertEqual(statistics.accumulator.periods, 9)
+        self.assertEqual(statistics.get_results()["periods"], 10)
+
+    def test_start_date(self):
+        statistics = StreamingStatistics(
+            settings.TEST, PortfolioHandlerMock(), start_date=self.times[5]
+        )
+        results = run(self.equity[:10], self.times[:10], statistics)
+        self.assertEqual(results["periods"], 5)
+
+    def test_spill_to_disk(self):
+        path = os.path.join(self.tmp_dir, "equity.bin")
+        buffer = EquityBuffer(capacity=64, path=path)
+        statistics = StreamingStatistics(
+            settings.TEST, PortfolioHandlerMock(), equity_buffer=buffer
+        )
+        results = run(self.equity, self.times, statistics)
+        self.assertEqual(len(buffer.data), 64)
+        self.assertEqual(len(buffer), 1999)
+        self.assertGreater(os.path.getsize(path), 0)
+        self.assertEqual(
+            results["equity"].tolist(),
+            PriceParser.display_array(np.array(self.equity)).tolist()
+        )
+        self.assertEqual(results["equity"].index[-1], self.times[-1])
+
+    def test_save(self):
+        path = os.path.join(self.tmp_dir, "equity.bin")
+        statistics = StreamingStatistics(
+            settings.TEST, PortfolioHandlerMock(),
+            equity_buffer=EquityBuffer(capacity=64, path=path)
+        )
+        expected = run(self.equity, self.times, statistics)
+        filename = statistics.save(os.path.join(self.tmp_dir, "results"))
+        self.assertEqual(
+            sorted(os.listdir(self.tmp_dir)),
+            ["equity.bin", "results.json", "results.npz"]
+        )
+        results = load(filename)
+        self.assertIsInstance(results, ResultsReader)
+        self.assertEqual(results.summary["periods"], 2000)
+        self.assertEqual(
+            results.series("equity").tolist(), expected["equity"].tolist()
+        )
+
+        # Pickling the whole statistics is opt-in
+        filename = statistics.save(
+            os.path.join(self.tmp_dir, "statistics.pkl"), pickled=True
+        )
+        self.assertIsInstance(load(filename), StreamingStatistics)
+
+    def test_growable(self):
+        buffer = EquityBuffer(capacity=4)
+        for i, time in enumerate(self.times[:10]):
+            buffer.append(time, i)
+        self.assertEqual(buffer.to_series().tolist(), list(range(10)))
+        self.assertEqual(len(buffer), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import functools
+import unittest
+
+import numpy as np
+import pandas as pd
+from munch import Munch
+
+from nctrader.event import SignalEvent
+from nctrader.price_handler import GenericPriceHandler
+from nctrader.price_handler.iterator.columnar import ColumnarBarEventIterator
+from nctrader.price_parser import PriceParser
+from nctrader.statistics.simple import SimpleStatistics
+from nctrader.strategy.base import AbstractStrategy
+from nctrader.trading_session.sweep import ParameterSweep, expand_grid
+
+
+class HoldStrategy(AbstractStrategy):
+    """
+    Buys on the entry-th bar and sells hold bars later.
+    """
+    def __init__(self, ticker, events_queue, entry=1, hold=1):
+        self.ticker = ticker
+        self.events_queue = events_queue
+        self.entry = entry
+        self.hold = hold
+        self.bars = 0
+
+    def on_bar(self, event):
+        self.bars += 1
+        if self.bars == self.entry:
+            self.events_queue.put(SignalEvent(self.ticker, "BOT"))
+        elif self.bars == self.entry + self.hold:
+            self.events_queue.put(SignalEvent(self.ticker, "SLD"))
+
+    def on_tick(self, event):
+        pass
+
+
+class TestParameterSweep(unittest.TestCase):
+    """
+    Test that a sweep runs one backtest per grid combination off
+    a single loaded price handler, with the same results in one
+    process and in a process pool.
+    """
+    def setUp(self):
+        rs = np.random.RandomState(3)
+        closes = 100.0 + np.cumsum(rs.standard_normal(60))
+        df = pd.DataFrame(
+            {"Open": closes, "High": closes, "Low": closes,
+             "Close": closes, "Volume": 1000, "Adj Close": closes},
+            index=pd.bdate_range("2016-01-04", periods=60)
+        )
+        self.price_handler = GenericPriceHandler(
+            None, ColumnarBarEventIterator({"GOOG": df}, 86400)
+        )
+        self.price_handler.tickers_info = {
+            "GOOG": Munch(type="STK", margin=0, big_point_value=1)
+        }
+        self.param_grid = {"entry": [1, 5], "hold": [10, 20, 30]}
+
+    def _sweep(self, processes, statistics_factory=None):
+        return ParameterSweep(
+            None, self.price_handler,
+            functools.partial(HoldStrategy, "GOOG"), self.param_grid,
+            PriceParser.parse(100000.00), processes=processes,
+            statistics_factory=statistics_factory
+        )
+
+    def test_expand_grid(self):
+        combinations = expand_grid(self.param_grid)
+        self.assertEqual(len(combinations), 6)
+        self.assertEqual(dict(combinations[1]), {"entry": 1, "hold": 20})
+
+    def test_run(self):
+        results = self._sweep(1).run()
+        self.assertEqual(len(results), 6)
+        self.assertEqual(list(results.columns[:2]), ["entry", "hold"])
+        self.assertTrue((results["trades"] == 1).all())
+        self.assertEqual(len(results["total_return"].unique()), 6)
+        # The loaded price handler itself is never streamed
+        self.assertTrue(self.price_handler.continue_backtest)
+        self.assertEqual(self.price_handler.price_event_iterator.position, 0)
+
+        pooled = self._sweep(2).run()
+        pd.testing.assert_frame_equal(results, pooled)
+
+    def test_simple_statistics(self):
+        results = self._sweep(1, SimpleStatistics).run()
+        tearsheet = self._sweep(1).run()
+        self.assertEqual(len(results), 6)
+        self.assertTrue(results["max_drawdown_duration"].isnull().all())
+        self.assertTrue(results["trades"].isnull().all())
+        self.assertFalse(results["sharpe"].isnull().any())
+        np.testing.assert_allclose(
+            results["final_equity"], tearsheet["final_equity"]
+        )
+
+        pooled = self._sweep(2, SimpleStatistics).run()
+        pd.testing.assert_frame_equal(results, pooled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import matplotlib.pyplot as plt
+
+from munch import Munch
+
+from nctrader.statistics import performance as perf
+from nctrader.statistics.base import AbstractStatistics
+from nctrader.statistics.results import write_results
+from nctrader.statistics.tearsheet import (
+    TearsheetPlotter, TearsheetRenderer, TearsheetStatistics,
+    render_tearsheets
+)
+
+from test_results import tearsheet_results
+
+
+def results():
+    results = tearsheet_results()
+    results["positions"]["trade_ret"] = [0.03, -0.01]
+    results["positions"]["time_in_pos"] = [29.0, 10.0]
+    return results
+
+
+class TestTearsheetRendering(unittest.TestCase):
+    """
+    Test rendering tearsheets headless, straight to files.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_formats(self):
+        renderer = TearsheetRenderer(results(), title=["Test"])
+        for ext, magic in (
+            ("png", b"\x89PNG"), ("pdf", b"%PDF"), ("svg", b"<?xml")
+        ):
+            filename = os.path.join(self.tmp_dir, "tearsheet." + ext)
+            renderer.save_tearsheet(filename)
+            with open(filename, "rb") as fd:
+                self.assertEqual(fd.read(len(magic)), magic)
+        # Neither pyplot figures nor a changed style are left behind
+        self.assertEqual(plt.get_fignums(), [])
+        self.assertEqual(
+            plt.rcParams["font.family"], plt.rcParamsDefault["font.family"]
+        )
+
+    def test_renderer_is_not_statistics(self):
+        renderer = TearsheetRenderer(results())
+        self.assertIsInstance(renderer, TearsheetPlotter)
+        self.assertNotIsInstance(renderer, AbstractStatistics)
+        self.assertFalse(hasattr(renderer, "update"))
+        self.assertTrue(issubclass(TearsheetStatistics, TearsheetPlotter))
+
+    def test_returns_aggregated_once(self):
+        stats = results()
+        filename = os.path.join(self.tmp_dir, "tearsheet.png")
+        with mock.patch.object(
+            perf, "aggregate_returns", wraps=perf.aggregate_returns
+        ) as aggregate:
+            TearsheetRenderer(stats).save_tearsheet(filename)
+        self.assertEqual(
+            sorted(c[0][1] for c in aggregate.call_args_list),
+            ["monthly", "yearly"]
+        )
+        # The shared aggregates are not added to the caller's results
+        self.assertNotIn("monthly_returns", stats)
+
+    def test_render_many(self):
+        jobs = []
+        for i in range(3):
+            path = write_results(
+                results(), os.path.join(self.tmp_dir, "results_%d" % i)
+            )
+            jobs.append((path, path + ".png", ["Run %d" % i]))
+        jobs.append((results(), os.path.join(self.tmp_dir, "dict.svg")))
+        filenames = render_tearsheets(jobs, processes=2)
+        self.assertEqual(filenames, [job[1] for job in jobs])
+        for filename in filenames:
+            self.assertGreater(os.path.getsize(filename), 0)
+
+        # Tearsheets newer than their results are not rendered again
+        mtimes = [os.path.getmtime(job[1]) for job in jobs[:3]]
+        with mock.patch(
+            "nctrader.statistics.tearsheet._render_job"
+        ) as render_job:
+            render_tearsheets(jobs, processes=1)
+        self.assertEqual(render_job.call_count, 1)
+        self.assertEqual(
+            [os.path.getmtime(job[1]) for job in jobs[:3]], mtimes
+        )
+
+
+class PortfolioMock(object):
+    closed_positions = []
+
+    def get_open_positions(self):
+        return []
+
+
+class PortfolioHandlerMock(object):
+    price_handler = None
+    portfolio = PortfolioMock()
+
+
+class TestTearsheetSave(unittest.TestCase):
+    """
+    Test that save() still shows the tearsheet unless asked to
+    render it headless.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.statistics = TearsheetStatistics(
+            Munch(OUTPUT_DIR=self.tmp_dir), PortfolioHandlerMock(),
+            title=["Test"]
+        )
+        self.statistics.equity_file = [{"timestamp": 0, "equity": 1.0}]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_save_shows_by_default(self):
+        with mock.patch.object(
+            TearsheetStatistics, "plot_results"
+        ) as plot_results, mock.patch.object(
+            TearsheetStatistics, "save_tearsheet"
+        ) as save_tearsheet:
+            self.statistics.save()
+        self.assertEqual(plot_results.call_count, 1)
+        self.assertEqual(save_tearsheet.call_count, 0)
+
+    def test_save_headless(self):
+        with mock.patch.object(
+            TearsheetStatistics, "plot_results"
+        ) as plot_results, mock.patch.object(
+            TearsheetStatistics, "save_tearsheet"
+        ) as save_tearsheet:
+            self.statistics.save(headless=True)
+        self.assertEqual(plot_results.call_count, 0)
+        filename = save_tearsheet.call_args[0][0]
+        self.assertTrue(filename.startswith(self.tmp_dir))
+        self.assertTrue(filename.endswith(".png"))
+
+
+if __name__ == "__main__":
+    unittest.main()